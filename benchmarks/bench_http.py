@@ -0,0 +1,97 @@
+"""Compare per-call latency of bare requests.get with the keep-alive AtelierClient.
+
+Runs against the local stub server, so no IRIS instance is needed:
+
+    python benchmarks/bench_http.py --calls 500 --delay 0.02
+
+The async figures are amortised over ``--concurrency`` overlapping calls,
+measured after a warm-up round so connection setup is not counted, next to
+a plain ``httpx.AsyncClient`` as the floor for the async stack. Overlap
+only helps while calls wait on the server: with ``--delay 0`` the stub's
+handler threads share this process's GIL and every call costs CPU time
+here, so async throughput cannot beat sequential keep-alive calls. Use
+``--delay`` to model IRIS response time.
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir, "src", "python", "rag"))
+sys.path.insert(0, os.path.dirname(__file__))
+
+import requests
+
+from langchain_iris_tool.rest import AtelierClient
+from stub_server import start_stub_server
+
+
+PATH = "/api/atelier/v1/USER/jobs"
+
+
+def measure(fn, calls):
+    samples = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def report(label, samples):
+    samples = sorted(samples)
+    p95 = samples[int(len(samples) * 0.95) - 1]
+    print(f"{label:<24} mean {statistics.mean(samples):7.3f} ms   p50 {statistics.median(samples):7.3f} ms   p95 {p95:7.3f} ms")
+
+
+async def measure_async(get, calls, concurrency):
+    # warm-up opens the keep-alive connections before timing starts
+    await asyncio.gather(*(get() for _ in range(concurrency)))
+    start = time.perf_counter()
+    for _ in range(calls // concurrency):
+        await asyncio.gather(*(get() for _ in range(concurrency)))
+    return (time.perf_counter() - start) * 1000 / (calls // concurrency * concurrency)
+
+
+async def measure_clients(baseurl, auth, calls, concurrency):
+    import httpx
+
+    async with httpx.AsyncClient(auth=auth) as plain:
+        httpx_ms = await measure_async(lambda: plain.get(baseurl + PATH), calls, concurrency)
+    client = AtelierClient(baseurl, *auth)
+    try:
+        aget_ms = await measure_async(lambda: client.aget(PATH), calls, concurrency)
+    finally:
+        await client.aclose()
+    return httpx_ms, aget_ms
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=300)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--delay", type=float, default=0.0, help="seconds the stub waits before answering")
+    args = parser.parse_args()
+
+    server, baseurl = start_stub_server(delay=args.delay)
+    auth = ("_system", "SYS")
+    try:
+        report("requests.get", measure(lambda: requests.get(baseurl + PATH, auth=auth).json(), args.calls))
+        client = AtelierClient(baseurl, *auth)
+        report("AtelierClient.get", measure(lambda: client.get(PATH), args.calls))
+        client.close()
+        try:
+            httpx_ms, aget_ms = asyncio.run(measure_clients(baseurl, auth, args.calls, args.concurrency))
+            print(f"{'httpx.AsyncClient.get':<24} {httpx_ms:7.3f} ms/call amortised at concurrency {args.concurrency}")
+            print(f"{'AtelierClient.aget':<24} {aget_ms:7.3f} ms/call amortised at concurrency {args.concurrency}")
+        except ImportError:
+            print("httpx not installed, skipping async client")
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""Measure cold import time of the package and the Streamlit helpers against a budget.
+
+Each target is imported in a fresh interpreter several times; the median
+wall time is compared with its budget, and the modules the import pulled
+in are checked against a list of heavy dependencies it must not load
+eagerly. Exits with status 1 on any regression, so it can gate CI:
+
+    python benchmarks/bench_import.py
+    python benchmarks/bench_import.py --profile langchain_iris_tool.tools
+
+Targets whose own dependencies are not installed are reported as skipped.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+
+RAG_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "src", "python", "rag")
+
+# target -> (budget in ms, modules that must still be unloaded afterwards).
+# The light targets include asyncio from the standard library; tools needs
+# langchain-core, which itself loads requests through langsmith.
+BUDGETS = {
+    "langchain_iris_tool": (50.0, ["iris", "requests", "yaml", "httpx", "langchain_core", "pydantic", "numpy"]),
+    "langchain_iris_tool.formatting": (100.0, ["yaml", "requests", "langchain_core"]),
+    "langchain_iris_tool.pool": (150.0, ["iris", "requests", "langchain_core"]),
+    "langchain_iris_tool.rest": (150.0, ["requests", "httpx", "yaml", "langchain_core"]),
+    "langchain_iris_tool.tools": (2500.0, ["iris", "httpx", "yaml"]),
+    "langchain_helper": (50.0, ["langchain", "langchain_core", "langchain_iris", "numpy"]),
+    "agent": (150.0, ["langchain_core", "streamlit"]),
+}
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+try:
+    __import__({target!r})
+except ImportError as e:
+    print(json.dumps({{"skipped": str(e)}}))
+    raise SystemExit(0)
+elapsed = (time.perf_counter() - start) * 1000
+loaded = [m for m in {forbidden!r} if m in sys.modules]
+print(json.dumps({{"ms": elapsed, "loaded": loaded}}))
+"""
+
+
+def probe(target, forbidden):
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [RAG_DIR, os.environ.get("PYTHONPATH")])))
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE.format(target=target, forbidden=forbidden)],
+        capture_output=True, text=True, env=env, check=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def profile(target, top=15):
+    """Print the slowest modules of one import, from ``python -X importtime``."""
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [RAG_DIR, os.environ.get("PYTHONPATH")])))
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {target}"],
+        capture_output=True, text=True, env=env,
+    ).stderr
+    rows = []
+    for line in stderr.splitlines():
+        # "import time:   self [us] | cumulative | imported package"
+        parts = line[len("import time:"):].split("|")
+        if not line.startswith("import time:") or not parts[0].strip().isdigit():
+            continue
+        rows.append((int(parts[1]), int(parts[0]), parts[2].strip()))
+    for cumulative, own, name in sorted(rows, reverse=True)[:top]:
+        print(f"{cumulative / 1000:9.1f} ms cumulative {own / 1000:8.1f} ms self  {name}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5, help="fresh interpreters per target")
+    parser.add_argument("--scale", type=float, default=1.0, help="multiply every time budget, e.g. for slow CI machines")
+    parser.add_argument("--output", help="write the measurements as JSON")
+    parser.add_argument("--profile", metavar="MODULE", help="show the slowest imports of MODULE and exit")
+    args = parser.parse_args()
+
+    if args.profile:
+        profile(args.profile)
+        return
+
+    results, failures = {}, []
+    for target, (budget, forbidden) in BUDGETS.items():
+        runs = [probe(target, forbidden) for _ in range(args.repeat)]
+        if "skipped" in runs[0]:
+            results[target] = {"skipped": runs[0]["skipped"]}
+            print(f"{target:<34} skipped ({runs[0]['skipped']})")
+            continue
+        median = statistics.median(run["ms"] for run in runs)
+        loaded = sorted({m for run in runs for m in run["loaded"]})
+        limit = budget * args.scale
+        ok = median <= limit and not loaded
+        results[target] = {"median_ms": round(median, 2), "budget_ms": limit, "eager_imports": loaded, "ok": ok}
+        status = "ok" if ok else "OVER BUDGET" if median > limit else "EAGER IMPORT"
+        print(f"{target:<34} {median:8.1f} ms  (budget {limit:7.1f} ms)  {status}" + (f"  loads {', '.join(loaded)}" if loaded else ""))
+        if not ok:
+            failures.append(target)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    if failures:
+        print(f"\nImport regressions: {', '.join(failures)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
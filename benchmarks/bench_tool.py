@@ -0,0 +1,254 @@
+"""Benchmark InterSystemsIRISTool against in-process IRIS and Atelier stand-ins.
+
+Native and SQL operations run on ``fake_iris`` (a simulated round-trip
+latency per call), REST operations on the local stub server, so no IRIS
+instance or network is needed:
+
+    python benchmarks/bench_tool.py --iterations 200 --output results.json
+    python benchmarks/bench_tool.py --baseline results.json
+
+Reports per-operation latency percentiles, throughput of ``invoke`` from
+threads vs ``ainvoke`` from one event loop at several concurrency levels,
+peak memory of a large ``query`` vs ``stream_query``, and the cost of
+parsing and rendering REST payloads and query rows in each output format. Results are written as JSON;
+``--baseline`` prints the relative change against an earlier run.
+"""
+
+import argparse
+import asyncio
+import datetime
+import functools
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir, "src", "python", "rag"))
+sys.path.insert(0, os.path.dirname(__file__))
+
+import fake_iris
+
+sys.modules["iris"] = fake_iris
+
+import yaml
+
+from langchain_iris_tool import IRISConnectionPool, InterSystemsIRISTool, MetadataCache
+from langchain_iris_tool.formatting import OUTPUT_FORMATS, format_result, loads
+from stub_server import atelier_payload, start_stub_server
+
+
+LATENCY_CASES = {
+    "get_global": {"operation": "get_global", "global_name": "Bench", "subscripts": [1]},
+    "set_global": {"operation": "set_global", "global_name": "Bench", "subscripts": [1], "global_value": "x"},
+    "traverse_global": {"operation": "traverse_global", "global_name": "Bench", "max_nodes": 50},
+    "query": {"operation": "query", "query": "SELECT ID, Name, Email FROM Sample.Person WHERE ID > ?", "parameters": [0]},
+    "install_path": {"operation": "install_path"},
+    "server_info": {"operation": "server_info"},
+    "list_jobs": {"operation": "list_jobs", "namespace": "USER"},
+    "list_files": {"operation": "list_files", "namespace": "USER"},
+    "query_metrics": {"operation": "query_metrics", "metric_name": "iris_"},
+}
+THROUGHPUT_CASES = {
+    "native": LATENCY_CASES["get_global"],
+    "rest": LATENCY_CASES["list_jobs"],
+}
+
+
+def percentiles(samples_ms):
+    ordered = sorted(samples_ms)
+
+    def pick(q):
+        return round(ordered[min(len(ordered) - 1, int(len(ordered) * q))], 4)
+
+    return {
+        "n": len(ordered),
+        "mean": round(statistics.mean(ordered), 4),
+        "p50": pick(0.50),
+        "p90": pick(0.90),
+        "p99": pick(0.99),
+        "max": round(ordered[-1], 4),
+    }
+
+
+def make_tool(baseurl, max_size, cached):
+    host, webport = baseurl.rsplit("//", 1)[1].split(":")
+    pool = IRISConnectionPool(host, 1972, "USER", "_system", "SYS", min_size=1, max_size=max_size)
+    pool.prefill()
+    cache = MetadataCache() if cached else MetadataCache(ttls={})
+    return InterSystemsIRISTool(
+        username="_system", password="SYS", hostname=host, port=1972, webport=int(webport),
+        namespace="USER", pool=pool, cache=cache, http_options={"pool_maxsize": max_size},
+    )
+
+
+def bench_latency(tool, iterations):
+    for node in range(200):
+        fake_iris._globals[("Bench", node)] = f"value{node}"
+    results = {}
+    for name, case in LATENCY_CASES.items():
+        tool.invoke(case)  # warm up connections, statements and keep-alive sockets
+        samples = []
+        for _ in range(iterations):
+            start = time.perf_counter()
+            result = tool.invoke(case)
+            samples.append((time.perf_counter() - start) * 1000)
+        if isinstance(result, str) and result.startswith("Error"):
+            raise RuntimeError(f"{name}: {result}")
+        results[name] = percentiles(samples)
+    return results
+
+
+def bench_throughput(tool, calls, levels):
+    results = {}
+    for kind, case in THROUGHPUT_CASES.items():
+        for concurrency in levels:
+            with ThreadPoolExecutor(max_workers=concurrency) as executor:
+                start = time.perf_counter()
+                list(executor.map(lambda _: tool.invoke(case), range(calls)))
+                threaded = calls / (time.perf_counter() - start)
+
+            async def run_async():
+                limit = asyncio.Semaphore(concurrency)
+
+                async def one():
+                    async with limit:
+                        await tool.ainvoke(case)
+
+                start = time.perf_counter()
+                await asyncio.gather(*(one() for _ in range(calls)))
+                return calls / (time.perf_counter() - start)
+
+            results[f"{kind}@{concurrency}"] = {
+                "invoke_ops_per_sec": round(threaded, 1),
+                "ainvoke_ops_per_sec": round(asyncio.run(run_async()), 1),
+            }
+    return results
+
+
+def bench_memory(tool, rows):
+    fake_iris.configure(rows=rows)
+    sql = "SELECT ID, Name, Email FROM Sample.Person"
+    try:
+        tracemalloc.start()
+        result = tool.invoke({"operation": "query", "query": sql, "max_rows": rows})
+        _, query_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        tracemalloc.start()
+        streamed = sum(1 for _ in tool.stream_query(sql))
+        _, stream_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    finally:
+        fake_iris.configure(rows=100)
+    returned = len(result["rows"]) if isinstance(result, dict) else len(result)
+    return {
+        "rows": rows,
+        "query_rows_returned": returned,
+        "query_peak_mb": round(query_peak / 2 ** 20, 3),
+        "stream_query_rows": streamed,
+        "stream_query_peak_mb": round(stream_peak / 2 ** 20, 3),
+    }
+
+
+def time_call(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        output = fn()
+    return round((time.perf_counter() - start) * 1000 / repeat, 4), len(output)
+
+
+def bench_serialization(repeat):
+    payloads = {
+        "docnames_2000": atelier_payload("/api/atelier/v1/USER/docnames/CLS", docnames=2000),
+        "jobs": atelier_payload("/api/atelier/v1/USER/jobs"),
+        "rows_1000": [list(fake_iris.IRISCursor._row(i)) for i in range(1000)],
+    }
+    renderers = {"yaml.dump": yaml.dump}
+    for output_format in OUTPUT_FORMATS:
+        renderers[output_format] = functools.partial(format_result, output_format=output_format)
+    results = {}
+    for name, payload in payloads.items():
+        for label, render in renderers.items():
+            ms, size = time_call(lambda: render(payload), repeat)
+            results[f"{name}.{label}"] = {"ms": ms, "chars": size}
+        ms, _ = time_call(lambda: loads(json.dumps(payload).encode()), repeat)
+        results[f"{name}.parse"] = {"ms": ms, "chars": len(json.dumps(payload))}
+    return results
+
+
+def flatten(data, prefix=""):
+    for key, value in data.items():
+        if isinstance(value, dict):
+            yield from flatten(value, f"{prefix}{key}.")
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            yield f"{prefix}{key}", value
+
+
+def compare(current, baseline):
+    old = dict(flatten(baseline["results"]))
+    print(f"\nChange vs baseline ({baseline['meta']['timestamp']}):")
+    for key, value in flatten(current["results"]):
+        if key in old and old[key] and not key.endswith(".n"):
+            print(f"  {key:<48} {old[key]:>12} -> {value:>12}  ({(value - old[key]) / old[key]:+.1%})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=200, help="calls per operation for latency percentiles")
+    parser.add_argument("--calls", type=int, default=400, help="calls per throughput measurement")
+    parser.add_argument("--concurrency", default="1,8,32", help="comma-separated concurrency levels")
+    parser.add_argument("--rows", type=int, default=50000, help="rows in the large query for the memory benchmark")
+    parser.add_argument("--latency", type=float, default=0.0005, help="simulated IRIS round-trip in seconds")
+    parser.add_argument("--http-delay", type=float, default=0.0, help="simulated web server delay in seconds")
+    parser.add_argument("--cached", action="store_true", help="keep the metadata cache enabled")
+    parser.add_argument("--output", default="benchmark-results.json")
+    parser.add_argument("--baseline", help="earlier results file to compare against")
+    args = parser.parse_args()
+
+    levels = [int(c) for c in args.concurrency.split(",")]
+    fake_iris.configure(latency=args.latency)
+    server, baseurl = start_stub_server(delay=args.http_delay)
+    tool = make_tool(baseurl, max(levels), args.cached)
+    try:
+        results = {
+            "latency_ms": bench_latency(tool, args.iterations),
+            "throughput": bench_throughput(tool, args.calls, levels),
+            "memory": bench_memory(tool, args.rows),
+            "serialization": bench_serialization(max(1, args.iterations // 20)),
+        }
+    finally:
+        server.shutdown()
+
+    report = {
+        "meta": {
+            "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "args": vars(args),
+        },
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+    for name, stats in results["latency_ms"].items():
+        print(f"{name:<16} p50 {stats['p50']:8.3f} ms   p90 {stats['p90']:8.3f} ms   p99 {stats['p99']:8.3f} ms")
+    for name, stats in results["throughput"].items():
+        print(f"{name:<16} invoke {stats['invoke_ops_per_sec']:9.1f} ops/s   ainvoke {stats['ainvoke_ops_per_sec']:9.1f} ops/s")
+    memory = results["memory"]
+    print(f"query {memory['rows']} rows: peak {memory['query_peak_mb']} MB, stream_query peak {memory['stream_query_peak_mb']} MB")
+    for name, stats in results["serialization"].items():
+        print(f"{name:<24} {stats['ms']:8.3f} ms  {stats['chars']:>9} chars")
+    print(f"\nResults written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            compare(report, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
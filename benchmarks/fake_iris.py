@@ -0,0 +1,219 @@
+"""In-process stand-in for the ``iris`` module (intersystems-irispython).
+
+Implements the parts of the native API and DB-API that InterSystemsIRISTool
+uses, with a configurable per-round-trip latency and result size, so the
+tool can be benchmarked without an IRIS instance. Install it before the
+tool is imported:
+
+    import sys, fake_iris
+    sys.modules["iris"] = fake_iris
+"""
+
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+
+LATENCY = 0.0005
+"""Seconds added to every simulated network round-trip."""
+ROWS = 100
+"""Rows returned by any SELECT other than ``SELECT 1``."""
+CONNECT_LATENCY = 0.02
+"""Seconds spent in :func:`connect` (TCP handshake plus login)."""
+FAIL_VALUE = "__fail__"
+"""``executemany`` raises on a row containing this value, after writing the rows before it."""
+
+_globals: Dict[Tuple[Any, ...], Any] = {}
+_globals_lock = threading.Lock()
+stats = {"connects": 0, "round_trips": 0}
+
+
+def configure(latency: Optional[float] = None, rows: Optional[int] = None, connect_latency: Optional[float] = None) -> None:
+    global LATENCY, ROWS, CONNECT_LATENCY
+    if latency is not None:
+        LATENCY = latency
+    if rows is not None:
+        ROWS = rows
+    if connect_latency is not None:
+        CONNECT_LATENCY = connect_latency
+
+
+def reset() -> None:
+    with _globals_lock:
+        _globals.clear()
+    stats.update(connects=0, round_trips=0)
+
+
+def _round_trip() -> None:
+    stats["round_trips"] += 1
+    if LATENCY:
+        time.sleep(LATENCY)
+
+
+def _collation_key(subscript: Any) -> Tuple[int, Any]:
+    return (0, subscript) if isinstance(subscript, (int, float)) else (1, str(subscript))
+
+
+class IRISCursor:
+    """Cursor whose SELECT results are generated lazily, ``ROWS`` rows long."""
+
+    def __init__(self, conn: Optional["IRISConnection"] = None) -> None:
+        self._conn = conn
+        self._count = 0
+        self._position = 0
+        self.description = None
+
+    def execute(self, sql: str, params: Optional[Sequence[Any]] = None) -> None:
+        _round_trip()
+        statement = sql.strip().upper()
+        if statement == "SELECT 1":
+            self._count = 1
+        elif statement.startswith("SELECT"):
+            self._count = ROWS
+        else:
+            self._count = 0
+        self._position = 0
+        if "%VID > ?" in statement:
+            # the window that continuation pages wrap their query in
+            self._position = min(int(params[-1]), self._count)
+
+    def executemany(self, sql: str, seq_of_params: Sequence[Sequence[Any]]) -> None:
+        _round_trip()
+        self._count = self._position = 0
+        if self._conn is None:
+            return
+        for params in seq_of_params:
+            if FAIL_VALUE in params:
+                raise RuntimeError("row rejected by the fake driver")
+            self._conn.write(tuple(params))
+
+    @staticmethod
+    def _row(i: int) -> Tuple[Any, ...]:
+        return (i, f"name{i}", f"user{i}@example.com")
+
+    def fetchone(self) -> Optional[Tuple[Any, ...]]:
+        rows = self.fetchmany(1)
+        return rows[0] if rows else None
+
+    def fetchmany(self, size: int = 1) -> List[Tuple[Any, ...]]:
+        _round_trip()
+        end = min(self._position + size, self._count)
+        rows = [self._row(i) for i in range(self._position, end)]
+        self._position = end
+        return rows
+
+    def fetchall(self) -> List[Tuple[Any, ...]]:
+        return self.fetchmany(self._count - self._position)
+
+    def close(self) -> None:
+        self._count = self._position = 0
+
+
+class IRISConnection:
+    """Connection whose ``executemany`` rows are kept in ``committed`` once committed."""
+
+    def __init__(self) -> None:
+        self.closed = False
+        self.autocommit = True
+        self.committed: List[Tuple[Any, ...]] = []
+        self._pending: List[Tuple[Any, ...]] = []
+
+    def setAutoCommit(self, autocommit: bool) -> None:
+        self.autocommit = autocommit
+
+    def isAutoCommit(self) -> bool:
+        return self.autocommit
+
+    def write(self, row: Tuple[Any, ...]) -> None:
+        (self.committed if self.autocommit else self._pending).append(row)
+
+    def cursor(self) -> IRISCursor:
+        return IRISCursor(self)
+
+    def commit(self) -> None:
+        _round_trip()
+        self.committed.extend(self._pending)
+        self._pending = []
+
+    def rollback(self) -> None:
+        _round_trip()
+        self._pending = []
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class IRIS:
+    def __init__(self, conn: IRISConnection) -> None:
+        self._conn = conn
+
+    def get(self, name: str, *subscripts: Any) -> Any:
+        _round_trip()
+        return _globals.get((name,) + subscripts)
+
+    def set(self, value: Any, name: str, *subscripts: Any) -> None:
+        _round_trip()
+        with _globals_lock:
+            _globals[(name,) + subscripts] = value
+
+    def kill(self, name: str, *subscripts: Any) -> None:
+        _round_trip()
+        node = (name,) + subscripts
+        with _globals_lock:
+            for key in [k for k in _globals if k[:len(node)] == node]:
+                del _globals[key]
+
+    def isDefined(self, name: str, *subscripts: Any) -> int:
+        _round_trip()
+        node = (name,) + subscripts
+        has_value = node in _globals
+        has_children = any(len(k) > len(node) and k[:len(node)] == node for k in list(_globals))
+        return (1 if has_value else 0) + (10 if has_children else 0)
+
+    def nextSubscript(self, reversed: bool, name: str, *subscripts: Any) -> Any:
+        _round_trip()
+        prefix, current = (name,) + subscripts[:-1], subscripts[-1]
+        depth = len(prefix)
+        children = sorted(
+            {k[depth] for k in list(_globals) if len(k) > depth and k[:depth] == prefix},
+            key=_collation_key,
+        )
+        if reversed:
+            children = children[::-1]
+        for child in children:
+            if current == "":
+                return child
+            if reversed and _collation_key(child) < _collation_key(current):
+                return child
+            if not reversed and _collation_key(child) > _collation_key(current):
+                return child
+        return None
+
+    def classMethodString(self, class_name: str, method: str, *args: Any) -> str:
+        _round_trip()
+        if (class_name, method) == ("%SYSTEM.Util", "InstallDirectory"):
+            return "/usr/irissys/"
+        return ""
+
+    def classMethodVoid(self, class_name: str, method: str, *args: Any) -> None:
+        _round_trip()
+
+    def tStart(self) -> None:
+        _round_trip()
+
+    def tCommit(self) -> None:
+        _round_trip()
+
+    def tRollback(self) -> None:
+        _round_trip()
+
+
+def connect(connection_string: str, username: str = "", password: str = "", sharedmemory: bool = False) -> IRISConnection:
+    stats["connects"] += 1
+    if CONNECT_LATENCY:
+        time.sleep(CONNECT_LATENCY)
+    return IRISConnection()
+
+
+def createIRIS(conn: IRISConnection) -> IRIS:
+    return IRIS(conn)
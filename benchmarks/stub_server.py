@@ -0,0 +1,94 @@
+"""Local stand-in for the IRIS Atelier and monitor REST APIs.
+
+Serves canned JSON for the paths used by InterSystemsIRISTool, with HTTP/1.1
+keep-alive and optional gzip, so HTTP clients can be tested and benchmarked
+offline.
+"""
+
+import gzip
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional, Tuple
+
+
+METRICS = "\n".join(
+    [
+        "# HELP iris_glo_ref_per_sec Global references per second",
+        "# TYPE iris_glo_ref_per_sec gauge",
+        "iris_glo_ref_per_sec 1520",
+        'iris_db_free_space{id="USER"} 12.5',
+        'iris_db_free_space{id="IRISSYS"} 3.25',
+        "iris_process_count 42",
+        "",
+    ]
+)
+
+
+def atelier_payload(path: str, docnames: int = 200) -> Optional[dict]:
+    """Return the canned JSON body for an Atelier/monitor ``path``."""
+    path = path.split("?", 1)[0]
+    parts = [p for p in path.split("/") if p]
+    if path.rstrip("/") == "/api/atelier":
+        return {"status": {"errors": []}, "result": {"content": {"version": "IRIS 2024.1", "namespaces": ["%SYS", "USER"]}}}
+    if path == "/api/monitor/alerts":
+        return [{"time": "2024-01-01T00:00:00Z", "severity": 1, "message": "stub alert"}]
+    if len(parts) == 4 and parts[:3] == ["api", "atelier", "v1"]:
+        return {"result": {"content": {"name": parts[3], "db": parts[3], "features": []}}}
+    if len(parts) >= 5 and parts[:3] == ["api", "atelier", "v1"]:
+        if parts[4] == "jobs":
+            return {"result": {"content": [{"pid": i, "namespace": parts[3], "state": "RUNW"} for i in range(20)]}}
+        if parts[4] == "cspapps":
+            return {"result": {"content": ["/csp/" + parts[3].lower(), "/api/atelier"]}}
+        if parts[4] == "docnames":
+            return {"result": {"content": [{"name": f"dc.Stub{i}.cls", "cat": "CLS", "db": parts[3]} for i in range(docnames)]}}
+    return None
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # headers and body are separate writes; avoid the Nagle/delayed-ACK stall
+    disable_nagle_algorithm = True
+    delay = 0.0
+    docnames = 200
+
+    def do_GET(self) -> None:
+        if self.delay:
+            threading.Event().wait(self.delay)
+        if self.path.startswith("/api/monitor/metrics"):
+            body, ctype = METRICS.encode(), "text/plain; version=0.0.4"
+        else:
+            payload = atelier_payload(self.path, self.docnames)
+            if payload is None:
+                self.send_response(404)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            body, ctype = json.dumps(payload).encode(), "application/json"
+        self.send_response(200)
+        self.send_header("Content-Type", ctype)
+        if "gzip" in self.headers.get("Accept-Encoding", ""):
+            body = gzip.compress(body)
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args) -> None:
+        pass
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address) -> None:
+        # clients that time out hang up on delayed responses; that is expected here
+        pass
+
+
+def start_stub_server(delay: float = 0.0, docnames: int = 200) -> Tuple[ThreadingHTTPServer, str]:
+    """Start the stub on a free local port; returns the server and its base URL."""
+    handler = type("Handler", (StubHandler,), {"delay": delay, "docnames": docnames})
+    server = StubServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, "http://127.0.0.1:%d" % server.server_address[1]
@@ -0,0 +1,112 @@
+"""Concurrent execution of the tool calls in a chat model response."""
+
+import asyncio
+import json
+import queue
+import threading
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Sequence, Tuple
+
+
+ToolCall = Dict[str, Any]
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_lock = threading.Lock()
+
+
+def get_loop() -> asyncio.AbstractEventLoop:
+    """The process-wide event loop that runs tool calls, on a daemon thread.
+
+    Reusing one loop across turns keeps the tools' async HTTP clients and
+    their keep-alive connections alive instead of a new loop per click.
+    """
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="tool-calls", daemon=True).start()
+        return _loop
+
+
+def call_key(tool_call: ToolCall) -> str:
+    """Identity of a call within a turn: tool name plus canonical arguments."""
+    return json.dumps([tool_call.get("name"), tool_call.get("args") or {}], sort_keys=True, default=str)
+
+
+def group_tool_calls(tool_calls: Sequence[ToolCall]) -> Dict[str, List[ToolCall]]:
+    """Group identical calls, keeping the order in which each first appears."""
+    groups: Dict[str, List[ToolCall]] = {}
+    for tool_call in tool_calls:
+        groups.setdefault(call_key(tool_call), []).append(tool_call)
+    return groups
+
+
+async def _run_call(tools: Dict[str, Any], tool_call: ToolCall, timeout: Optional[float]) -> Any:
+    tool = tools.get(tool_call.get("name"))
+    if tool is None:
+        return f"Error: unknown tool {tool_call.get('name')!r}"
+    try:
+        return await asyncio.wait_for(tool.ainvoke(tool_call.get("args") or {}), timeout)
+    except asyncio.TimeoutError:
+        return f"Error: {tool_call.get('name')} timed out after {timeout}s"
+    except Exception as e:
+        return f"Error: {type(e).__name__}: {e}"
+
+
+async def iter_tool_results(
+    tools: Dict[str, Any], tool_calls: Sequence[ToolCall], timeout: Optional[float] = None
+) -> AsyncIterator[Tuple[ToolCall, Any]]:
+    """Run every distinct call concurrently and yield ``(call, result)`` as each finishes.
+
+    Identical calls (same tool and arguments) run once and every copy is
+    yielded with the shared result. Failures are yielded as error strings
+    so one bad call does not cancel the others.
+    """
+    groups = group_tool_calls(tool_calls)
+
+    async def run(calls: List[ToolCall]) -> Tuple[List[ToolCall], Any]:
+        return calls, await _run_call(tools, calls[0], timeout)
+
+    for finished in asyncio.as_completed([run(calls) for calls in groups.values()]):
+        calls, result = await finished
+        for tool_call in calls:
+            yield tool_call, result
+
+
+def run_tool_calls(
+    tools: Sequence[Any],
+    tool_calls: Sequence[ToolCall],
+    on_result: Optional[Callable[[int, ToolCall, Any], None]] = None,
+    timeout: Optional[float] = None,
+) -> List[Any]:
+    """Execute the tool calls of one model response; returns results in call order.
+
+    ``on_result(index, call, result)`` is called as soon as each call
+    finishes, e.g. to render partial results. Meant for synchronous
+    callers such as Streamlit scripts: the calls run on the shared loop of
+    :func:`get_loop` while ``on_result`` runs on the caller's thread, which
+    is the only one Streamlit renders from.
+    """
+    by_name = {tool.name: tool for tool in tools}
+    positions = {id(tool_call): index for index, tool_call in enumerate(tool_calls)}
+    results: List[Any] = [None] * len(tool_calls)
+    finished: "queue.Queue[Optional[Tuple[ToolCall, Any]]]" = queue.Queue()
+
+    async def main() -> None:
+        try:
+            async for tool_call, result in iter_tool_results(by_name, tool_calls, timeout):
+                finished.put((tool_call, result))
+        finally:
+            finished.put(None)
+
+    future = asyncio.run_coroutine_threadsafe(main(), get_loop())
+    while True:
+        item = finished.get()
+        if item is None:
+            break
+        tool_call, result = item
+        index = positions[id(tool_call)]
+        results[index] = result
+        if on_result is not None:
+            on_result(index, tool_call, result)
+    future.result()
+    return results
@@ -0,0 +1,142 @@
+"""Semantic cache of RAG answers in an IRIS vector collection."""
+
+import hashlib
+import json
+import math
+import os
+import tempfile
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from langchain_core.documents import Document
+from langchain_iris import IRISVector
+
+
+def cosine_similarity(a: List[float], b: List[float]) -> float:
+    dot = sum(x * y for x, y in zip(a, b))
+    norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+    return dot / norm if norm else 0.0
+
+
+class SemanticAnswerCache:
+    """Previous question/answer pairs, looked up by question similarity.
+
+    Questions are embedded into the ``{collection_name}_answers`` collection
+    with the answer and the corpus version in their metadata. A lookup
+    returns a stored answer when a question's cosine similarity to the new
+    one is at least ``threshold``, it was answered against the current
+    corpus ``version`` and it is younger than ``ttl`` seconds. A local
+    manifest tracks entry ages and versions so stale entries are deleted
+    and the collection never holds more than ``max_entries`` answers.
+    Lookups and stores from concurrent sessions take turns on a lock.
+    """
+
+    def __init__(
+        self,
+        embeddings: Any,
+        connection_string: str,
+        collection_name: str,
+        threshold: float = 0.95,
+        ttl: float = 7 * 24 * 3600,
+        max_entries: int = 1000,
+        candidates: int = 4,
+        manifest_dir: str = ".",
+    ) -> None:
+        self.embeddings = embeddings
+        self.collection_name = collection_name + "_answers"
+        self.threshold = threshold
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.candidates = candidates
+        self.manifest_path = os.path.join(manifest_dir, f".{self.collection_name}.cache.json")
+        self._manifest = self._load_manifest()
+        self.store = IRISVector(
+            embedding_function=embeddings,
+            collection_name=self.collection_name,
+            connection_string=connection_string,
+            pre_delete_collection=not self._manifest,
+        )
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def _load_manifest(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self.manifest_path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_manifest(self) -> None:
+        directory, name = os.path.split(self.manifest_path)
+        with tempfile.NamedTemporaryFile("w", encoding="utf-8", dir=directory or ".", prefix=name, suffix=".tmp", delete=False) as f:
+            json.dump(self._manifest, f)
+        os.replace(f.name, self.manifest_path)
+
+    @staticmethod
+    def entry_id(question: str, version: str) -> str:
+        return hashlib.sha256((version + "\0" + question.strip()).encode("utf-8")).hexdigest()
+
+    def _fresh(self, entry_id: str, version: str, now: float) -> bool:
+        entry = self._manifest.get(entry_id)
+        return entry is not None and entry["version"] == version and now - entry["created"] < self.ttl
+
+    def lookup(self, question: str, version: str) -> Optional[str]:
+        """Return the stored answer to a similar question, or None."""
+        # embed before taking the lock: a new question is a call to the model
+        vector = self.embeddings.embed_query(question) if self._manifest else None
+        with self._lock:
+            if vector is None or not self._manifest:
+                self.misses += 1
+                return None
+            now = time.time()
+            exact = self.entry_id(question, version)
+            for document in self.store.similarity_search_by_vector(vector, k=self.candidates):
+                metadata = document.metadata or {}
+                candidate = metadata.get("entry_id")
+                if not candidate or not self._fresh(candidate, version, now):
+                    continue
+                # the stored question's vector is an embedding cache hit, so scoring is local
+                if candidate == exact or cosine_similarity(vector, self.embeddings.embed_query(document.page_content)) >= self.threshold:
+                    self.hits += 1
+                    return metadata.get("answer")
+            self.misses += 1
+            return None
+
+    def store_answer(self, question: str, answer: str, version: str) -> None:
+        """Remember an answer, evicting stale, expired and overflowing entries."""
+        now = time.time()
+        entry_id = self.entry_id(question, version)
+        document = Document(
+            page_content=question,
+            metadata={"entry_id": entry_id, "answer": answer, "version": version, "created": now},
+        )
+        with self._lock:
+            if entry_id in self._manifest:
+                self.store.delete(ids=[entry_id])
+            self.store.add_documents([document], ids=[entry_id])
+            self._manifest[entry_id] = {"version": version, "created": now}
+
+            doomed = [i for i in self._manifest if not self._fresh(i, version, now)]
+            live = sorted((i for i in self._manifest if i not in doomed), key=lambda i: self._manifest[i]["created"])
+            doomed += live[: max(0, len(live) - self.max_entries)]
+            if doomed:
+                self.store.delete(ids=doomed)
+                for i in doomed:
+                    del self._manifest[i]
+            self._save_manifest()
+
+
+_caches: Dict[Any, SemanticAnswerCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_answer_cache(embeddings: Any, connection_string: str, collection_name: str, **options: Any) -> SemanticAnswerCache:
+    """Return the process-wide answer cache for a connection and collection."""
+    key = (connection_string, collection_name)
+    # sessions racing on their first question must share one cache, or both pre-delete the collection
+    with _caches_lock:
+        if key not in _caches:
+            _caches[key] = SemanticAnswerCache(embeddings, connection_string, collection_name, **options)
+        return _caches[key]
@@ -0,0 +1,149 @@
+"""Incremental export of the IRIS class dictionary for the Classes Chat page."""
+
+import csv
+import functools
+import json
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from typing import IO, Any, Dict, Iterable, Iterator, Optional
+
+from sqlalchemy import create_engine, text
+
+from langchain_iris_tool.class_index import SYSTEM_FILTER, TIME_CHANGED_SECONDS
+
+
+CLASS_COLUMNS = ["ID", "Super", "Abstract", "ClassType", "SqlTableName", "Description"]
+
+
+@functools.lru_cache(maxsize=None)
+def get_engine(connection_string: str) -> Any:
+    """One SQLAlchemy engine (and connection pool) per connection string."""
+    return create_engine(connection_string, pool_pre_ping=True)
+
+
+@contextmanager
+def _replacing(path: str) -> Iterator[IO[str]]:
+    """Write a unique temp file next to ``path``, then move it over ``path``."""
+    with tempfile.NamedTemporaryFile(
+        "w", newline="", encoding="utf-8", dir=os.path.dirname(path) or ".",
+        prefix=os.path.basename(path), suffix=".tmp", delete=False,
+    ) as f:
+        yield f
+    os.replace(f.name, path)
+
+
+class ClassDictionarySync:
+    """Keeps a CSV of class definitions up to date from ``%Dictionary.ClassDefinition``.
+
+    A watermark on ``TimeChanged`` means each sync only reads the classes
+    changed since the previous one, streaming them row by row. Deleted
+    classes are detected from a cheap ``COUNT(*)``, and only then is the ID
+    list read. The CSV is rewritten only when something changed, so its
+    modification time tells the vector index whether to re-sync. One sync
+    runs at a time; a session arriving during a sync waits for it and is
+    then throttled.
+    """
+
+    def __init__(self, connection_string: str, csv_path: str = "classes.csv", min_interval: float = 30.0) -> None:
+        self.engine = get_engine(connection_string)
+        self.csv_path = csv_path
+        self.state_path = os.path.join(os.path.dirname(csv_path) or ".", "." + os.path.basename(csv_path) + ".sync.json")
+        self.min_interval = min_interval
+        # None, not 0.0: the monotonic clock may be younger than min_interval
+        self._last_sync: Optional[float] = None
+        self._state = self._load_state()
+        self._lock = threading.Lock()
+
+    def _load_state(self) -> Dict[str, Any]:
+        try:
+            with open(self.state_path, encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            state = {}
+        if not os.path.exists(self.csv_path):
+            state = {}
+        return {"watermark": state.get("watermark"), "count": state.get("count", 0)}
+
+    def _read_store(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self.csv_path, newline="", encoding="utf-8") as f:
+                return {row["ID"]: row for row in csv.DictReader(f)}
+        except OSError:
+            return {}
+
+    def _write_store(self, rows: Iterable[Dict[str, Any]]) -> None:
+        with _replacing(self.csv_path) as f:
+            writer = csv.DictWriter(f, fieldnames=CLASS_COLUMNS, extrasaction="ignore")
+            writer.writeheader()
+            for row in sorted(rows, key=lambda r: r["ID"]):
+                writer.writerow(row)
+        with _replacing(self.state_path) as f:
+            json.dump(self._state, f)
+
+    def _changed_rows(self, connection: Any) -> Iterable[Dict[str, Any]]:
+        columns = ", ".join(CLASS_COLUMNS)
+        sql = f"SELECT {columns}, {TIME_CHANGED_SECONDS} AS Changed FROM %Dictionary.ClassDefinition WHERE {SYSTEM_FILTER}"
+        params = {}
+        if self._state["watermark"] is not None:
+            sql += f" AND {TIME_CHANGED_SECONDS} > :watermark"
+            params["watermark"] = self._state["watermark"]
+        result = connection.execution_options(stream_results=True).execute(text(sql), params)
+        for row in result.mappings():
+            yield dict(row)
+
+    def sync(self, force: bool = False) -> Dict[str, int]:
+        """Apply class changes since the last sync; returns change counts."""
+        with self._lock:
+            if not force and self._last_sync is not None and time.monotonic() - self._last_sync < self.min_interval:
+                return {"changed": 0, "deleted": 0, "skipped": 1}
+            self._last_sync = time.monotonic()
+
+            with self.engine.connect() as connection:
+                store: Optional[Dict[str, Dict[str, Any]]] = None
+                changed = 0
+                watermark = self._state["watermark"]
+                for row in self._changed_rows(connection):
+                    if store is None:
+                        store = self._read_store()
+                    seconds = float(row.pop("Changed") or 0)
+                    watermark = seconds if watermark is None else max(watermark, seconds)
+                    store[row["ID"]] = row
+                    changed += 1
+
+                count = connection.execute(
+                    text(f"SELECT COUNT(*) FROM %Dictionary.ClassDefinition WHERE {SYSTEM_FILTER}")
+                ).scalar()
+                deleted = 0
+                if store is None and count != self._state["count"]:
+                    store = self._read_store()
+                if store is not None and len(store) != count:
+                    live = {
+                        r[0]
+                        for r in connection.execute(
+                            text(f"SELECT ID FROM %Dictionary.ClassDefinition WHERE {SYSTEM_FILTER}")
+                        )
+                    }
+                    for class_id in [i for i in store if i not in live]:
+                        del store[class_id]
+                        deleted += 1
+
+            if store is not None:
+                self._state = {"watermark": watermark, "count": count}
+                self._write_store(store.values())
+            return {"changed": changed, "deleted": deleted, "skipped": 0}
+
+
+_syncs: Dict[Any, ClassDictionarySync] = {}
+_syncs_lock = threading.Lock()
+
+
+def get_class_sync(connection_string: str, csv_path: str = "classes.csv") -> ClassDictionarySync:
+    """Return the process-wide syncer, keeping its watermark across Streamlit reruns."""
+    key = (connection_string, csv_path)
+    with _syncs_lock:
+        if key not in _syncs:
+            _syncs[key] = ClassDictionarySync(connection_string, csv_path)
+        return _syncs[key]
@@ -0,0 +1,208 @@
+"""Persistent on-disk cache for embedding vectors, keyed by model and content hash."""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+
+COMPACT_MIN = 1024
+"""Index log lines kept before the log may be folded into ``index.json``."""
+
+
+class EmbeddingStore:
+    """Fixed-width float32 vectors in a memory-mapped file plus a JSON index.
+
+    ``vectors.f32`` holds one row per slot and grows geometrically up to
+    ``max_entries`` rows; ``index.json`` maps keys to slots and records a
+    use counter per key. When the store is full the least recently used
+    slot is overwritten. Puts append their ``[key, slot, use]`` entries to
+    ``index.log``, which is replayed on load and folded into ``index.json``
+    once it outgrows the index, so a put costs I/O for its own keys only.
+    """
+
+    def __init__(self, directory: str, max_entries: int = 100_000) -> None:
+        self.directory = directory
+        self.max_entries = max_entries
+        os.makedirs(directory, exist_ok=True)
+        self._vectors_path = os.path.join(directory, "vectors.f32")
+        self._index_path = os.path.join(directory, "index.json")
+        self._log_path = os.path.join(directory, "index.log")
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self) -> None:
+        try:
+            with open(self._index_path, encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            state = {"dim": None, "capacity": 0, "clock": 0, "slots": {}}
+        self.dim: Optional[int] = state["dim"]
+        self._capacity: int = state["capacity"]
+        self._clock: int = state["clock"]
+        # key -> [slot, last use]
+        self._slots: Dict[str, List[int]] = state["slots"]
+        self._vectors = None
+        self._logged = 0
+        if self.dim and self._capacity and os.path.exists(self._vectors_path):
+            self._vectors = np.memmap(self._vectors_path, dtype=np.float32, mode="r+", shape=(self._capacity, self.dim))
+            self._replay()
+        else:
+            self._slots, self._capacity = {}, 0
+
+    def _replay(self) -> None:
+        try:
+            with open(self._log_path, encoding="utf-8") as f:
+                lines = f.readlines()
+        except OSError:
+            return
+        owners = {entry[0]: key for key, entry in self._slots.items()}
+        for line in lines:
+            try:
+                key, slot, clock = json.loads(line)
+            except ValueError:
+                continue  # a write cut short by a crash
+            if not 0 <= slot < self._capacity:
+                continue
+            # the slot was overwritten: whichever key held it before is gone
+            previous = owners.get(slot)
+            if previous is not None and previous != key:
+                del self._slots[previous]
+            entry = self._slots.get(key)
+            if entry is not None and entry[0] != slot:
+                owners.pop(entry[0], None)
+            self._slots[key] = [slot, clock]
+            owners[slot] = key
+            self._clock = max(self._clock, clock)
+        self._logged = len(lines)
+
+    def _save(self) -> None:
+        """Write the whole index to ``index.json`` and empty the log."""
+        if self._vectors is not None:
+            self._vectors.flush()
+        state = {"dim": self.dim, "capacity": self._capacity, "clock": self._clock, "slots": self._slots}
+        with tempfile.NamedTemporaryFile("w", encoding="utf-8", dir=self.directory, suffix=".tmp", delete=False) as f:
+            json.dump(state, f, separators=(",", ":"))
+        os.replace(f.name, self._index_path)
+        open(self._log_path, "w").close()
+        self._logged = 0
+
+    def _append(self, entries: List[str]) -> None:
+        self._vectors.flush()
+        if self._logged + len(entries) > max(COMPACT_MIN, len(self._slots)):
+            self._save()
+            return
+        with open(self._log_path, "a", encoding="utf-8") as f:
+            f.write("".join(entry + "\n" for entry in entries))
+        self._logged += len(entries)
+
+    def _grow(self, needed: int) -> None:
+        capacity = min(self.max_entries, max(needed, 2 * self._capacity, 1024))
+        if capacity <= self._capacity:
+            return
+        if self._vectors is not None:
+            self._vectors.flush()
+            del self._vectors
+        with open(self._vectors_path, "ab") as f:
+            f.truncate(capacity * self.dim * 4)
+        self._vectors = np.memmap(self._vectors_path, dtype=np.float32, mode="r+", shape=(capacity, self.dim))
+        self._capacity = capacity
+        # log entries do not record the capacity, so a new one starts a new index.json
+        self._save()
+
+    def _free_slot(self) -> int:
+        if len(self._slots) < self._capacity:
+            return len(self._slots)
+        if self._capacity < self.max_entries:
+            self._grow(self._capacity + 1)
+            return len(self._slots)
+        victim = min(self._slots, key=lambda k: self._slots[k][1])
+        return self._slots.pop(victim)[0]
+
+    def get_many(self, keys: Sequence[str]) -> List[Optional[List[float]]]:
+        """Return the cached vector for each key, or None for misses."""
+        with self._lock:
+            found: List[Optional[List[float]]] = []
+            for key in keys:
+                entry = self._slots.get(key)
+                if entry is None or self._vectors is None:
+                    found.append(None)
+                    continue
+                self._clock += 1
+                entry[1] = self._clock
+                found.append(self._vectors[entry[0]].tolist())
+            return found
+
+    def put_many(self, keys: Sequence[str], vectors: Sequence[Sequence[float]]) -> None:
+        """Store vectors for keys and log their index entries."""
+        if not keys:
+            return
+        with self._lock:
+            if self.dim is None:
+                self.dim = len(vectors[0])
+            entries = []
+            for key, vector in zip(keys, vectors):
+                if len(vector) != self.dim:
+                    raise ValueError(f"Embedding has {len(vector)} dimensions, cache holds {self.dim}")
+                entry = self._slots.get(key)
+                slot = entry[0] if entry is not None else self._free_slot()
+                self._vectors[slot] = np.asarray(vector, dtype=np.float32)
+                self._clock += 1
+                self._slots[key] = [slot, self._clock]
+                entries.append(json.dumps([key, slot, self._clock]))
+            self._append(entries)
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+
+class CachedEmbeddings(Embeddings):
+    """Embeddings wrapper that only computes vectors it has not seen before.
+
+    Texts are looked up in batch by ``sha256(model_name + text)``; only the
+    misses are sent to the wrapped embeddings, in one batched call, and
+    stored for later runs.
+    """
+
+    def __init__(self, embeddings: Embeddings, model_name: str, cache_dir: str = ".embedding_cache", max_entries: int = 100_000) -> None:
+        self.embeddings = embeddings
+        self.model_name = model_name
+        slug = hashlib.sha256(model_name.encode("utf-8")).hexdigest()[:16]
+        self.store = EmbeddingStore(os.path.join(cache_dir, slug), max_entries)
+        self.hits = 0
+        self.misses = 0
+
+    def _key(self, text: str) -> str:
+        return hashlib.sha256((self.model_name + "\0" + text).encode("utf-8")).hexdigest()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        keys = [self._key(text) for text in texts]
+        vectors = self.store.get_many(keys)
+        missing: Dict[str, str] = {}
+        for key, text, vector in zip(keys, texts, vectors):
+            if vector is None:
+                missing.setdefault(key, text)
+        self.hits += len(texts) - sum(1 for v in vectors if v is None)
+        self.misses += len(missing)
+        if missing:
+            computed = self.embeddings.embed_documents(list(missing.values()))
+            self.store.put_many(list(missing), computed)
+            by_key = dict(zip(missing, computed))
+            vectors = [v if v is not None else list(by_key[k]) for k, v in zip(keys, vectors)]
+        return vectors
+
+    def embed_query(self, text: str) -> List[float]:
+        key = self._key(text)
+        vector = self.store.get_many([key])[0]
+        if vector is not None:
+            self.hits += 1
+            return vector
+        self.misses += 1
+        vector = self.embeddings.embed_query(text)
+        self.store.put_many([key], [vector])
+        return list(vector)
@@ -1,14 +1,54 @@
-from langchain.llms import Ollama
-from langchain.chains import RetrievalQA
-from langchain.document_loaders import CSVLoader
-from langchain.embeddings import OllamaEmbeddings
-from langchain_iris import IRISVector
+import os
+import threading
+
+_embeddings = None
+_embeddings_lock = threading.Lock()
+
+
+def get_embeddings():
+    """Process-wide embeddings, reusing vectors already computed for identical text.
+
+    Built once, so the on-disk vector cache index is only parsed once.
+    """
+    global _embeddings
+    with _embeddings_lock:
+        if _embeddings is None:
+            # Imported here so pages that load this module only pay for them on first use
+            from langchain.embeddings import OllamaEmbeddings
+
+            from embedding_cache import CachedEmbeddings
+
+            _embeddings = CachedEmbeddings(
+                OllamaEmbeddings(model="mistral", base_url="http://ollama:11434", temperature=0),
+                model_name="ollama/mistral",
+                cache_dir=os.environ.get("EMBEDDING_CACHE_DIR", ".embedding_cache"),
+            )
+        return _embeddings
+
 
 def get_insights(question, csv_file, iris_conn, collection_name):
-    
-    # Load and process the CSV data    
-    loader = CSVLoader(csv_file)
-    documents = loader.load()
+    from answer_cache import get_answer_cache
+    from vector_index import get_index
+
+    embeddings = get_embeddings()
+
+    # Only new or changed rows are embedded; an unchanged CSV is not even reloaded
+    index = get_index(embeddings, iris_conn, collection_name)
+    index.sync_csv(csv_file)
+
+    # Near-duplicate questions against an unchanged corpus reuse the earlier answer
+    answers = get_answer_cache(
+        embeddings, iris_conn, collection_name,
+        threshold=float(os.environ.get("ANSWER_CACHE_THRESHOLD", "0.95")),
+        ttl=float(os.environ.get("ANSWER_CACHE_TTL", str(7 * 24 * 3600))),
+        max_entries=int(os.environ.get("ANSWER_CACHE_MAX_ENTRIES", "1000")),
+    )
+    answer = answers.lookup(question, index.version)
+    if answer is not None:
+        return {"query": question, "result": answer, "cached": True}
+
+    from langchain.llms import Ollama
+    from langchain.chains import RetrievalQA
 
     llm = Ollama(
         base_url="http://ollama:11434", 
@@ -16,21 +56,12 @@ def get_insights(question, csv_file, iris_conn, collection_name):
         temperature=0,
     )
 
-    # Create embeddings
-    embeddings = OllamaEmbeddings(model="mistral", base_url="http://ollama:11434", temperature=0)
-
-    db = IRISVector.from_documents(
-        embedding=embeddings, 
-        documents=documents,
-        connection_string=iris_conn,
-        collection_name=collection_name,
-        pre_delete_collection=True
-    )
-
     qa = RetrievalQA.from_chain_type(
         llm=llm,
         chain_type="stuff",
-        retriever=db.as_retriever())
+        retriever=index.store.as_retriever())
 
     
-    return qa({"query": question})
+    response = qa({"query": question})
+    answers.store_answer(question, response["result"], index.version)
+    return response
@@ -1,15 +1,78 @@
-from importlib import metadata
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
 
-from langchain_iris_tool.tools import InterSystemsIRISTool
+if TYPE_CHECKING:
+    from langchain_iris_tool.cache import MetadataCache
+    from langchain_iris_tool.class_index import ClassIndex, get_class_index
+    from langchain_iris_tool.guardrail import QueryRejectedError, SqlGuardrail
+    from langchain_iris_tool.instrumentation import InMemoryMetricsSink, MetricsSink
+    from langchain_iris_tool.metrics import MetricsSampler, parse_prometheus
+    from langchain_iris_tool.pool import IRISConnectionPool, close_all_pools, get_pool
+    from langchain_iris_tool.rest import AtelierClient, get_client
+    from langchain_iris_tool.tools import InterSystemsIRISTool
+
+# Submodules are imported on first attribute access, so importing the
+# package does not load langchain-core, pydantic, requests or the driver.
+_LAZY = {
+    "AtelierClient": "rest",
+    "ClassIndex": "class_index",
+    "IRISConnectionPool": "pool",
+    "InMemoryMetricsSink": "instrumentation",
+    "InterSystemsIRISTool": "tools",
+    "MetadataCache": "cache",
+    "MetricsSampler": "metrics",
+    "MetricsSink": "instrumentation",
+    "QueryRejectedError": "guardrail",
+    "SqlGuardrail": "guardrail",
+    "close_all_pools": "pool",
+    "get_class_index": "class_index",
+    "get_client": "rest",
+    "get_pool": "pool",
+    "parse_prometheus": "metrics",
+}
+
+
+def _version() -> str:
+    from importlib import metadata
+
+    try:
+        return metadata.version(__package__)
+    except metadata.PackageNotFoundError:
+        # Case where package metadata is not available.
+        return "0.0.1"
+
+
+def __getattr__(name: str) -> Any:
+    if name == "__version__":
+        value = globals()["__version__"] = _version()
+        return value
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f"{__name__}.{module}"), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list:
+    return sorted(set(globals()) | set(_LAZY) | {"__version__"})
 
-try:
-    __version__ = metadata.version(__package__)
-except metadata.PackageNotFoundError:
-    # Case where package metadata is not available.
-    __version__ = "0.0.1"
-del metadata  # optional, avoids polluting the results of dir(__package__)
 
 __all__ = [
+    "AtelierClient",
+    "ClassIndex",
+    "IRISConnectionPool",
+    "InMemoryMetricsSink",
     "InterSystemsIRISTool",
+    "MetadataCache",
+    "MetricsSampler",
+    "MetricsSink",
+    "QueryRejectedError",
+    "SqlGuardrail",
+    "close_all_pools",
+    "get_class_index",
+    "get_client",
+    "get_pool",
+    "parse_prometheus",
     "__version__",
-]
\ No newline at end of file
+]
@@ -0,0 +1,167 @@
+"""Batched bulk loading of rows into InterSystems IRIS tables and globals."""
+
+import csv
+import json
+import re
+import time
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Union
+
+from langchain_iris_tool.global_tree import normalize_name
+
+
+Row = Dict[str, Any]
+Progress = Callable[[Dict[str, Any]], None]
+
+_IDENTIFIER = re.compile(r"^[A-Za-z%_][A-Za-z0-9_]*(\.[A-Za-z%_][A-Za-z0-9_]*)?$")
+
+
+def read_rows(source: Union[str, Iterable[Row]]) -> Iterator[Row]:
+    """Yield dict rows from a ``.csv``/``.ndjson``/``.jsonl`` path or an iterable."""
+    if not isinstance(source, str):
+        yield from source
+        return
+    if source.lower().endswith(".csv"):
+        with open(source, newline="", encoding="utf-8") as f:
+            yield from csv.DictReader(f)
+    elif source.lower().endswith((".ndjson", ".jsonl")):
+        with open(source, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+    else:
+        raise ValueError("Source file must be .csv, .ndjson or .jsonl")
+
+
+def batched(rows: Iterable[Row], size: int) -> Iterator[List[Row]]:
+    iterator = iter(rows)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def _check_identifier(name: str, kind: str) -> str:
+    if not _IDENTIFIER.match(name):
+        raise ValueError(f"Invalid {kind} name: {name!r}")
+    return name
+
+
+class _Progress:
+    def __init__(self, target: str, callback: Optional[Progress]) -> None:
+        self.target = target
+        self.callback = callback
+        self.rows = 0
+        self.batches = 0
+        self.started = time.perf_counter()
+
+    def add(self, rows: int) -> None:
+        self.rows += rows
+        self.batches += 1
+        if self.callback is not None:
+            self.callback(self.stats())
+
+    def stats(self) -> Dict[str, Any]:
+        elapsed = time.perf_counter() - self.started
+        return {
+            "target": self.target,
+            "rows": self.rows,
+            "batches": self.batches,
+            "seconds": round(elapsed, 3),
+            "rows_per_second": round(self.rows / elapsed, 1) if elapsed else 0.0,
+        }
+
+
+def _disable_autocommit(conn: Any) -> Optional[bool]:
+    """Turn auto-commit off and return the previous setting, or None if the driver has no switch."""
+    if not hasattr(conn, "setAutoCommit"):
+        return None
+    previous = bool(conn.isAutoCommit()) if hasattr(conn, "isAutoCommit") else True
+    conn.setAutoCommit(False)
+    return previous
+
+
+def load_table(
+    conn: Any,
+    table_name: str,
+    rows: Iterable[Row],
+    columns: Optional[Sequence[str]] = None,
+    batch_size: int = 1000,
+    progress: Optional[Progress] = None,
+) -> Dict[str, Any]:
+    """Insert ``rows`` into ``table_name`` with one ``executemany`` per batch.
+
+    Columns default to the keys of the first row. Auto-commit is turned
+    off for the load and restored afterwards, before the connection goes
+    back to its pool. Each batch is committed on its own; a failing batch
+    is rolled back and the error re-raised, so the returned/progress
+    ``rows`` count is exactly what was committed.
+    """
+    _check_identifier(table_name, "table")
+    tracker = _Progress(table_name, progress)
+    autocommit = _disable_autocommit(conn)
+    cursor = conn.cursor()
+    sql = None
+    try:
+        for batch in batched(rows, batch_size):
+            if sql is None:
+                columns = list(columns or batch[0].keys())
+                for column in columns:
+                    _check_identifier(column, "column")
+                sql = "INSERT INTO {} ({}) VALUES ({})".format(
+                    table_name, ", ".join(columns), ", ".join("?" * len(columns))
+                )
+            try:
+                cursor.executemany(sql, [[row.get(c) for c in columns] for row in batch])
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            tracker.add(len(batch))
+    finally:
+        cursor.close()
+        if autocommit is not None:
+            conn.setAutoCommit(autocommit)
+    return tracker.stats()
+
+
+def load_global(
+    native: Any,
+    global_name: str,
+    rows: Iterable[Row],
+    key_fields: Sequence[str],
+    value_field: Optional[str] = None,
+    subscripts: Sequence[Any] = (),
+    batch_size: int = 1000,
+    progress: Optional[Progress] = None,
+) -> Dict[str, Any]:
+    """Set one global node per row, each batch inside a native-API transaction.
+
+    The node is ``^global_name(*subscripts, *[row[k] for k in key_fields])``
+    and its value is ``row[value_field]``, or the JSON of the remaining
+    fields when no ``value_field`` is given.
+    """
+    if not key_fields:
+        raise ValueError("At least one key field is required to load a global")
+    name = normalize_name(global_name)
+    prefix = list(subscripts)
+    tracker = _Progress("^" + name, progress)
+    for batch in batched(rows, batch_size):
+        native.tStart()
+        try:
+            for row in batch:
+                keys = [row[k] for k in key_fields]
+                if value_field is not None:
+                    value = row.get(value_field)
+                else:
+                    value = json.dumps(
+                        {k: v for k, v in row.items() if k not in key_fields}, default=str
+                    )
+                native.set(value, name, *prefix, *keys)
+            native.tCommit()
+        except Exception:
+            native.tRollback()
+            raise
+        tracker.add(len(batch))
+    return tracker.stats()
@@ -0,0 +1,106 @@
+"""TTL + LRU cache for slowly changing InterSystems IRIS metadata."""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+
+DEFAULT_TTLS: Dict[str, float] = {
+    "install_path": 3600.0,
+    "server_info": 300.0,
+    "get_namespace": 300.0,
+    "list_csp": 120.0,
+    "list_files": 60.0,
+}
+
+CacheKey = Tuple[str, str, Hashable]
+
+MISSING = object()
+
+
+class MetadataCache:
+    """Size-bounded LRU cache whose entries expire after a per-operation TTL.
+
+    Keys are ``(operation, namespace, args)``. Only operations with a TTL in
+    ``ttls`` are cached; a TTL of 0 disables caching for that operation.
+    Hit, miss and eviction counters are kept per operation.
+    """
+
+    def __init__(self, max_entries: int = 256, ttls: Optional[Dict[str, float]] = None) -> None:
+        self.max_entries = max_entries
+        self.ttls = dict(DEFAULT_TTLS if ttls is None else ttls)
+        self._entries: "OrderedDict[CacheKey, Tuple[float, Any]]" = OrderedDict()
+        self._stats: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def cacheable(self, operation: str) -> bool:
+        return self.ttls.get(operation, 0) > 0
+
+    def _count(self, operation: str, counter: str) -> None:
+        stats = self._stats.setdefault(operation, {"hits": 0, "misses": 0, "evictions": 0})
+        stats[counter] += 1
+
+    def get(self, operation: str, namespace: str, args: Hashable = None) -> Any:
+        """Return the cached value, or ``MISSING`` if absent or expired."""
+        if not self.cacheable(operation):
+            return MISSING
+        key = (operation, namespace, args)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(key)
+                self._count(operation, "hits")
+                return entry[1]
+            if entry is not None:
+                del self._entries[key]
+            self._count(operation, "misses")
+            return MISSING
+
+    def set(self, operation: str, namespace: str, args: Hashable, value: Any) -> None:
+        ttl = self.ttls.get(operation, 0)
+        if ttl <= 0 or value is None:
+            return
+        key = (operation, namespace, args)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                (evicted_op, _, _), _ = self._entries.popitem(last=False)
+                self._count(evicted_op, "evictions")
+
+    def invalidate(self, operation: Optional[str] = None, namespace: Optional[str] = None) -> int:
+        """Drop entries matching ``operation`` and/or ``namespace`` (all if neither).
+
+        Returns the number of entries removed.
+        """
+        with self._lock:
+            doomed = [
+                key
+                for key in self._entries
+                if (operation is None or key[0] == operation)
+                and (namespace is None or key[1] == namespace)
+            ]
+            for key in doomed:
+                del self._entries[key]
+            return len(doomed)
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-operation counters plus overall hit rate and current size."""
+        with self._lock:
+            operations = {op: dict(counts) for op, counts in self._stats.items()}
+            size = len(self._entries)
+        hits = sum(c["hits"] for c in operations.values())
+        misses = sum(c["misses"] for c in operations.values())
+        for counts in operations.values():
+            total = counts["hits"] + counts["misses"]
+            counts["hit_rate"] = counts["hits"] / total if total else 0.0
+        return {
+            "size": size,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+            "operations": operations,
+        }
+
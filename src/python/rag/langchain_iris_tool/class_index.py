@@ -0,0 +1,273 @@
+"""In-process index of class definitions from %Dictionary, one per namespace."""
+
+import bisect
+import difflib
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from langchain_iris_tool.query import iter_rows
+
+
+SYSTEM_FILTER = "substring(ID,1,1) <> '%' and Copyright is null"
+# TimeChanged is a $ZTIMESTAMP string ("days,seconds"), compare it as seconds
+TIME_CHANGED_SECONDS = (
+    "(CAST($PIECE(TimeChanged, ',', 1) AS INTEGER) * 86400"
+    " + CAST($PIECE(TimeChanged, ',', 2) AS NUMERIC(18,6)))"
+)
+CLASS_COLUMNS = "ID, Super, Abstract, ClassType, SqlTableName, Description"
+PROPERTY_SQL = (
+    "SELECT parent, Name, Type, Collection, Required, Description"
+    " FROM %Dictionary.PropertyDefinition WHERE parent IN ({})"
+)
+METHOD_SQL = (
+    "SELECT parent, Name, ClassMethod, ReturnType, FormalSpec, Description"
+    " FROM %Dictionary.MethodDefinition WHERE parent IN ({})"
+)
+CHUNK = 500
+
+
+def _sql_table(class_name: str, class_type: Optional[str], table: Optional[str]) -> Optional[str]:
+    """Qualified SQL table of a persistent class: package dots become underscores in the schema.
+
+    Classes of the ``User`` package are in the default ``SQLUser`` schema.
+    """
+    if (class_type or "").lower() != "persistent":
+        return None
+    package, _, short = class_name.rpartition(".")
+    schema = "SQLUser" if package.lower() in ("", "user") else package.replace(".", "_")
+    return f"{schema}.{table or short}"
+
+
+def _qualify(super_name: str, package: str) -> str:
+    """Full class name of a superclass as written in a class definition.
+
+    ``%Persistent`` is ``%Library.Persistent`` and a name without a package
+    is in the subclass's own package, as the class compiler resolves them.
+    """
+    if "." in super_name:
+        return super_name
+    if super_name.startswith("%"):
+        return f"%Library.{super_name[1:]}"
+    return f"{package}.{super_name}" if package else super_name
+
+
+def _first_line(text: Optional[str], limit: int = 200) -> str:
+    line = (text or "").strip().splitlines()[0] if (text or "").strip() else ""
+    return line[:limit]
+
+
+class ClassIndex:
+    """Classes of one namespace with their properties, methods and hierarchy.
+
+    :meth:`refresh` reads only the classes whose ``TimeChanged`` is newer
+    than the last refresh, then their properties and methods in chunks;
+    deleted classes are detected with a ``COUNT(*)`` before the ID list is
+    read. Lookups never touch the database: :meth:`describe` is a dict
+    lookup by class or SQL table name (case-insensitive), :meth:`search`
+    bisects a sorted name list for prefixes before falling back to fuzzy
+    matching, and the hierarchy is kept as parent and child maps. A
+    refresh reads from the database before it takes the lock that lookups
+    share, so lookups only wait for the in-memory update.
+    """
+
+    def __init__(self, include_system: bool = False, min_interval: float = 60.0) -> None:
+        self.include_system = include_system
+        self.min_interval = min_interval
+        self.classes: Dict[str, Dict[str, Any]] = {}
+        self._by_lower: Dict[str, str] = {}
+        self._sorted: List[str] = []
+        self._short: Dict[str, Set[str]] = {}
+        self._children: Dict[str, Set[str]] = {}
+        self._watermark: Optional[float] = None
+        self._last_refresh = 0.0
+        self._refresh_lock = threading.Lock()
+        self._lock = threading.RLock()
+
+    def _where(self) -> str:
+        return "" if self.include_system else f" WHERE {SYSTEM_FILTER}"
+
+    def _rows(self, pooled: Any, sql: str, parameters: Optional[List[Any]] = None) -> Iterable[Any]:
+        cursor = pooled.execute(sql, parameters)
+        try:
+            yield from iter_rows(cursor, 1000)
+        finally:
+            pooled.statements.release(cursor)
+
+    def _load_members(self, pooled: Any, changed: Dict[str, Dict[str, Any]]) -> None:
+        names = list(changed)
+        for start in range(0, len(names), CHUNK):
+            chunk = names[start:start + CHUNK]
+            placeholders = ",".join("?" * len(chunk))
+            for parent, name, type_, collection, required, description in self._rows(pooled, PROPERTY_SQL.format(placeholders), chunk):
+                changed[parent]["properties"].append({
+                    "name": name,
+                    "type": type_ or "%Library.String",
+                    "collection": collection or None,
+                    "required": bool(required),
+                    "description": _first_line(description),
+                })
+            for parent, name, class_method, return_type, formal_spec, description in self._rows(pooled, METHOD_SQL.format(placeholders), chunk):
+                changed[parent]["methods"].append({
+                    "name": name,
+                    "class_method": bool(class_method),
+                    "return_type": return_type or None,
+                    "arguments": formal_spec or "",
+                    "description": _first_line(description),
+                })
+
+    def refresh(self, pooled: Any, force: bool = False) -> Dict[str, int]:
+        """Apply class changes since the last refresh; returns change counts."""
+        with self._refresh_lock:
+            if not force and self.classes and time.monotonic() - self._last_refresh < self.min_interval:
+                return {"changed": 0, "deleted": 0, "skipped": 1}
+            self._last_refresh = time.monotonic()
+
+            sql = f"SELECT {CLASS_COLUMNS}, {TIME_CHANGED_SECONDS} AS Changed FROM %Dictionary.ClassDefinition{self._where()}"
+            parameters = None
+            if self._watermark is not None:
+                sql += (" AND " if self._where() else " WHERE ") + f"{TIME_CHANGED_SECONDS} > ?"
+                parameters = [self._watermark]
+            changed: Dict[str, Dict[str, Any]] = {}
+            watermark = self._watermark
+            for class_id, super_, abstract, class_type, sql_table, description, seconds in self._rows(pooled, sql, parameters):
+                seconds = float(seconds or 0)
+                watermark = seconds if watermark is None else max(watermark, seconds)
+                changed[class_id] = {
+                    "name": class_id,
+                    "super": [_qualify(s.strip(), class_id.rpartition(".")[0]) for s in (super_ or "").split(",") if s.strip()],
+                    "abstract": bool(abstract),
+                    "class_type": class_type or None,
+                    "sql_table": _sql_table(class_id, class_type, sql_table),
+                    "description": _first_line(description, 500),
+                    "properties": [],
+                    "methods": [],
+                }
+            if changed:
+                self._load_members(pooled, changed)
+
+            # only refresh() changes self.classes, so it can be read here without self._lock
+            deleted: List[str] = []
+            count = next(iter(self._rows(pooled, f"SELECT COUNT(*) FROM %Dictionary.ClassDefinition{self._where()}")))[0]
+            if count != len(set(self.classes) | set(changed)):
+                live = {row[0] for row in self._rows(pooled, f"SELECT ID FROM %Dictionary.ClassDefinition{self._where()}")}
+                deleted = [c for c in self.classes if c not in live and c not in changed]
+
+            with self._lock:
+                for class_id, info in changed.items():
+                    self._remove(class_id)
+                    self._add(info)
+                for class_id in deleted:
+                    self._remove(class_id)
+                if changed or deleted:
+                    self._sorted = sorted(self._by_lower)
+            self._watermark = watermark
+            return {"changed": len(changed), "deleted": len(deleted), "skipped": 0}
+
+    def _add(self, info: Dict[str, Any]) -> None:
+        name = info["name"]
+        self.classes[name] = info
+        self._by_lower[name.lower()] = name
+        if info["sql_table"]:
+            self._by_lower.setdefault(info["sql_table"].lower(), name)
+        self._short.setdefault(name.rsplit(".", 1)[-1].lower(), set()).add(name)
+        for parent in info["super"]:
+            self._children.setdefault(parent, set()).add(name)
+
+    def _remove(self, name: str) -> None:
+        info = self.classes.pop(name, None)
+        if info is None:
+            return
+        for key in [name.lower()] + ([info["sql_table"].lower()] if info["sql_table"] else []):
+            if self._by_lower.get(key) == name:
+                del self._by_lower[key]
+        self._short.get(name.rsplit(".", 1)[-1].lower(), set()).discard(name)
+        for parent in info["super"]:
+            self._children.get(parent, set()).discard(name)
+
+    def resolve(self, name: str) -> Optional[str]:
+        """Class name for a class or SQL table name, case-insensitive, or None."""
+        key = name.strip().lower()
+        with self._lock:
+            found = self._by_lower.get(key)
+            if found is None and len(self._short.get(key, ())) == 1:
+                found = next(iter(self._short[key]))
+            return found
+
+    def describe(self, name: str) -> Optional[Dict[str, Any]]:
+        """The class definition plus its full superclass chain, or None if unknown."""
+        with self._lock:
+            class_name = self.resolve(name)
+            if class_name is None:
+                return None
+            return {**self.classes[class_name], "ancestors": self.superclasses(class_name)}
+
+    def search(self, text: str, limit: int = 10) -> List[str]:
+        """Class names starting with ``text``, then containing it, then close matches."""
+        key = text.strip().lower()
+        with self._lock:
+            results: List[str] = []
+            start = bisect.bisect_left(self._sorted, key)
+            for candidate in self._sorted[start:]:
+                if not candidate.startswith(key) or len(results) >= limit:
+                    break
+                if self._by_lower[candidate] not in results:
+                    results.append(self._by_lower[candidate])
+            if len(results) < limit:
+                for name in sorted(self._short.get(key, ())):
+                    if name not in results:
+                        results.append(name)
+            if len(results) < limit:
+                for candidate in self._sorted:
+                    if key in candidate and self._by_lower[candidate] not in results:
+                        results.append(self._by_lower[candidate])
+                        if len(results) >= limit:
+                            break
+            if len(results) < limit:
+                for candidate in difflib.get_close_matches(key, self._sorted, n=limit, cutoff=0.6):
+                    if self._by_lower[candidate] not in results:
+                        results.append(self._by_lower[candidate])
+                for short in difflib.get_close_matches(key, list(self._short), n=limit, cutoff=0.6):
+                    results.extend(sorted(name for name in self._short[short] if name not in results))
+            return results[:limit]
+
+    def superclasses(self, name: str) -> List[str]:
+        """All ancestors in breadth-first order, including ones outside the index."""
+        with self._lock:
+            class_name = self.resolve(name) or name
+            seen: List[str] = []
+            queue = list(self.classes.get(class_name, {}).get("super", []))
+            while queue:
+                parent = queue.pop(0)
+                if parent in seen:
+                    continue
+                seen.append(parent)
+                queue.extend(self.classes.get(parent, {}).get("super", []))
+            return seen
+
+    def subclasses(self, name: str) -> List[str]:
+        """All indexed descendants in breadth-first order."""
+        with self._lock:
+            class_name = self.resolve(name) or name
+            seen: List[str] = []
+            queue = sorted(self._children.get(class_name, ()))
+            while queue:
+                child = queue.pop(0)
+                if child in seen:
+                    continue
+                seen.append(child)
+                queue.extend(sorted(self._children.get(child, ())))
+            return seen
+
+
+_indexes: Dict[Any, ClassIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_class_index(key: Any, **options: Any) -> ClassIndex:
+    """Return the shared index for ``key`` (e.g. host, port and namespace), creating it once."""
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            index = _indexes[key] = ClassIndex(**options)
+        return index
@@ -0,0 +1,127 @@
+"""Rendering of tool results for the LLM: YAML, compact JSON, CSV or a bounded summary."""
+
+import csv
+import io
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:  # optional, only makes JSON faster
+    orjson = None
+
+
+OUTPUT_FORMATS = ("yaml", "json", "csv", "summary")
+
+
+def loads(data: bytes) -> Any:
+    """Parse a JSON body straight from bytes, without decoding it to text first."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps_json(value: Any) -> str:
+    """Compact JSON, using orjson when it is installed."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(value, default=str).decode("utf-8")
+        except TypeError:
+            pass  # non-string keys or integers wider than 64 bits
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+def dumps_yaml(value: Any) -> str:
+    import yaml  # deferred: only needed when YAML output is requested
+
+    return yaml.dump(value, Dumper=getattr(yaml, "CSafeDumper", yaml.SafeDumper))
+
+
+def _records(value: Any) -> Tuple[Optional[List[Any]], Dict[str, Any]]:
+    """Split a result into its list of rows and any extra keys (e.g. a continuation token).
+
+    Query results (a row list, or ``{"rows": ..., "continuation_token": ...}``)
+    and Atelier envelopes whose ``result.content`` is a list are tabular.
+    """
+    extra: Dict[str, Any] = {}
+    if isinstance(value, dict):
+        if isinstance(value.get("rows"), list):
+            extra = {k: v for k, v in value.items() if k != "rows"}
+            value = value["rows"]
+        elif isinstance(value.get("result"), dict) and isinstance(value["result"].get("content"), list):
+            value = value["result"]["content"]
+    if isinstance(value, list) and (
+        all(isinstance(row, (list, tuple)) for row in value) or all(isinstance(row, dict) for row in value)
+    ):
+        return value, extra
+    return None, {}
+
+
+def to_csv(rows: List[Any]) -> str:
+    """CSV of row tuples, or of dicts with a header of their keys; nested values become JSON."""
+
+    def cell(v: Any) -> Any:
+        return dumps_json(v) if isinstance(v, (dict, list, tuple)) else v
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    if rows and isinstance(rows[0], dict):
+        columns = list(dict.fromkeys(key for row in rows for key in row))
+        writer.writerow(columns)
+        writer.writerows([cell(row.get(column, "")) for column in columns] for row in rows)
+    else:
+        writer.writerows([cell(v) for v in row] for row in rows)
+    return buffer.getvalue()
+
+
+def summarize(value: Any, max_chars: int) -> str:
+    """Compact JSON cut to ``max_chars``, keeping whole rows where the result is a list."""
+    rows, extra = _records(value)
+    if rows is None and isinstance(value, list):
+        rows = value
+    if rows is None:
+        text = value if isinstance(value, str) else dumps_json(value)
+        if len(text) <= max_chars:
+            return text
+        return text[:max_chars] + f"\n... truncated, {len(text) - max_chars} of {len(text)} characters not shown"
+
+    suffix = "\n" + dumps_json(extra) if extra else ""
+    budget = max_chars - len(suffix) - 2
+    parts: List[str] = []
+    for row in rows:
+        text = dumps_json(row)
+        if len(text) + 1 > budget:
+            if not parts:
+                parts.append(text[:max(budget, 0)])
+            break
+        parts.append(text)
+        budget -= len(text) + 1
+    summary = "[" + ",".join(parts) + "]"
+    if len(parts) < len(rows):
+        summary += f"\n... {len(rows) - len(parts)} of {len(rows)} rows not shown"
+    return summary + suffix
+
+
+def format_result(value: Any, output_format: str = "yaml", max_chars: int = 4000) -> Any:
+    """Render ``value`` as ``yaml``, ``json``, ``csv`` or ``summary`` text.
+
+    Strings and None pass through unchanged except for ``summary``, which
+    also bounds them. Results that are not tabular are rendered as JSON
+    when ``csv`` is requested.
+    """
+    if value is None:
+        return None
+    if output_format == "summary":
+        return summarize(value, max_chars)
+    if isinstance(value, str):
+        return value
+    if output_format == "yaml":
+        return dumps_yaml(value)
+    if output_format == "json":
+        return dumps_json(value)
+    if output_format == "csv":
+        rows, extra = _records(value)
+        if rows is None:
+            return dumps_json(value)
+        return to_csv(rows) + (dumps_json(extra) + "\n" if extra else "")
+    raise ValueError(f"Unsupported output format: {output_format}")
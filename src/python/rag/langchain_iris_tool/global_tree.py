@@ -0,0 +1,192 @@
+"""Lazy $ORDER-style traversal and NDJSON export of InterSystems IRIS globals."""
+
+import base64
+import json
+import time
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+
+Node = Tuple[List[Any], Any]
+
+
+def normalize_name(global_name: str) -> str:
+    """Strip the leading caret; the native API takes bare global names."""
+    return global_name[1:] if global_name.startswith("^") else global_name
+
+
+def collates_after(a: Any, b: Any) -> bool:
+    """Return True if subscript ``a`` sorts after ``b`` in IRIS collation.
+
+    Canonical numbers sort before strings, numbers numerically and strings
+    by code point.
+    """
+    a_num = isinstance(a, (int, float))
+    b_num = isinstance(b, (int, float))
+    if a_num != b_num:
+        return b_num
+    return a > b
+
+
+def _children(
+    native: Any, name: str, prefix: List[Any], after: Any = "", end: Any = None
+) -> Iterator[Tuple[Any, int]]:
+    """Yield ``(subscript, $DATA)`` for the children of ``prefix`` after ``after``."""
+    sub = after
+    while True:
+        sub = native.nextSubscript(False, name, *prefix, sub)
+        if sub is None or sub == "":
+            return
+        if end is not None and collates_after(sub, end):
+            return
+        yield sub, native.isDefined(name, *prefix, sub)
+
+
+def _walk(
+    native: Any,
+    name: str,
+    prefix: List[Any],
+    resume: Sequence[Any] = (),
+    start: Any = None,
+    end: Any = None,
+    max_depth: Optional[int] = None,
+) -> Iterator[Node]:
+    """Depth-first, pre-order walk of the subtrees below ``prefix``.
+
+    ``resume`` is the path, relative to ``prefix``, of the last node already
+    visited; the walk continues with the node that follows it.
+    """
+    if max_depth is not None and max_depth <= 0:
+        return
+    depth = None if max_depth is None else max_depth - 1
+    after: Any = ""
+    if resume:
+        head = resume[0]
+        # finish the subtree of the last visited node before its siblings
+        yield from _walk(native, name, prefix + [head], resume[1:], max_depth=depth)
+        after = head
+    elif start is not None:
+        # the native API has no "from": step back one so start is included
+        previous = native.nextSubscript(True, name, *prefix, start)
+        after = "" if previous is None else previous
+    for sub, state in _children(native, name, prefix, after, end):
+        path = prefix + [sub]
+        if state in (1, 11):
+            yield path, native.get(name, *path)
+        if state in (10, 11):
+            yield from _walk(native, name, path, max_depth=depth)
+
+
+def walk_global(
+    native: Any,
+    global_name: str,
+    subscripts: Sequence[Any] = (),
+    start: Any = None,
+    end: Any = None,
+    after: Optional[Sequence[Any]] = None,
+    max_depth: Optional[int] = None,
+) -> Iterator[Node]:
+    """Lazily yield ``(subscripts, value)`` for every node of a global subtree.
+
+    Nodes are visited in collation order, one ``nextSubscript`` round-trip
+    at a time, so memory use does not depend on the size of the global.
+    ``start``/``end`` bound the first subscript level below ``subscripts``
+    (inclusive), ``after`` resumes after a full node path returned earlier
+    and ``max_depth`` limits how many levels below ``subscripts`` are read.
+    """
+    name = normalize_name(global_name)
+    prefix = list(subscripts)
+    if after is not None:
+        after = list(after)
+        if after[: len(prefix)] != prefix:
+            raise ValueError("Resume position is not inside the requested subtree")
+        # an empty relative path means only the subtree root was visited
+        yield from _walk(native, name, prefix, after[len(prefix):], start, end, max_depth)
+        return
+    if native.isDefined(name, *prefix) in (1, 11) and start is None:
+        yield prefix, native.get(name, *prefix)
+    yield from _walk(native, name, prefix, (), start, end, max_depth)
+
+
+def encode_cursor(
+    global_name: str, subscripts: Sequence[Any], last: Sequence[Any], start: Any = None, end: Any = None
+) -> str:
+    """Return an opaque token resuming a traversal after node ``last``."""
+    data = {"g": global_name, "s": list(subscripts), "a": list(last), "r": [start, end]}
+    raw = json.dumps(data, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(token: str) -> Tuple[str, List[Any], List[Any], Any, Any]:
+    """Return ``(global_name, subscripts, last, start, end)`` from :func:`encode_cursor`."""
+    try:
+        data = json.loads(base64.urlsafe_b64decode(token.encode("ascii")))
+        start, end = data.get("r") or (None, None)
+        return data["g"], data["s"], data["a"], start, end
+    except Exception:
+        raise ValueError("Invalid continuation token") from None
+
+
+def jsonable(value: Any) -> Any:
+    if isinstance(value, bytes):
+        return value.decode("utf-8", errors="replace")
+    return value
+
+
+def traverse_page(
+    native: Any,
+    global_name: str,
+    subscripts: Sequence[Any] = (),
+    start: Any = None,
+    end: Any = None,
+    max_nodes: int = 100,
+    continuation_token: Optional[str] = None,
+    max_depth: Optional[int] = None,
+) -> Dict[str, Any]:
+    """Return up to ``max_nodes`` nodes and a token for the rest, if any."""
+    after = None
+    if continuation_token:
+        token_name, token_subscripts, after, start, end = decode_cursor(continuation_token)
+        if global_name and normalize_name(global_name) != normalize_name(token_name):
+            raise ValueError("Continuation token does not match the global")
+        global_name, subscripts = token_name, token_subscripts
+    nodes = walk_global(native, global_name, subscripts, start, end, after, max_depth)
+    page = []
+    for path, value in nodes:
+        if len(page) >= max_nodes:
+            last = page[-1]["subscripts"]
+            return {"nodes": page, "continuation_token": encode_cursor(global_name, subscripts, last, start, end)}
+        page.append({"subscripts": path, "value": jsonable(value)})
+    return {"nodes": page, "continuation_token": None}
+
+
+def export_global(
+    native: Any,
+    global_name: str,
+    output_path: str,
+    subscripts: Sequence[Any] = (),
+    start: Any = None,
+    end: Any = None,
+    max_nodes: Optional[int] = None,
+    max_depth: Optional[int] = None,
+) -> Dict[str, Any]:
+    """Stream a global subtree to ``output_path`` as NDJSON, one node per line.
+
+    Each line is ``{"subscripts": [...], "value": ...}``. Memory use is
+    constant regardless of the number of nodes exported.
+    """
+    started = time.perf_counter()
+    count = 0
+    with open(output_path, "w", encoding="utf-8") as out:
+        for path, value in walk_global(native, global_name, subscripts, start, end, max_depth=max_depth):
+            if max_nodes is not None and count >= max_nodes:
+                break
+            out.write(json.dumps({"subscripts": path, "value": jsonable(value)}, default=str))
+            out.write("\n")
+            count += 1
+    elapsed = time.perf_counter() - started
+    return {
+        "global_name": global_name,
+        "output_path": output_path,
+        "nodes": count,
+        "seconds": round(elapsed, 3),
+    }
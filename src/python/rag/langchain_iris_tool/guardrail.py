@@ -0,0 +1,165 @@
+"""Plan-cost checks and row limits applied to agent-written SQL before it runs."""
+
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, List, NamedTuple, Optional, Sequence, Tuple
+
+from langchain_iris_tool.query import iter_rows
+
+
+_COMMENT = re.compile(r"--[^\n]*|/\*.*?\*/", re.S)
+_LITERAL = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+# what may stand between SELECT and TOP: %keyword hints, then DISTINCT [BY (...)] or ALL
+_BEFORE_TOP = (
+    r"select\s+(?:%(?:nofplan|nolock|noruntime|profile_all|profile)\s+)*"
+    r"(?:distinct(?:\s+by\s*\((?:[^()]|\([^()]*\))*\)\s*|\s+)|all\s+)?"
+)
+_SELECT = re.compile(r"^(\s*" + _BEFORE_TOP + ")", re.I)
+# a clause or hint the TOP would have to follow that _SELECT did not recognise
+_UNPLACED = re.compile(r"(?:distinct|all|by)\b|%\w+\s", re.I)
+_LIMITED = re.compile(r"^" + _BEFORE_TOP + r"top\b|\blimit\s+\?|\bfetch\s+first\b")
+_TOP = re.compile(r"^" + _BEFORE_TOP + r"top\b")
+_UNION = re.compile(r"\bunion\b")
+_ORDERED = re.compile(r"\border\s+by\b")
+# clauses that make IRIS read every qualifying row before returning the first one
+_BLOCKING = re.compile(r"\border\s+by\b|\bgroup\s+by\b|\bdistinct\b|\bunion\b|\b(?:count|sum|avg|min|max)\s*\(")
+_COST = re.compile(r'<cost\s+value="(\d+(?:\.\d+)?)"|relative\s+cost\s*=\s*(\d+(?:\.\d+)?)', re.I)
+_FULL_SCAN = re.compile(r"Read master map ([\w.%]+), looping on", re.I)
+
+
+class QueryRejectedError(ValueError):
+    """Raised when a statement's estimated plan cost is above the allowed maximum."""
+
+
+class QueryPlan(NamedTuple):
+    """What EXPLAIN reported for one normalised statement."""
+
+    cost: Optional[float]
+    full_scans: List[str]
+
+
+def normalize(sql: str) -> str:
+    """Statement shape without comments, literals, case or spacing, used as the plan cache key."""
+    return " ".join(_LITERAL.sub("?", _COMMENT.sub(" ", sql)).split()).lower()
+
+
+def parse_plan(plan: str) -> QueryPlan:
+    """Highest relative cost and the tables read by full scans in an IRIS EXPLAIN plan."""
+    costs = [float(a or b) for a, b in _COST.findall(plan)]
+    return QueryPlan(max(costs) if costs else None, list(dict.fromkeys(_FULL_SCAN.findall(plan))))
+
+
+def add_top(sql: str) -> Optional[str]:
+    """``sql`` with ``TOP ?`` after its SELECT, or None when it cannot be rewritten safely.
+
+    The limit is bound as the first parameter so every page of a query runs
+    the same statement text. ``TOP`` goes after ``%NOLOCK``-style hints
+    and ``DISTINCT BY (...)``, as IRIS requires. A UNION is left alone: a
+    TOP after the first SELECT would only limit its first branch. So is a
+    statement starting with a hint or clause not recognised here.
+    """
+    match = _SELECT.match(sql)
+    if match is None or _UNION.search(normalize(sql)) or _UNPLACED.match(sql, match.end()):
+        return None
+    return f"{match.group(1)}TOP ? {sql[match.end():]}"
+
+
+def add_window(sql: str, parameters: Optional[Sequence[Any]], offset: int) -> Optional[Tuple[str, List[Any]]]:
+    """``sql`` reduced to the rows after ``offset`` by IRIS, with its parameters.
+
+    The statement becomes a subquery filtered on its ``%VID`` row number, so
+    a continuation page does not send the rows of earlier pages again. None
+    when the statement is not a SELECT, or orders rows without a ``TOP``,
+    which IRIS does not allow in a subquery.
+    """
+    shape = normalize(sql)
+    if not shape.startswith("select") or (_ORDERED.search(shape) and not _TOP.match(shape)):
+        return None
+    return f"SELECT * FROM ({sql}) WHERE %VID > ?", [*(parameters or ()), int(offset)]
+
+
+class SqlGuardrail:
+    """Gate in front of the 'query' operation.
+
+    ``SELECT`` statements without a row limit get ``TOP ?`` bound to the
+    limit, so pages of a query share one prepared statement. When
+    ``max_cost`` is given the plan is read with ``EXPLAIN`` and a statement
+    above it is rejected, unless it has no limit and nothing forces IRIS to
+    read every row first (ORDER BY, GROUP BY, DISTINCT, UNION, aggregates),
+    in which case the added ``TOP`` bounds its work. Plans are cached per
+    normalised statement for ``ttl`` seconds in an LRU of ``max_entries``.
+    Other statements pass through unchanged.
+    """
+
+    def __init__(self, max_entries: int = 256, ttl: float = 300.0) -> None:
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.stats = {"hits": 0, "misses": 0, "rewritten": 0, "rejected": 0}
+        self._plans: "OrderedDict[str, Tuple[float, QueryPlan]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def explain(self, pooled: Any, sql: str, parameters: Optional[Sequence[Any]] = None) -> QueryPlan:
+        """The plan of ``sql``, from the cache or from ``EXPLAIN`` on ``pooled``."""
+        key = normalize(sql)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._plans.get(key)
+            if entry is not None and entry[0] > now:
+                self._plans.move_to_end(key)
+                self.stats["hits"] += 1
+                return entry[1]
+            self.stats["misses"] += 1
+        # a plain cursor: EXPLAIN text is not worth a slot in the prepared statement cache
+        cursor = pooled.cursor()
+        try:
+            if parameters:
+                cursor.execute("EXPLAIN " + sql, list(parameters))
+            else:
+                cursor.execute("EXPLAIN " + sql)
+            plan = parse_plan("\n".join(str(value) for row in iter_rows(cursor) for value in row))
+        finally:
+            cursor.close()
+        with self._lock:
+            self._plans[key] = (now + self.ttl, plan)
+            self._plans.move_to_end(key)
+            while len(self._plans) > self.max_entries:
+                self._plans.popitem(last=False)
+        return plan
+
+    def check(
+        self,
+        pooled: Any,
+        sql: str,
+        parameters: Optional[Sequence[Any]] = None,
+        top: Optional[int] = None,
+        max_cost: Optional[float] = None,
+    ) -> Tuple[str, Optional[List[Any]]]:
+        """Return the statement and parameters to execute in place of ``sql``.
+
+        ``top`` is the row limit added to unlimited SELECTs (None to leave
+        them as they are); it is bound ahead of ``parameters``. Raises
+        :class:`QueryRejectedError` when the plan cost exceeds ``max_cost``
+        and a ``TOP`` cannot bound it.
+        """
+        unchanged = (sql, list(parameters) if parameters else None)
+        shape = normalize(sql)
+        if not shape.startswith(("select", "with")):
+            return unchanged
+        rewritten = add_top(sql) if top and not _LIMITED.search(shape) else None
+        if max_cost is not None:
+            plan = self.explain(pooled, sql, parameters)
+            if plan.cost is not None and plan.cost > max_cost and (rewritten is None or _BLOCKING.search(shape)):
+                with self._lock:
+                    self.stats["rejected"] += 1
+                scans = f"; full scans of {', '.join(plan.full_scans)}" if plan.full_scans else ""
+                raise QueryRejectedError(
+                    f"Estimated plan cost {plan.cost:.0f} exceeds the limit of {max_cost:.0f}{scans}. "
+                    "Filter on an indexed column, add TOP, or avoid ORDER BY/GROUP BY/DISTINCT over the whole table"
+                )
+        if rewritten is None:
+            return unchanged
+        with self._lock:
+            self.stats["rewritten"] += 1
+        return rewritten, [int(top), *(parameters or ())]
@@ -0,0 +1,184 @@
+"""Per-operation timings, result sizes and error classes for InterSystemsIRISTool."""
+
+import random
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Deque, Dict, Iterator, Optional, Tuple
+
+from langchain_iris_tool.metrics import _percentile
+
+
+Tags = Tuple[Tuple[str, str], ...]
+
+_current: ContextVar[Optional["OperationTrace"]] = ContextVar("iris_operation_trace", default=None)
+
+
+class OperationTrace:
+    """Timings of one tool operation, split into phases.
+
+    Phases are ``acquire`` (waiting for a pooled connection), ``iris``
+    (native API/SQL calls), ``http`` (Atelier/monitor requests, including
+    decoding the body) and ``serialize`` (rendering the result for the LLM).
+    A phase entered several times, e.g. by a batch, accumulates. Unsampled
+    traces only record the outcome, not phases or sizes.
+    """
+
+    def __init__(self, operation: str, sampled: bool = True) -> None:
+        self.operation = operation
+        self.sampled = sampled
+        self.phases: Dict[str, float] = {}
+        self.duration_ms: Optional[float] = None
+        self.result_size: Optional[int] = None
+        self.error: Optional[str] = None
+        self._start = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def add(self, phase: str, ms: float) -> None:
+        with self._lock:
+            self.phases[phase] = self.phases.get(phase, 0.0) + ms
+
+    def fail(self, error: BaseException) -> None:
+        self.error = type(error).__name__
+
+    def finish(self, result: Any = None) -> None:
+        self.duration_ms = (time.perf_counter() - self._start) * 1000
+        if self.sampled and self.error is None:
+            self.result_size = result_size(result)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "operation": self.operation,
+            "duration_ms": None if self.duration_ms is None else round(self.duration_ms, 3),
+            "phases_ms": {name: round(ms, 3) for name, ms in self.phases.items()},
+            "result_size": self.result_size,
+            "error": self.error,
+        }
+
+
+def result_size(result: Any) -> Optional[int]:
+    """Characters of a string result, items of a list/dict result."""
+    if result is None:
+        return None
+    if isinstance(result, (str, bytes)):
+        return len(result)
+    if isinstance(result, dict) and isinstance(result.get("rows"), list):
+        return len(result["rows"])
+    if isinstance(result, (list, tuple, dict)):
+        return len(result)
+    return len(str(result))
+
+
+@contextmanager
+def trace_operation(operation: str, sample_rate: float = 1.0) -> Iterator[OperationTrace]:
+    """Make a new trace current for the block; :func:`phase` records into it.
+
+    The trace is carried by a context variable, so it follows the call into
+    coroutines and into executor threads started with a copied context.
+    """
+    trace = OperationTrace(operation, sampled=sample_rate >= 1.0 or random.random() < sample_rate)
+    token = _current.set(trace)
+    try:
+        yield trace
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    """Time the block as ``name`` in the current trace, if it is sampled."""
+    trace = _current.get()
+    if trace is None or not trace.sampled:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        trace.add(name, (time.perf_counter() - start) * 1000)
+
+
+class MetricsSink:
+    """Destination for tool metrics; subclass to forward them to a backend.
+
+    ``increment`` is called for counters and ``observe`` for histogram
+    samples. Tags are a small dict of string labels such as the operation.
+    The default implementation discards everything.
+    """
+
+    def increment(self, name: str, value: float = 1.0, tags: Optional[Dict[str, str]] = None) -> None:
+        pass
+
+    def observe(self, name: str, value: float, tags: Optional[Dict[str, str]] = None) -> None:
+        pass
+
+
+class InMemoryMetricsSink(MetricsSink):
+    """Keeps counters and the last ``capacity`` samples of each histogram in memory."""
+
+    def __init__(self, capacity: int = 1024) -> None:
+        self.capacity = capacity
+        self._counters: Dict[Tuple[str, Tags], float] = {}
+        self._histograms: Dict[Tuple[str, Tags], Deque[float]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(name: str, tags: Optional[Dict[str, str]]) -> Tuple[str, Tags]:
+        return name, tuple(sorted((tags or {}).items()))
+
+    def increment(self, name: str, value: float = 1.0, tags: Optional[Dict[str, str]] = None) -> None:
+        key = self._key(name, tags)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0.0) + value
+
+    def observe(self, name: str, value: float, tags: Optional[Dict[str, str]] = None) -> None:
+        key = self._key(name, tags)
+        with self._lock:
+            samples = self._histograms.get(key)
+            if samples is None:
+                samples = self._histograms[key] = deque(maxlen=self.capacity)
+            samples.append(value)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Counters and histogram summaries (count, mean, p50, p95, p99, max)."""
+
+        def label(key: Tuple[str, Tags]) -> str:
+            name, tags = key
+            return name + ("{" + ",".join(f"{k}={v}" for k, v in tags) + "}" if tags else "")
+
+        with self._lock:
+            counters = {label(key): value for key, value in self._counters.items()}
+            histograms = {label(key): list(samples) for key, samples in self._histograms.items()}
+        return {
+            "counters": counters,
+            "histograms": {
+                name: {
+                    "count": len(values),
+                    "mean": round(sum(values) / len(values), 3),
+                    "p50": round(_percentile(values, 50), 3),
+                    "p95": round(_percentile(values, 95), 3),
+                    "p99": round(_percentile(values, 99), 3),
+                    "max": round(max(values), 3),
+                }
+                for name, values in histograms.items()
+                if values
+            },
+        }
+
+
+def record_trace(sink: MetricsSink, trace: OperationTrace) -> None:
+    """Emit a finished trace as ``iris_tool.*`` counters and histograms."""
+    tags = {"operation": trace.operation}
+    sink.increment("iris_tool.calls", 1, tags)
+    if trace.error is not None:
+        sink.increment("iris_tool.errors", 1, {**tags, "error": trace.error})
+    if not trace.sampled:
+        return
+    if trace.duration_ms is not None:
+        sink.observe("iris_tool.duration_ms", trace.duration_ms, tags)
+    for name, ms in trace.phases.items():
+        sink.observe("iris_tool.phase_ms", ms, {**tags, "phase": name})
+    if trace.result_size is not None:
+        sink.observe("iris_tool.result_size", trace.result_size, tags)
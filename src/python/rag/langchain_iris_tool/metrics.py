@@ -0,0 +1,215 @@
+"""Parsing and background sampling of the IRIS /api/monitor/metrics endpoint."""
+
+import re
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, NamedTuple, Optional, Tuple
+
+
+Labels = Tuple[Tuple[str, str], ...]
+SeriesKey = Tuple[str, Labels]
+
+
+class Sample(NamedTuple):
+    name: str
+    labels: Labels
+    value: float
+
+
+_LINE = re.compile(r"^([a-zA-Z_:][a-zA-Z0-9_:]*)(?:\{(.*)\})?\s+(\S+)(?:\s+\d+)?$")
+_LABEL = re.compile(r'([a-zA-Z_][a-zA-Z0-9_]*)="((?:[^"\\]|\\.)*)"')
+
+
+def parse_prometheus(text: str) -> List[Sample]:
+    """Parse Prometheus text exposition format into samples.
+
+    Comment, ``# HELP`` and ``# TYPE`` lines are skipped, as are lines that
+    do not parse or whose value is not a number.
+    """
+    samples = []
+    for line in text.splitlines():
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        match = _LINE.match(line)
+        if not match:
+            continue
+        name, raw_labels, raw_value = match.groups()
+        try:
+            value = float(raw_value)
+        except ValueError:
+            continue
+        labels = tuple(sorted(_LABEL.findall(raw_labels or "")))
+        samples.append(Sample(name, labels, value))
+    return samples
+
+
+def series_label(key: SeriesKey) -> str:
+    """Render a series key the way Prometheus does, e.g. ``name{id="USER"}``."""
+    name, labels = key
+    if not labels:
+        return name
+    return name + "{" + ",".join(f'{k}="{v}"' for k, v in labels) + "}"
+
+
+def _percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * q / 100.0
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+class MetricsSampler:
+    """Keeps a fixed-size ring buffer of ``(timestamp, value)`` per series.
+
+    ``fetch`` returns the raw metrics text. Call :meth:`sample` directly or
+    :meth:`start` a daemon thread that samples every ``interval`` seconds.
+    Each series keeps its last ``capacity`` points, so memory is bounded
+    by the number of series.
+    """
+
+    def __init__(self, fetch: Callable[[], Optional[str]], interval: float = 15.0, capacity: int = 240) -> None:
+        self.fetch = fetch
+        self.interval = interval
+        self.capacity = capacity
+        self._series: Dict[SeriesKey, Deque[Tuple[float, float]]] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._last_sample: Optional[float] = None
+
+    @property
+    def empty(self) -> bool:
+        """True until a sample has recorded at least one series."""
+        return not self._series
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def sample(self) -> int:
+        """Fetch and record one sample of every series; returns the series count."""
+        self._last_sample = time.monotonic()
+        text = self.fetch()
+        if not text:
+            return 0
+        now = time.time()
+        samples = parse_prometheus(text)
+        with self._lock:
+            for s in samples:
+                buffer = self._series.get((s.name, s.labels))
+                if buffer is None:
+                    buffer = self._series[(s.name, s.labels)] = deque(maxlen=self.capacity)
+                buffer.append((now, s.value))
+        return len(samples)
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            # a sample taken just before start() (or a failed one) counts as this round's
+            if self._last_sample is not None:
+                remaining = self._last_sample + self.interval - time.monotonic()
+                if remaining > 0 and self._stop.wait(remaining):
+                    return
+            try:
+                self.sample()
+            except Exception:
+                pass  # keep sampling through transient HTTP failures
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="iris-metrics-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval)
+            self._thread = None
+
+    def _select(self, name: Optional[str], window: Optional[float]) -> Dict[SeriesKey, List[Tuple[float, float]]]:
+        pattern = re.compile(name) if name else None
+        since = time.time() - window if window else None
+        with self._lock:
+            selected = {}
+            for key, buffer in self._series.items():
+                if pattern is not None and not pattern.search(key[0]):
+                    continue
+                points = [p for p in buffer if since is None or p[0] >= since]
+                if points:
+                    selected[key] = points
+            return selected
+
+    def query(
+        self,
+        name: Optional[str] = None,
+        aggregation: str = "latest",
+        window: Optional[float] = None,
+        quantile: float = 95.0,
+        top_n: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """Aggregate the series whose name matches the regex ``name``.
+
+        ``aggregation`` is ``latest``, ``delta`` (last - first), ``rate``
+        (delta per second), ``percentile`` (``quantile`` of the values),
+        ``min``, ``max`` or ``avg``, computed over the last ``window``
+        seconds (the whole buffer if omitted). ``top_n`` keeps the series
+        with the largest results. ``delta`` and ``rate`` need two samples
+        in the window; until then the result carries a ``note`` saying so.
+        """
+        results: Dict[str, float] = {}
+        sample_count = 0
+        for key, points in self._select(name, window).items():
+            sample_count = max(sample_count, len(points))
+            values = [v for _, v in points]
+            if aggregation == "latest":
+                result = values[-1]
+            elif aggregation in ("delta", "rate"):
+                if len(points) < 2:
+                    continue
+                result = values[-1] - values[0]
+                if aggregation == "rate":
+                    elapsed = points[-1][0] - points[0][0]
+                    result = result / elapsed if elapsed > 0 else 0.0
+            elif aggregation == "percentile":
+                result = _percentile(values, quantile)
+            elif aggregation == "min":
+                result = min(values)
+            elif aggregation == "max":
+                result = max(values)
+            elif aggregation == "avg":
+                result = sum(values) / len(values)
+            else:
+                raise ValueError(f"Unsupported aggregation: {aggregation}")
+            results[series_label(key)] = round(result, 6)
+        ordered = sorted(results.items(), key=lambda item: item[1], reverse=True)
+        if top_n:
+            ordered = ordered[:top_n]
+        answer: Dict[str, Any] = {
+            "aggregation": aggregation,
+            "window": window,
+            "samples": sample_count,
+            "series": dict(ordered),
+        }
+        if aggregation in ("delta", "rate") and sample_count < 2:
+            answer["note"] = (
+                f"'{aggregation}' needs at least two samples in the window, {sample_count} available; "
+                f"samples are taken every {self.interval:g}s while the sampler runs, or on each query otherwise"
+            )
+        return answer
+
+
+_samplers: Dict[Any, MetricsSampler] = {}
+_samplers_lock = threading.Lock()
+
+
+def get_sampler(key: Any, fetch: Callable[[], Optional[str]], **options: Any) -> MetricsSampler:
+    """Return the shared sampler for ``key`` (e.g. a web server), creating it once."""
+    with _samplers_lock:
+        sampler = _samplers.get(key)
+        if sampler is None:
+            sampler = _samplers[key] = MetricsSampler(fetch, **options)
+        return sampler
@@ -0,0 +1,446 @@
+"""Thread-safe connection pool for InterSystems IRIS native/DB-API connections."""
+
+import asyncio
+import contextvars
+import functools
+import hashlib
+import threading
+import time
+import warnings
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple, TypeVar
+
+from langchain_iris_tool.instrumentation import phase
+
+
+PoolKey = Tuple[str, int, str, str, str]
+T = TypeVar("T")
+
+
+def credentials_digest(password: str) -> str:
+    """Digest of a password, so shared pools and clients are keyed on it without storing it."""
+    return hashlib.sha256(password.encode("utf-8")).hexdigest()
+
+
+class PoolTimeoutError(TimeoutError):
+    """Raised when no connection could be borrowed within the timeout."""
+
+
+class StatementStats:
+    """Thread-safe hit/miss counters shared by the statement caches of a pool."""
+
+    def __init__(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+    def record(self, hit: bool) -> None:
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def record_eviction(self) -> None:
+        with self._lock:
+            self.evictions += 1
+
+    def as_dict(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+
+class StatementCache:
+    """LRU cache of prepared statements for one connection.
+
+    The IRIS DB-API prepares a statement on the cursor that executes it and
+    reuses that plan when the cursor executes the same SQL text again, so
+    the cache keeps one cursor per statement text. Values must be passed as
+    parameters for the cache to hit; SQL with literals inlined is a new
+    statement every time.
+    """
+
+    def __init__(self, conn: Any, capacity: int, stats: StatementStats) -> None:
+        self._conn = conn
+        self.capacity = capacity
+        self.stats = stats
+        self._cursors: "OrderedDict[str, Any]" = OrderedDict()
+
+    def execute(self, sql: str, parameters: Optional[Sequence[Any]] = None) -> Any:
+        """Execute ``sql`` on its cached cursor and return the cursor."""
+        if self.capacity <= 0:
+            cursor = self._conn.cursor()
+        else:
+            cursor = self._cursors.get(sql)
+            self.stats.record(cursor is not None)
+            if cursor is None:
+                cursor = self._conn.cursor()
+                self._cursors[sql] = cursor
+                if len(self._cursors) > self.capacity:
+                    _, evicted = self._cursors.popitem(last=False)
+                    self.stats.record_eviction()
+                    _close_quietly(evicted)
+            else:
+                self._cursors.move_to_end(sql)
+        if parameters:
+            cursor.execute(sql, list(parameters))
+        else:
+            cursor.execute(sql)
+        return cursor
+
+    def release(self, cursor: Any) -> None:
+        """Finish with a cursor returned by :meth:`execute`.
+
+        Cached cursors stay open for reuse; uncached ones are closed.
+        """
+        if cursor not in self._cursors.values():
+            _close_quietly(cursor)
+
+    def clear(self) -> None:
+        cursors, self._cursors = list(self._cursors.values()), OrderedDict()
+        for cursor in cursors:
+            _close_quietly(cursor)
+
+
+def _close_quietly(resource: Any) -> None:
+    try:
+        resource.close()
+    except Exception:
+        pass
+
+
+class PooledConnection:
+    """A connection owned by an :class:`IRISConnectionPool`.
+
+    Wraps the DB-API connection together with its native API handle and
+    its prepared statement cache so they can be borrowed as a unit.
+    """
+
+    def __init__(
+        self,
+        conn: Any,
+        statement_cache_size: int = 32,
+        statement_stats: Optional[StatementStats] = None,
+    ) -> None:
+        self.conn = conn
+        import iris  # deferred: the driver is only needed once a connection exists
+
+        self.iris = iris.createIRIS(conn)
+        self.statements = StatementCache(
+            conn, statement_cache_size, statement_stats or StatementStats()
+        )
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+        self.suspect = False
+
+    def cursor(self) -> Any:
+        return self.conn.cursor()
+
+    def execute(self, sql: str, parameters: Optional[Sequence[Any]] = None) -> Any:
+        """Execute ``sql`` through the statement cache; see :class:`StatementCache`."""
+        return self.statements.execute(sql, parameters)
+
+    def close(self) -> None:
+        self.statements.clear()
+        _close_quietly(self.conn)
+
+
+def default_health_check(pooled: PooledConnection) -> bool:
+    """Return True if the connection still answers a trivial query."""
+    cursor = pooled.cursor()
+    try:
+        cursor.execute("SELECT 1")
+        cursor.fetchone()
+    finally:
+        cursor.close()
+    return True
+
+
+class IRISConnectionPool:
+    """Bounded pool of IRIS connections for one host/port/namespace/user.
+
+    Connections are created lazily up to ``max_size``; ``min_size`` of them
+    are kept open even when idle. Connections idle for longer than
+    ``max_idle`` seconds are closed, connections that have been idle for
+    ``health_check_interval`` seconds (or that were released after an error)
+    are health checked before being handed out, and broken connections are
+    transparently replaced by new ones. Each connection keeps an LRU cache
+    of up to ``statement_cache_size`` prepared statements; hits and misses
+    across the pool are counted in ``statement_stats``.
+    """
+
+    def __init__(
+        self,
+        hostname: str,
+        port: int,
+        namespace: str,
+        username: str,
+        password: str,
+        min_size: int = 1,
+        max_size: int = 8,
+        max_idle: float = 300.0,
+        health_check_interval: float = 30.0,
+        acquire_timeout: float = 30.0,
+        statement_cache_size: int = 32,
+        health_check: Callable[[PooledConnection], bool] = default_health_check,
+    ) -> None:
+        if min_size < 0 or max_size < 1 or min_size > max_size:
+            raise ValueError("Pool sizes must satisfy 0 <= min_size <= max_size and max_size >= 1")
+        self.hostname = hostname
+        self.port = port
+        self.namespace = namespace
+        self.username = username
+        self._password = password
+        self.min_size = min_size
+        self.max_size = max_size
+        self.max_idle = max_idle
+        self.health_check_interval = health_check_interval
+        self.acquire_timeout = acquire_timeout
+        self.statement_cache_size = statement_cache_size
+        self.statement_stats = StatementStats()
+        self._health_check = health_check
+        self._idle: List[PooledConnection] = []
+        self._size = 0
+        self._closed = False
+        self._cond = threading.Condition()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    @property
+    def key(self) -> PoolKey:
+        return (self.hostname, self.port, self.namespace, self.username, credentials_digest(self._password))
+
+    @property
+    def size(self) -> int:
+        """Number of open connections, borrowed or idle."""
+        return self._size
+
+    @property
+    def idle(self) -> int:
+        return len(self._idle)
+
+    def _connect(self) -> PooledConnection:
+        import iris
+
+        conn = iris.connect(
+            self.hostname + ":" + str(self.port) + "/" + self.namespace,
+            username=self.username,
+            password=self._password,
+            sharedmemory=False,
+        )
+        return PooledConnection(conn, self.statement_cache_size, self.statement_stats)
+
+    def _is_healthy(self, pooled: PooledConnection) -> bool:
+        try:
+            return bool(self._health_check(pooled))
+        except Exception:
+            return False
+
+    def _evict_idle(self) -> List[PooledConnection]:
+        """Pop connections idle past ``max_idle``, keeping ``min_size`` open.
+
+        Must be called with the condition held; the returned connections
+        are closed by the caller outside the lock.
+        """
+        now = time.monotonic()
+        evicted = []
+        # self._idle is ordered oldest release first
+        while self._idle and self._size > self.min_size:
+            if now - self._idle[0].last_used <= self.max_idle:
+                break
+            evicted.append(self._idle.pop(0))
+            self._size -= 1
+        return evicted
+
+    def acquire(self, timeout: Optional[float] = None) -> PooledConnection:
+        """Borrow a connection, opening a new one if the pool is not full."""
+        timeout = self.acquire_timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        while True:
+            pooled = None
+            create = False
+            with self._cond:
+                if self._closed:
+                    raise RuntimeError("Connection pool is closed")
+                evicted = self._evict_idle()
+                while not self._idle and self._size >= self.max_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise PoolTimeoutError(
+                            f"Timed out after {timeout}s waiting for an IRIS connection "
+                            f"({self.max_size} in use)"
+                        )
+                    self._cond.wait(remaining)
+                    if self._closed:
+                        raise RuntimeError("Connection pool is closed")
+                if self._idle:
+                    # most recently released first, keeps the hot set small
+                    pooled = self._idle.pop()
+                else:
+                    self._size += 1
+                    create = True
+            for stale in evicted:
+                stale.close()
+
+            if create:
+                try:
+                    pooled = self._connect()
+                except Exception:
+                    with self._cond:
+                        self._size -= 1
+                        self._cond.notify()
+                    raise
+                return pooled
+
+            needs_check = pooled.suspect or (
+                time.monotonic() - pooled.last_used > self.health_check_interval
+            )
+            if not needs_check or self._is_healthy(pooled):
+                pooled.suspect = False
+                return pooled
+            # reconnect on failure: drop the broken connection and retry
+            self._discard(pooled)
+
+    def release(self, pooled: PooledConnection, broken: bool = False) -> None:
+        """Return a borrowed connection.
+
+        ``broken`` marks the connection as suspect; it is health checked
+        before being borrowed again and replaced if the check fails.
+        """
+        pooled.last_used = time.monotonic()
+        pooled.suspect = pooled.suspect or broken
+        with self._cond:
+            if not self._closed:
+                self._idle.append(pooled)
+                self._cond.notify()
+                return
+            self._size -= 1
+        pooled.close()
+
+    def _discard(self, pooled: PooledConnection) -> None:
+        pooled.close()
+        with self._cond:
+            self._size -= 1
+            self._cond.notify()
+
+    @contextmanager
+    def connection(self, timeout: Optional[float] = None) -> Iterator[PooledConnection]:
+        """Borrow a connection for the duration of a ``with`` block."""
+        with phase("acquire"):
+            pooled = self.acquire(timeout)
+        try:
+            yield pooled
+        except GeneratorExit:
+            # a streaming consumer stopped early, the connection is fine
+            self.release(pooled)
+            raise
+        except BaseException:
+            self.release(pooled, broken=True)
+            raise
+        else:
+            self.release(pooled)
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        """Executor for blocking IRIS calls, sized to the pool.
+
+        With one worker per connection, async callers queue in the executor
+        instead of holding threads blocked on :meth:`acquire`.
+        """
+        with self._cond:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_size, thread_name_prefix="iris-pool"
+                )
+            return self._executor
+
+    async def run(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Run blocking ``fn`` on the pool executor without blocking the event loop.
+
+        Cancelling the awaiting task does not interrupt a call that already
+        started; its connection is returned to the pool when it finishes.
+        """
+        loop = asyncio.get_running_loop()
+        # like asyncio.to_thread, so context variables (e.g. traces) follow the call
+        context = contextvars.copy_context()
+        return await loop.run_in_executor(self.executor, functools.partial(context.run, fn, *args, **kwargs))
+
+    def prefill(self) -> None:
+        """Open connections until ``min_size`` are available."""
+        while True:
+            with self._cond:
+                if self._closed or self._size >= self.min_size:
+                    return
+                self._size += 1
+            try:
+                pooled = self._connect()
+            except Exception:
+                with self._cond:
+                    self._size -= 1
+                raise
+            self.release(pooled)
+
+    def close(self) -> None:
+        """Close idle connections; borrowed ones are closed on release."""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._size -= len(idle)
+            executor, self._executor = self._executor, None
+            self._cond.notify_all()
+        for pooled in idle:
+            pooled.close()
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+
+_pools: Dict[PoolKey, IRISConnectionPool] = {}
+_pool_options: Dict[PoolKey, Dict[str, Any]] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(
+    hostname: str,
+    port: int,
+    namespace: str,
+    username: str,
+    password: str,
+    **options: Any,
+) -> IRISConnectionPool:
+    """Return the shared pool for host/port/namespace/user/password, creating it once.
+
+    The key includes a digest of the password, so a wrong password never
+    borrows connections opened with the right one. ``options`` are passed
+    to :class:`IRISConnectionPool` when the pool is created; different
+    options for an existing pool are ignored with a warning.
+    """
+    key = (hostname, int(port), namespace, username, credentials_digest(password))
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None or pool._closed:
+            pool = IRISConnectionPool(hostname, int(port), namespace, username, password, **options)
+            _pools[key] = pool
+            _pool_options[key] = dict(options)
+        elif options and options != _pool_options.get(key):
+            warnings.warn(
+                f"The pool for {hostname}:{port}/{namespace} already exists; options {sorted(options)} are ignored",
+                stacklevel=2,
+            )
+        return pool
+
+
+def close_all_pools() -> None:
+    """Close every shared pool, e.g. on application shutdown."""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+        _pool_options.clear()
+    for pool in pools:
+        pool.close()
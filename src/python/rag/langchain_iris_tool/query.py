@@ -0,0 +1,82 @@
+"""Streaming and paginated SQL results for the 'query' operation."""
+
+import base64
+import json
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+
+def iter_rows(cursor: Any, page_size: int = 500) -> Iterator[Any]:
+    """Yield rows from an executed cursor, fetching ``page_size`` at a time."""
+    while True:
+        rows = cursor.fetchmany(page_size)
+        if not rows:
+            return
+        yield from rows
+
+
+def encode_token(query: str, offset: int, parameters: Optional[Sequence[Any]] = None) -> str:
+    """Return an opaque continuation token for the rows after ``offset``."""
+    data: Dict[str, Any] = {"q": query, "o": offset}
+    if parameters:
+        data["p"] = list(parameters)
+    raw = json.dumps(data, separators=(",", ":"), default=str)
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def decode_token(token: str) -> Tuple[str, int, Optional[List[Any]]]:
+    """Return ``(query, offset, parameters)`` from a token made by :func:`encode_token`."""
+    try:
+        data = json.loads(base64.urlsafe_b64decode(token.encode("ascii")))
+        return data["q"], int(data["o"]), data.get("p")
+    except Exception:
+        raise ValueError("Invalid continuation token") from None
+
+
+def row_size(row: Any) -> int:
+    """Approximate rendered size of a row in characters."""
+    return len(repr(row))
+
+
+def fetch_page(
+    cursor: Any,
+    query: str,
+    max_rows: int,
+    page_size: int = 500,
+    max_bytes: Optional[int] = None,
+    offset: int = 0,
+    parameters: Optional[Sequence[Any]] = None,
+    skip: bool = True,
+) -> Tuple[List[Any], Optional[Dict[str, Any]]]:
+    """Read one page of an executed ``query`` from ``cursor``.
+
+    Skips the first ``offset`` rows (unless ``skip`` is False because the
+    statement already starts there), then collects at most ``max_rows``
+    rows whose rendered size stays within ``max_bytes``. Memory use is
+    bounded by ``page_size`` plus the page itself, never by the full result.
+
+    Returns the rows and, when the result was cut short, a dict with the
+    ``continuation_token`` for the next page and the limit that was hit.
+    """
+    page_size = max(1, min(page_size, max_rows + 1))
+    rows = iter_rows(cursor, page_size)
+    if skip and offset > 0:
+        for skipped, _ in enumerate(rows, 1):
+            if skipped >= offset:
+                break
+
+    page: List[Any] = []
+    used = 0
+    for row in rows:
+        if len(page) >= max_rows:
+            limit = "max_rows"
+        elif max_bytes is not None and page and used + row_size(row) > max_bytes:
+            limit = "max_bytes"
+        else:
+            used += row_size(row)
+            page.append(row)
+            continue
+        return page, {
+            "continuation_token": encode_token(query, offset + len(page), parameters),
+            "truncated_by": limit,
+        }
+    return page, None
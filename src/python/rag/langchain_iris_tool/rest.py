@@ -0,0 +1,168 @@
+"""Keep-alive HTTP clients for the InterSystems IRIS Atelier and monitor REST APIs."""
+
+import asyncio
+import threading
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+
+from langchain_iris_tool.formatting import loads
+from langchain_iris_tool.pool import credentials_digest
+
+
+RETRY_STATUSES = (502, 503, 504)
+
+
+class AtelierClient:
+    """HTTP client bound to one IRIS web server and user.
+
+    The synchronous side uses a pooled ``requests.Session`` so calls reuse
+    keep-alive TCP connections, with urllib3 retries and exponential
+    backoff. The asynchronous side lazily creates one ``httpx.AsyncClient``
+    per event loop with the same timeouts, pool size and retry policy; it
+    is closed when ``asyncio.run`` shuts that loop down, so short-lived
+    loops do not leak connections.
+
+    Responses are decoded the same way as the original tool did: JSON
+    bodies are parsed (with orjson when installed), ``/api/monitor/metrics``
+    is returned as text and any non-200 status yields ``None``. Formatting
+    the payload for the LLM is left to the caller.
+    """
+
+    def __init__(
+        self,
+        baseurl: str,
+        username: str,
+        password: str,
+        timeout: float = 30.0,
+        connect_timeout: float = 5.0,
+        retries: int = 2,
+        backoff_factor: float = 0.2,
+        pool_maxsize: int = 10,
+    ) -> None:
+        self.baseurl = baseurl.rstrip("/")
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self.pool_maxsize = pool_maxsize
+        self._auth = (username, password)
+        self._headers = {"Accept": "application/json", "Accept-Encoding": "gzip, deflate"}
+
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        self._session = requests.Session()
+        self._session.auth = self._auth
+        self._session.headers.update(self._headers)
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=pool_maxsize,
+            max_retries=Retry(
+                total=retries,
+                backoff_factor=backoff_factor,
+                status_forcelist=RETRY_STATUSES,
+                allowed_methods=["GET"],
+                raise_on_status=False,
+            ),
+        )
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+        self._async_clients: Dict[asyncio.AbstractEventLoop, Tuple[Any, AsyncIterator[None]]] = {}
+        self._async_lock = threading.Lock()
+
+    @staticmethod
+    def _decode(path: str, response: Any) -> Optional[Any]:
+        if response.status_code != 200:
+            return None
+        if "monitor/metrics" in path:
+            return response.text
+        # parse the body bytes directly instead of decoding them to a str first
+        return loads(response.content)
+
+    def get(self, path: str) -> Optional[Any]:
+        """GET ``path`` over the keep-alive session."""
+        response = self._session.get(
+            self.baseurl + path, timeout=(self.connect_timeout, self.timeout)
+        )
+        return self._decode(path, response)
+
+    async def _close_with_loop(self, loop: asyncio.AbstractEventLoop, client: Any) -> AsyncIterator[None]:
+        # an async generator left suspended here is finalised by
+        # loop.shutdown_asyncgens(), which asyncio.run() awaits before closing
+        try:
+            yield
+        finally:
+            with self._async_lock:
+                self._async_clients.pop(loop, None)
+            await client.aclose()
+
+    async def _get_async_client(self) -> Any:
+        # httpx clients are bound to the loop they were first used on
+        loop = asyncio.get_running_loop()
+        with self._async_lock:
+            for stale in [other for other in self._async_clients if other.is_closed()]:
+                del self._async_clients[stale]
+            entry = self._async_clients.get(loop)
+            if entry is not None:
+                return entry[0]
+            import httpx
+
+            client = httpx.AsyncClient(
+                auth=self._auth,
+                headers=self._headers,
+                timeout=httpx.Timeout(self.timeout, connect=self.connect_timeout),
+                # a custom transport ignores the client's limits, so set them here
+                transport=httpx.AsyncHTTPTransport(
+                    retries=self.retries,
+                    limits=httpx.Limits(
+                        max_connections=self.pool_maxsize,
+                        max_keepalive_connections=self.pool_maxsize,
+                    ),
+                ),
+            )
+            closer = self._close_with_loop(loop, client)
+            self._async_clients[loop] = (client, closer)
+        await closer.__anext__()
+        return client
+
+    async def aget(self, path: str) -> Optional[Any]:
+        """GET ``path`` without blocking the event loop."""
+        client = await self._get_async_client()
+        attempt = 0
+        while True:
+            response = await client.get(self.baseurl + path)
+            if response.status_code not in RETRY_STATUSES or attempt >= self.retries:
+                break
+            await asyncio.sleep(self.backoff_factor * (2 ** attempt))
+            attempt += 1
+        return self._decode(path, response)
+
+    def close(self) -> None:
+        self._session.close()
+
+    async def aclose(self) -> None:
+        """Close the async client of the running loop and the sync session."""
+        with self._async_lock:
+            entry = self._async_clients.get(asyncio.get_running_loop())
+        if entry is not None:
+            await entry[1].aclose()
+        self.close()
+
+
+_clients: Dict[Tuple[str, str, str], AtelierClient] = {}
+_clients_lock = threading.Lock()
+
+
+def get_client(baseurl: str, username: str, password: str, **options: Any) -> AtelierClient:
+    """Return the shared client for ``baseurl`` and the credentials, creating it once.
+
+    The key includes a digest of the password, so a wrong password never
+    reuses a session authenticated with the right one.
+    """
+    key = (baseurl.rstrip("/"), username, credentials_digest(password))
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            client = AtelierClient(baseurl, username, password, **options)
+            _clients[key] = client
+        return client
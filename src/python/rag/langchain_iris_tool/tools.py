@@ -1,31 +1,101 @@
 """InterSystems IRIS tools for interacting with InterSystems IRIS."""
 
-from typing import Any, Dict, List, Optional, Type, Union, cast
+import asyncio
+import concurrent.futures
+import contextvars
+import functools
+import os
+import threading
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Type, Union, cast
 
-from langchain_core.callbacks import CallbackManagerForToolRun
-from langchain_core.runnables import RunnableConfig
+from langchain_core.callbacks import (
+    AsyncCallbackManager,
+    AsyncCallbackManagerForToolRun,
+    CallbackManager,
+    CallbackManagerForToolRun,
+)
+from langchain_core.runnables import RunnableConfig, ensure_config
 from langchain_core.tools import BaseTool
 from langchain_core.tools.base import ToolCall
 from pydantic import BaseModel, Field, PrivateAttr
-import requests
-import yaml
-import iris
 import urllib.parse
 
+from langchain_iris_tool.bulk_load import load_global, load_table, read_rows
+from langchain_iris_tool.cache import MISSING, MetadataCache
+from langchain_iris_tool.class_index import ClassIndex, get_class_index
+from langchain_iris_tool.formatting import OUTPUT_FORMATS, format_result
+from langchain_iris_tool.global_tree import export_global, normalize_name, traverse_page, walk_global
+from langchain_iris_tool.guardrail import SqlGuardrail, add_window
+from langchain_iris_tool.instrumentation import MetricsSink, OperationTrace, phase, record_trace, trace_operation
+from langchain_iris_tool.metrics import MetricsSampler, get_sampler
+from langchain_iris_tool.pool import IRISConnectionPool, PooledConnection, get_pool
+from langchain_iris_tool.query import decode_token, fetch_page, iter_rows
+from langchain_iris_tool.rest import AtelierClient, get_client
+
+
+NATIVE_OPERATIONS = frozenset(
+    [
+        "get_global", "set_global", "kill_global", "traverse_global", "export_global",
+        "bulk_load", "query", "install_path", "describe", "search_classes",
+    ]
+)
+WRITE_OPERATIONS = frozenset(["set_global", "kill_global", "bulk_load"])
+POOL_SETTINGS = (
+    "min_size", "max_size", "max_idle", "health_check_interval", "acquire_timeout", "statement_cache_size",
+)
+TRACE_EVENT = "intersystems_iris_operation"
+"""Name of the custom callback event carrying an operation's timings."""
+
+
+def _error_message(error: BaseException) -> str:
+    return f"Error performing Intersystems IRIS operation: {type(error).__name__}: {error}"
+
+
+def _confined_path(directory: Optional[str], path: str, setting: str) -> str:
+    """``path`` resolved inside ``directory``; absolute paths and ``..`` are rejected."""
+    if not directory:
+        raise ValueError(f"File paths are not accepted because '{setting}' is not configured")
+    if os.path.isabs(path) or ".." in path.replace("\\", "/").split("/"):
+        raise ValueError(f"Path must be relative to '{setting}' and must not contain '..': {path}")
+    base = os.path.realpath(directory)
+    resolved = os.path.realpath(os.path.join(base, path))
+    # realpath also follows symlinks that point out of the directory
+    if os.path.commonpath([base, resolved]) != base:
+        raise ValueError(f"Path resolves outside '{setting}': {path}")
+    return resolved
+
+
+_fanout_executor: Optional[concurrent.futures.ThreadPoolExecutor] = None
+_fanout_lock = threading.Lock()
+
+
+def _get_fanout_executor() -> concurrent.futures.ThreadPoolExecutor:
+    """Threads shared by synchronous fan-out calls; each target call still uses its own pool."""
+    global _fanout_executor
+    with _fanout_lock:
+        if _fanout_executor is None:
+            _fanout_executor = concurrent.futures.ThreadPoolExecutor(max_workers=64, thread_name_prefix="iris-fanout")
+        return _fanout_executor
+
 
 class InterSystemsIRISInput(BaseModel):
     """Input schema for InterSystems IRIS operations."""
 
-    operation: str = Field(
-        ...,
+    operation: Optional[str] = Field(
+        None,
         description=(
             "The operation to perform: 'set_global' (Set Global value), 'get_global' "
             "(get global value), 'kill_global (delete global)', 'list_objects' (get available objects), 'describe' "
-            "(get object documentation), 'query' (sql query), install_path (get Intersystems IRIS installation path), "
+            "(get a class's properties, methods, SQL table and superclasses), "
+            "search_classes (find class names by prefix or approximate name), 'query' (sql query), install_path (get Intersystems IRIS installation path), "
             "class_list (get Intersystems IRIS class list), server_info (get InterSystems IRIS server information), "
             "list_csp (list web/csp applications), list_files (list server/intersystems iris files), "
             "list_metrics(List server/intersystems iris monitoring/metrics), list_alerts(List alerts from server/intersystems iris), "
-            "get_namespace (get information about a namespace), list_jobs (list the jobs on server/intersystems iris namespace)"
+            "get_namespace (get information about a namespace), list_jobs (list the jobs on server/intersystems iris namespace), "
+            "traverse_global (list the nodes of a global subtree page by page), "
+            "export_global (write a global subtree to an NDJSON file), "
+            "bulk_load (load rows from a CSV/NDJSON file into a table or global), "
+            "query_metrics (compact latest/rate/delta/percentile/top values of monitoring metrics), "
             "'create', 'update', or 'delete'"
         ),
     )
@@ -45,7 +115,10 @@ class InterSystemsIRISInput(BaseModel):
     ),
     class_name: Optional[str] = Field(
         None,
-        description="The InterSystems IRIS class name (e.g., 'Contact', 'Account', 'Lead')",
+        description=(
+            "The InterSystems IRIS class name or SQL table name (e.g., 'Contact', 'Account', 'Lead'); "
+            "for 'search_classes' the text to look for"
+        ),
     ),
     record_data: Optional[Dict[str, Any]] = Field(
         None, description="Data for create/update operations as key-value pairs"
@@ -53,6 +126,97 @@ class InterSystemsIRISInput(BaseModel):
     record_id: Optional[str] = Field(
         None, description="InterSystems IRIS record ID for update/delete operations"
     )
+    timeout: Optional[float] = Field(
+        None, description="Maximum seconds to wait for the operation to complete"
+    )
+    parameters: Optional[List[Any]] = Field(
+        None,
+        description="Values bound, in order, to the '?' placeholders of the 'query' SQL instead of inlining them",
+    )
+    max_rows: Optional[int] = Field(
+        None, description="Maximum number of rows returned by a 'query' operation"
+    )
+    page_size: Optional[int] = Field(
+        None, description="Number of rows fetched from InterSystems IRIS per round-trip for 'query'"
+    )
+    max_bytes: Optional[int] = Field(
+        None,
+        description="Stop a 'query' result early once the rows exceed this many characters (about 4 per LLM token)",
+    )
+    continuation_token: Optional[str] = Field(
+        None,
+        description=(
+            "Token returned by a truncated 'query' or 'traverse_global' result to fetch the next page. "
+            "Query pages run the statement again, so use ORDER BY for a stable order across pages"
+        ),
+    )
+    subscripts: Optional[List[Any]] = Field(
+        None,
+        description="Global subscripts addressing a node, e.g. ['Customer', 42] for ^Data(\"Customer\",42)",
+    )
+    start_subscript: Optional[Any] = Field(
+        None, description="First subscript (inclusive) to visit below 'subscripts' for 'traverse_global'/'export_global'"
+    )
+    end_subscript: Optional[Any] = Field(
+        None, description="Last subscript (inclusive) to visit below 'subscripts' for 'traverse_global'/'export_global'"
+    )
+    max_nodes: Optional[int] = Field(
+        None, description="Maximum number of global nodes returned or exported"
+    )
+    source_path: Optional[str] = Field(
+        None, description="Relative path, inside the tool's import directory, of the CSV or NDJSON file read by 'bulk_load'"
+    )
+    table_name: Optional[str] = Field(
+        None, description="SQL table (e.g. 'Sample.Person') that 'bulk_load' inserts into"
+    )
+    key_fields: Optional[List[str]] = Field(
+        None, description="Row fields used as global subscripts when 'bulk_load' targets a global"
+    )
+    value_field: Optional[str] = Field(
+        None,
+        description="Row field stored as the node value when 'bulk_load' targets a global; defaults to the other fields as JSON",
+    )
+    batch_size: Optional[int] = Field(
+        None, description="Rows written per transaction by 'bulk_load'"
+    )
+    metric_name: Optional[str] = Field(
+        None, description="Regular expression matched against metric names for 'query_metrics' (e.g. 'glo_ref')"
+    )
+    aggregation: Optional[str] = Field(
+        None,
+        description="'query_metrics' aggregation: 'latest', 'rate' (per second), 'delta', 'percentile', 'min', 'max' or 'avg'",
+    )
+    window: Optional[float] = Field(
+        None, description="Seconds of metric history aggregated by 'query_metrics'"
+    )
+    quantile: Optional[float] = Field(
+        None, description="Percentile (0-100) computed when aggregation is 'percentile'"
+    )
+    top_n: Optional[int] = Field(
+        None, description="Only return the N series with the largest values"
+    )
+    output_format: Optional[str] = Field(
+        None,
+        description=(
+            "How to render the result: 'json' (compact), 'yaml', 'csv' (tabular results such as query rows "
+            "or file lists) or 'summary' (JSON cut to a character budget, for large results)"
+        ),
+    )
+    output_path: Optional[str] = Field(
+        None, description="Relative path, inside the tool's export directory, of the NDJSON file written by 'export_global'"
+    )
+    operations: Optional[List[Dict[str, Any]]] = Field(
+        None,
+        description="Several operations to run in one call, each a dictionary with its own 'operation' key and arguments",
+    )
+    namespaces: Optional[List[str]] = Field(
+        None,
+        description="Run the operation in parallel in each of these namespaces; results are labelled by node and namespace",
+    )
+    nodes: Optional[List[str]] = Field(
+        None,
+        description="Run the operation in parallel on each of these IRIS nodes ('host', 'host:port' or 'host:port:webport')",
+    )
 
 
 class InterSystemsIRISTool(BaseTool):
@@ -91,12 +255,55 @@ class InterSystemsIRISTool(BaseTool):
                 "global_name": "greeting"
             }
         
+        Get the global node ^Data("Customer",42):
+            {
+                "operation": "get_global",
+                "global_name": "Data",
+                "subscripts": ["Customer", 42]
+            }
+
+        List the first 50 nodes under ^Data("Customer"):
+            {
+                "operation": "traverse_global",
+                "global_name": "Data",
+                "subscripts": ["Customer"],
+                "max_nodes": 50
+            }
+
+        Load a CSV file into the table Sample.Person, 5000 rows per transaction:
+            {
+                "operation": "bulk_load",
+                "source_path": "people.csv",
+                "table_name": "Sample.Person",
+                "batch_size": 5000
+            }
+
+        Run a query and return the rows as CSV:
+            {
+                "operation": "query",
+                "query": "SELECT Name, Email FROM Sample.Person",
+                "output_format": "csv"
+            }
+
+        List the classes of USER, keeping the answer short:
+            {
+                "operation": "list_files",
+                "namespace": "USER",
+                "output_format": "summary"
+            }
+
         Describe the class Account:
             {
                 "operation": "describe",
                 "class_name": "Account"
             }
 
+        Find classes whose name starts with or resembles "dc.gendata":
+            {
+                "operation": "search_classes",
+                "class_name": "dc.gendata"
+            }
+
         List server/intersystems iris monitoring/metrics:
             {
                 "operation": "list_metrics"
@@ -114,6 +321,14 @@ class InterSystemsIRISTool(BaseTool):
                 "filename": "Portal"
             }
         
+        Did global references per second rise over the last 5 minutes?:
+            {
+                "operation": "query_metrics",
+                "metric_name": "glo_ref",
+                "aggregation": "delta",
+                "window": 300
+            }
+
         Where is intersystems iris installed?:
             {
                 "operation": "install_path"
@@ -149,6 +364,40 @@ class InterSystemsIRISTool(BaseTool):
                 "query": "SELECT TOP 5 Id, Name, Email FROM Contact"
             }
 
+        Query a contact by email with a bound parameter:
+            {
+                "operation": "query",
+                "query": "SELECT Id, Name FROM Contact WHERE Email = ?",
+                "parameters": ["smith@example.com"]
+            }
+
+        Query contacts 100 rows at a time, then fetch the next page:
+            {
+                "operation": "query",
+                "query": "SELECT Id, Name, Email FROM Contact",
+                "max_rows": 100
+            }
+            {
+                "operation": "query",
+                "continuation_token": "<token from the previous result>"
+            }
+
+        List the jobs of namespaces USER and APP on two mirror members:
+            {
+                "operation": "list_jobs",
+                "namespaces": ["USER", "APP"],
+                "nodes": ["iris-a", "iris-b"]
+            }
+
+        Get several globals and list the jobs in one call:
+            {
+                "operations": [
+                    {"operation": "get_global", "global_name": "greeting"},
+                    {"operation": "get_global", "global_name": "farewell"},
+                    {"operation": "list_jobs", "namespace": "USER"}
+                ]
+            }
+
         Create new contact:
             {
                 "operation": "create",
@@ -162,14 +411,53 @@ class InterSystemsIRISTool(BaseTool):
         "Tool for interacting with InterSystems IRIS"
     )
     args_schema: Type[BaseModel] = InterSystemsIRISInput
-    _iris: iris.IRIS = PrivateAttr()
-    _conn: iris.IRISConnection = PrivateAttr()
+    operation_timeout: Optional[float] = None
+    """Default per-call timeout in seconds, overridden by the ``timeout`` argument."""
+    query_max_rows: int = 1000
+    """Default row limit for 'query'; larger results return a continuation token."""
+    query_page_size: int = 500
+    """Default number of rows per ``fetchmany`` round-trip."""
+    query_max_bytes: Optional[int] = None
+    """Default character budget for 'query' results."""
+    query_max_cost: Optional[float] = None
+    """Reject 'query' statements whose EXPLAIN cost is above this, unless an added TOP bounds them."""
+    query_auto_top: bool = True
+    """Add TOP to SELECTs without a row limit, so IRIS stops after the rows the page needs."""
+    global_max_nodes: int = 100
+    """Default number of nodes returned per 'traverse_global' page."""
+    export_dir: Optional[str] = None
+    """Directory 'export_global' writes into; 'output_path' is relative to it. None disables the operation."""
+    bulk_batch_size: int = 1000
+    """Default number of rows per 'bulk_load' transaction."""
+    import_dir: Optional[str] = None
+    """Directory 'bulk_load' reads from; 'source_path' is relative to it. None disables the operation."""
+    metrics_interval: Optional[float] = None
+    """Seconds between background metric samples; if set, 'query_metrics' starts the sampler."""
+    metrics_sink: Optional[MetricsSink] = None
+    """Receives call/error counters and duration, phase and result size histograms."""
+    trace_sample_rate: float = 1.0
+    """Fraction of calls whose phase timings and result sizes are recorded."""
+    output_format: Optional[str] = None
+    """Default 'output_format'; if None REST results are YAML and native results are returned as is."""
+    summary_max_chars: int = 4000
+    """Character budget of the 'summary' output format."""
+    fanout_timeout: float = 30.0
+    """Seconds each fan-out target may take when neither 'timeout' nor ``operation_timeout`` is set."""
+    class_index_interval: float = 60.0
+    """Minimum seconds between incremental refreshes of the class index used by 'describe'."""
+    _pool: IRISConnectionPool = PrivateAttr()
+    _rest: AtelierClient = PrivateAttr()
+    _cache: MetadataCache = PrivateAttr()
+    _guardrail: SqlGuardrail = PrivateAttr()
     _username: str = PrivateAttr()
     _password: str = PrivateAttr()
     _namespace: str = PrivateAttr()
     _host: str = PrivateAttr()
     _port: int = PrivateAttr()
     _webport: int = PrivateAttr()
+    _http_options: Dict[str, Any] = PrivateAttr(default_factory=dict)
+    _pool_options: Dict[str, Any] = PrivateAttr(default_factory=dict)
+    _targets: Dict[Tuple[str, int, int, str], "InterSystemsIRISTool"] = PrivateAttr(default_factory=dict)
 
     def __init__(
         self,
@@ -179,12 +467,43 @@ class InterSystemsIRISTool(BaseTool):
         port: int,
         webport: int,
         namespace: str,
+        pool: Optional[IRISConnectionPool] = None,
+        http_options: Optional[Dict[str, Any]] = None,
+        operation_timeout: Optional[float] = None,
+        cache: Optional[MetadataCache] = None,
+        guardrail: Optional[SqlGuardrail] = None,
+        **pool_options: Any,
     ) -> None:
-        """Initialize iris connection."""
-        super().__init__()
-        
-        self._conn = iris.connect(hostname + ":" + str(port) + "/" + namespace, username=username, password=password, sharedmemory=False)
-        self._iris = iris.createIRIS(self._conn)
+        """Initialize iris connection pool.
+
+        Tools created with the same host, port, namespace and username share
+        one pool, so building a tool does not open a new connection. Pass
+        ``pool`` to use a specific pool, or pool options such as
+        ``min_size``, ``max_size`` and ``max_idle`` to configure the shared
+        one when it is first created. ``http_options`` (``timeout``,
+        ``retries``, ``backoff_factor``, ...) configure the keep-alive
+        Atelier/monitor client shared by tools on the same web server.
+        ``cache`` holds results of metadata operations such as
+        ``server_info`` and ``list_files`` for a per-operation TTL, keyed by
+        server; pass a shared :class:`MetadataCache` to reuse it across tools.
+        ``guardrail`` adds TOP to unlimited queries and caches their plan
+        costs for ``query_max_cost``; pass one to share its plan cache.
+        """
+        super().__init__(operation_timeout=operation_timeout)
+
+        if pool is None:
+            pool = get_pool(hostname, port, namespace, username, password, **pool_options)
+        elif not pool_options:
+            # fan-out targets get pools sized like the one given here
+            pool_options = {name: getattr(pool, name) for name in POOL_SETTINGS}
+        self._pool = pool
+        self._pool_options = dict(pool_options)
+        self._cache = MetadataCache() if cache is None else cache
+        self._guardrail = SqlGuardrail() if guardrail is None else guardrail
+        self._http_options = dict(http_options or {})
+        self._rest = get_client(
+            "http://" + hostname + ":" + str(webport), username, password, **self._http_options
+        )
         self._username = username 
         self._password = password
         self._namespace = namespace
@@ -194,7 +513,7 @@ class InterSystemsIRISTool(BaseTool):
     
     def _run(
         self,
-        operation: str,
+        operation: Optional[str] = None,
         global_name: Optional[str] = None,
         global_value: Optional[Any] = None,
         query: Optional[str] = None,
@@ -203,96 +522,811 @@ class InterSystemsIRISTool(BaseTool):
         namespace: Optional[str] = "%SYS",
         record_data: Optional[Dict[str, Any]] = None,
         record_id: Optional[str] = None,
+        timeout: Optional[float] = None,
+        max_rows: Optional[int] = None,
+        page_size: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        continuation_token: Optional[str] = None,
+        parameters: Optional[List[Any]] = None,
+        subscripts: Optional[List[Any]] = None,
+        start_subscript: Optional[Any] = None,
+        end_subscript: Optional[Any] = None,
+        max_nodes: Optional[int] = None,
+        output_path: Optional[str] = None,
+        source_path: Optional[str] = None,
+        table_name: Optional[str] = None,
+        key_fields: Optional[List[str]] = None,
+        value_field: Optional[str] = None,
+        batch_size: Optional[int] = None,
+        metric_name: Optional[str] = None,
+        aggregation: Optional[str] = None,
+        window: Optional[float] = None,
+        quantile: Optional[float] = None,
+        top_n: Optional[int] = None,
+        output_format: Optional[str] = None,
+        operations: Optional[List[Dict[str, Any]]] = None,
+        namespaces: Optional[List[str]] = None,
+        nodes: Optional[List[str]] = None,
         run_manager: Optional[CallbackManagerForToolRun] = None,
     ) -> Union[str, Dict[str, Any], List[Dict[str, Any]]]:
         """Execute InterSystems IRIS operation."""
-        try:
-            
-            baseurl = "http://" + self._host + ":" + str(self._webport)
-
-            if operation == "get_global":
-                if not global_name:
-                    raise ValueError("Global name is required for 'get_global' operation")
-                return self._iris.get(global_name) 
-
-            elif operation == "set_global":
-                if not global_name:
-                    raise ValueError("Global name and global value are required for 'set_global' operation")
-                return self._iris.set(global_value, global_name)
-
-            elif operation == "kill_global":
-                if not global_name:
-                    raise ValueError("Global name is required for 'kill_global' operation")
-                return self._iris.kill(global_name)
-
-            elif operation == "query":
-                if not query:
-                    raise ValueError("Query string is required for 'query' operation")
-                cursor = self._conn.cursor()
-                cursor.execute(query)
-                return cursor.fetchall()
-            
-            elif operation == "install_path":
-                return self._iris.classMethodString('%SYSTEM.Util', 'InstallDirectory')
-            
-            elif operation == "get_namespace":
-                if global_name:
-                    namespace = global_name
-                return self.getStudioApiResponse(baseurl, '/api/atelier/v1/' + urllib.parse.quote(namespace), self._username, self._password)
+        with trace_operation("batch" if operations is not None else str(operation), self.trace_sample_rate) as trace:
+            try:
+                if operations is not None:
+                    result = self._run_batch(operations, timeout)
+                else:
+                    def execute(target: "InterSystemsIRISTool", target_namespace: Optional[str]) -> Any:
+                        return target._execute(
+                            operation, global_name, global_value, query, filename, class_name, target_namespace,
+                            record_data, record_id, timeout, max_rows, page_size, max_bytes,
+                            continuation_token, parameters, subscripts, start_subscript, end_subscript,
+                            max_nodes, output_path, source_path, table_name, key_fields, value_field,
+                            batch_size, metric_name, aggregation, window, quantile, top_n, output_format,
+                        )
 
-            elif operation == "list_metrics":
-                return self.getStudioApiResponse(baseurl, '/api/monitor/metrics', self._username, self._password)
+                    if namespaces or nodes:
+                        result = self._run_fanout(execute, operation, namespace, namespaces, nodes, timeout)
+                    else:
+                        result = execute(self, namespace)
+            except Exception as e:
+                trace.fail(e)
+                result = _error_message(e)
+            trace.finish(result)
+        self._report(trace, run_manager)
+        return result
 
-            elif operation == "list_alerts":
-                return self.getStudioApiResponse(baseurl, '/api/monitor/alerts', self._username, self._password)
+    def _execute(
+        self,
+        operation: Optional[str] = None,
+        global_name: Optional[str] = None,
+        global_value: Optional[Any] = None,
+        query: Optional[str] = None,
+        filename: Optional[str] = None,
+        class_name: Optional[str] = None,
+        namespace: Optional[str] = "%SYS",
+        record_data: Optional[Dict[str, Any]] = None,
+        record_id: Optional[str] = None,
+        timeout: Optional[float] = None,
+        max_rows: Optional[int] = None,
+        page_size: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        continuation_token: Optional[str] = None,
+        parameters: Optional[List[Any]] = None,
+        subscripts: Optional[List[Any]] = None,
+        start_subscript: Optional[Any] = None,
+        end_subscript: Optional[Any] = None,
+        max_nodes: Optional[int] = None,
+        output_path: Optional[str] = None,
+        source_path: Optional[str] = None,
+        table_name: Optional[str] = None,
+        key_fields: Optional[List[str]] = None,
+        value_field: Optional[str] = None,
+        batch_size: Optional[int] = None,
+        metric_name: Optional[str] = None,
+        aggregation: Optional[str] = None,
+        window: Optional[float] = None,
+        quantile: Optional[float] = None,
+        top_n: Optional[int] = None,
+        output_format: Optional[str] = None,
+        pooled: Optional[PooledConnection] = None,
+    ) -> Any:
+        """Execute one operation, raising on failure.
 
-            elif operation == "list_jobs":
-                return self.getStudioApiResponse(baseurl, '/api/atelier/v1/' + urllib.parse.quote(namespace) +'/jobs', self._username, self._password)
+        Native operations borrow a pooled connection unless ``pooled`` is
+        given, in which case they run on that connection.
+        """
+        if not operation:
+            raise ValueError("Input must contain an 'operation' or 'operations' key")
+        if output_format and output_format not in OUTPUT_FORMATS:
+            raise ValueError(f"Unsupported output format: {output_format}")
 
-            elif operation == "list_files":
-                if filename:
-                    print("lista arquivos " + filename + " no namespace " + namespace)
-                    return self.getStudioApiResponse(baseurl, '/api/atelier/v1/' + urllib.parse.quote(namespace) +'/docnames/CLS?filter=' + filename, self._username, self._password)
-                else:
-                    return self.getStudioApiResponse(baseurl, '/api/atelier/v1/' + urllib.parse.quote(namespace) +'/docnames/CLS', self._username, self._password)
+        if operation in NATIVE_OPERATIONS:
+            server = (self._host, int(self._port))
+            cached = self._cache.get(operation, self._namespace, server)
+            if cached is not MISSING:
+                return self._format(cached, output_format)
+            native_args = (
+                operation, global_name, global_value, query, class_name,
+                max_rows, page_size, max_bytes, continuation_token, parameters,
+                subscripts, start_subscript, end_subscript, max_nodes, output_path,
+                source_path, table_name, key_fields, value_field, batch_size,
+            )
+            if pooled is not None:
+                with phase("iris"):
+                    result = self._run_native(pooled, *native_args)
+            else:
+                # synchronous callers can only bound the wait for a connection
+                with self._pool.connection(timeout or self.operation_timeout) as borrowed:
+                    with phase("iris"):
+                        result = self._run_native(borrowed, *native_args)
+            if operation in WRITE_OPERATIONS:
+                self._cache.invalidate(namespace=self._namespace)
+            self._cache.set(operation, self._namespace, server, result)
+            return self._format(result, output_format)
 
-            elif operation == "server_info":
-                return self.getStudioApiResponse(baseurl, '/api/atelier/', self._username, self._password)
+        if operation == "query_metrics":
+            return self._format(
+                self._query_metrics(metric_name, aggregation, window, quantile, top_n), output_format
+            )
 
-            elif operation == "list_csp":
-                return self.getStudioApiResponse(baseurl, '/api/atelier/v1/' + urllib.parse.quote(namespace) +'/cspapps', self._username, self._password)
-                
-            elif operation == "describe":
-                if not class_name:
-                    raise ValueError("Class name is required for 'describe' operation")
-                return self._iris.classMethodVoid(class_name, '%ClassName')
+        path = self._rest_path(operation, global_name, filename, namespace)
+        if path is None:
+            raise ValueError(f"Unsupported operation: {operation}")
+        payload = self._cache.get(operation, namespace, (self._rest.baseurl, path))
+        if payload is MISSING:
+            with phase("http"):
+                payload = self._rest.get(path)
+            self._cache.set(operation, namespace, (self._rest.baseurl, path), payload)
+        return self._format(payload, output_format, "yaml")
 
+    @staticmethod
+    def _batch_groups(
+        operations: List[Dict[str, Any]], results: List[Any]
+    ) -> Dict[str, List[Tuple[int, Dict[str, Any]]]]:
+        """Split batch items into native, query and REST groups.
+
+        Malformed items get their error result immediately.
+        """
+        groups: Dict[str, List[Tuple[int, Dict[str, Any]]]] = {"native": [], "query": [], "rest": []}
+        for index, item in enumerate(operations):
+            if not isinstance(item, dict) or not item.get("operation"):
+                results[index] = {"operation": None, "error": "Each batch item must be a dictionary with an 'operation' key"}
+            elif "operations" in item:
+                results[index] = {"operation": item["operation"], "error": "Batches cannot be nested"}
+            elif "namespaces" in item or "nodes" in item:
+                results[index] = {"operation": item["operation"], "error": "Batch items cannot fan out; batch one item per target instead"}
+            elif item["operation"] == "query":
+                groups["query"].append((index, item))
+            elif item["operation"] in NATIVE_OPERATIONS:
+                groups["native"].append((index, item))
             else:
-                raise ValueError(f"Unsupported operation: {operation}")
+                groups["rest"].append((index, item))
+        return groups
 
+    @staticmethod
+    def _batch_result(item: Dict[str, Any], call: Callable[[], Any]) -> Dict[str, Any]:
+        try:
+            return {"operation": item["operation"], "result": call()}
         except Exception as e:
-            return f"Error performing Intersystems IRIS operation: {str(e)}"
+            return {"operation": item["operation"], "error": _error_message(e)}
 
-    async def _arun(
+    def _run_native_group(self, items: List[Tuple[int, Dict[str, Any]]], results: List[Any]) -> None:
+        """Run global and other native items in order over one borrowed connection."""
+        with self._pool.connection() as pooled:
+            for index, item in items:
+                results[index] = self._batch_result(
+                    item, functools.partial(self._execute, **item, pooled=pooled)
+                )
+
+    def _run_batch(self, operations: List[Dict[str, Any]], timeout: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Execute a list of operations in one pass.
+
+        Native operations (globals, ``install_path``, ``describe``) run in
+        order over a single pooled connection, SQL queries run concurrently
+        on other pooled connections and REST calls are multiplexed over the
+        keep-alive session. Groups run concurrently, so order is only
+        guaranteed within the native group. Results come back in input
+        order as ``{"operation", "result"}`` or ``{"operation", "error"}``.
+        """
+        results: List[Any] = [None] * len(operations)
+        groups = self._batch_groups(operations, results)
+        executor = self._pool.executor
+        # each item gets its own copy of the context so its phases reach the trace
+        futures = [
+            (index, item, executor.submit(contextvars.copy_context().run, self._execute, **{"timeout": timeout, **item}))
+            for index, item in groups["query"] + groups["rest"]
+        ]
+        if groups["native"]:
+            self._run_native_group(groups["native"], results)
+        for index, item, future in futures:
+            results[index] = self._batch_result(item, future.result)
+        return results
+
+    def _target(self, node: Optional[str], namespace: Optional[str]) -> "InterSystemsIRISTool":
+        """This tool, or a copy bound to another node and/or namespace.
+
+        Copies share this tool's settings, metadata cache and the
+        process-wide pools and HTTP clients, but each keeps its own plan
+        cache since plans are not keyed by host.
+        """
+        host, port, webport = self._host, self._port, self._webport
+        if node:
+            parts = node.split(":")
+            host = parts[0]
+            port = int(parts[1]) if len(parts) > 1 and parts[1] else port
+            webport = int(parts[2]) if len(parts) > 2 and parts[2] else webport
+        namespace = namespace or self._namespace
+        key = (host, int(port), int(webport), namespace)
+        if key == (self._host, int(self._port), int(self._webport), self._namespace):
+            return self
+        with _fanout_lock:
+            target = self._targets.get(key)
+            if target is None:
+                target = self.model_copy()
+                target._pool = get_pool(host, port, namespace, self._username, self._password, **self._pool_options)
+                target._rest = get_client("http://" + host + ":" + str(webport), self._username, self._password, **self._http_options)
+                target._guardrail = SqlGuardrail(self._guardrail.max_entries, self._guardrail.ttl)
+                target._namespace, target._host, target._port, target._webport = namespace, host, port, webport
+                target._targets = {}
+                self._targets[key] = target
+            return target
+
+    def _fanout_targets(
+        self,
+        operation: Optional[str],
+        namespace: Optional[str],
+        namespaces: Optional[List[str]],
+        nodes: Optional[List[str]],
+    ) -> List[Tuple[str, "InterSystemsIRISTool", Optional[str]]]:
+        """``(label, tool, namespace argument)`` for every node x namespace combination."""
+        targets = []
+        for node in nodes or [None]:
+            for target_namespace in namespaces or [None]:
+                target = self._target(node, target_namespace)
+                argument = target_namespace or namespace
+                # native operations run in the pool's namespace, REST ones in the argument's
+                shown = target._namespace if operation in NATIVE_OPERATIONS else argument
+                targets.append((f"{node or target._host}/{shown}", target, argument))
+        return targets
+
+    @staticmethod
+    def _fanout_result(operation: Optional[str], outcomes: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        failed = sum(1 for outcome in outcomes.values() if "error" in outcome)
+        return {"operation": operation, "targets": outcomes, "succeeded": len(outcomes) - failed, "failed": failed}
+
+    def _run_fanout(
+        self,
+        execute: Callable[["InterSystemsIRISTool", Optional[str]], Any],
+        operation: Optional[str],
+        namespace: Optional[str],
+        namespaces: Optional[List[str]],
+        nodes: Optional[List[str]],
+        timeout: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """Run one operation on every target in parallel and merge the results by target.
+
+        Each target gets ``timeout`` (or ``operation_timeout`` or
+        ``fanout_timeout``) seconds from the start; a target that fails or
+        times out is reported with an error and does not affect the others.
+        """
+        timeout = timeout or self.operation_timeout or self.fanout_timeout
+        executor = _get_fanout_executor()
+        futures = {
+            label: executor.submit(contextvars.copy_context().run, execute, target, argument)
+            for label, target, argument in self._fanout_targets(operation, namespace, namespaces, nodes)
+        }
+        concurrent.futures.wait(futures.values(), timeout=timeout)
+        outcomes: Dict[str, Dict[str, Any]] = {}
+        for label, future in futures.items():
+            if not future.done():
+                future.cancel()
+                outcomes[label] = {"error": f"Error performing Intersystems IRIS operation: TimeoutError: timed out after {timeout}s"}
+                continue
+            try:
+                outcomes[label] = {"result": future.result()}
+            except Exception as e:
+                outcomes[label] = {"error": _error_message(e)}
+        return self._fanout_result(operation, outcomes)
+
+    async def _arun_fanout(
+        self,
+        aexecute: Callable[["InterSystemsIRISTool", Optional[str]], Any],
+        operation: Optional[str],
+        namespace: Optional[str],
+        namespaces: Optional[List[str]],
+        nodes: Optional[List[str]],
+        timeout: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """Async counterpart of :meth:`_run_fanout`."""
+        timeout = timeout or self.operation_timeout or self.fanout_timeout
+        targets = self._fanout_targets(operation, namespace, namespaces, nodes)
+
+        async def run(target: "InterSystemsIRISTool", argument: Optional[str]) -> Dict[str, Any]:
+            try:
+                return {"result": await asyncio.wait_for(aexecute(target, argument), timeout)}
+            except asyncio.TimeoutError:
+                return {"error": f"Error performing Intersystems IRIS operation: TimeoutError: timed out after {timeout}s"}
+            except Exception as e:
+                return {"error": _error_message(e)}
+
+        results = await asyncio.gather(*(run(target, argument) for _, target, argument in targets))
+        return self._fanout_result(operation, {label: result for (label, _, _), result in zip(targets, results)})
+
+    @staticmethod
+    def _rest_path(
+        operation: str,
+        global_name: Optional[str] = None,
+        filename: Optional[str] = None,
+        namespace: Optional[str] = "%SYS",
+    ) -> Optional[str]:
+        """Return the Atelier/monitor API path for a REST operation, or None."""
+        if operation == "get_namespace":
+            if global_name:
+                namespace = global_name
+            return '/api/atelier/v1/' + urllib.parse.quote(namespace)
+
+        elif operation == "list_metrics":
+            return '/api/monitor/metrics'
+
+        elif operation == "list_alerts":
+            return '/api/monitor/alerts'
+
+        elif operation == "list_jobs":
+            return '/api/atelier/v1/' + urllib.parse.quote(namespace) + '/jobs'
+
+        elif operation == "list_files":
+            path = '/api/atelier/v1/' + urllib.parse.quote(namespace) + '/docnames/CLS'
+            if filename:
+                path += '?filter=' + urllib.parse.quote(filename)
+            return path
+
+        elif operation == "server_info":
+            return '/api/atelier/'
+
+        elif operation == "list_csp":
+            return '/api/atelier/v1/' + urllib.parse.quote(namespace) + '/cspapps'
+
+        return None
+
+    def _format(self, result: Any, output_format: Optional[str] = None, default: Optional[str] = None) -> Any:
+        """Render a result in the requested format, else the tool's, else ``default``.
+
+        With no format at all the result is returned unchanged.
+        """
+        output_format = output_format or self.output_format or default
+        if output_format is None:
+            return result
+        with phase("serialize"):
+            return format_result(result, output_format, self.summary_max_chars)
+
+    def _run_native(
         self,
+        pooled: PooledConnection,
         operation: str,
         global_name: Optional[str] = None,
-        global_value: Optional[str] = None,
+        global_value: Optional[Any] = None,
+        query: Optional[str] = None,
+        class_name: Optional[str] = None,
+        max_rows: Optional[int] = None,
+        page_size: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        continuation_token: Optional[str] = None,
+        parameters: Optional[List[Any]] = None,
+        subscripts: Optional[List[Any]] = None,
+        start_subscript: Optional[Any] = None,
+        end_subscript: Optional[Any] = None,
+        max_nodes: Optional[int] = None,
+        output_path: Optional[str] = None,
+        source_path: Optional[str] = None,
+        table_name: Optional[str] = None,
+        key_fields: Optional[List[str]] = None,
+        value_field: Optional[str] = None,
+        batch_size: Optional[int] = None,
+    ) -> Any:
+        """Execute an operation that needs a borrowed IRIS connection."""
+        subscripts = subscripts or []
+        if operation == "get_global":
+            if not global_name:
+                raise ValueError("Global name is required for 'get_global' operation")
+            return pooled.iris.get(normalize_name(global_name), *subscripts)
+
+        elif operation == "set_global":
+            if not global_name:
+                raise ValueError("Global name and global value are required for 'set_global' operation")
+            return pooled.iris.set(global_value, normalize_name(global_name), *subscripts)
+
+        elif operation == "kill_global":
+            if not global_name:
+                raise ValueError("Global name is required for 'kill_global' operation")
+            return pooled.iris.kill(normalize_name(global_name), *subscripts)
+
+        elif operation == "traverse_global":
+            if not global_name and not continuation_token:
+                raise ValueError("Global name is required for 'traverse_global' operation")
+            return traverse_page(
+                pooled.iris, global_name, subscripts, start_subscript, end_subscript,
+                max_nodes or self.global_max_nodes, continuation_token,
+            )
+
+        elif operation == "export_global":
+            if not global_name or not output_path:
+                raise ValueError("Global name and output path are required for 'export_global' operation")
+            return export_global(
+                pooled.iris, global_name, _confined_path(self.export_dir, output_path, "export_dir"),
+                subscripts, start_subscript, end_subscript, max_nodes,
+            )
+
+        elif operation == "bulk_load":
+            if not source_path:
+                raise ValueError("Source path is required for 'bulk_load' operation")
+            return self._bulk_load(
+                pooled, _confined_path(self.import_dir, source_path, "import_dir"), table_name,
+                global_name, key_fields, value_field, subscripts, batch_size,
+            )
+
+        elif operation == "query":
+            offset = 0
+            if continuation_token:
+                token_query, offset, token_parameters = decode_token(continuation_token)
+                if query and query != token_query:
+                    raise ValueError("Continuation token does not match the query")
+                query, parameters = token_query, token_parameters
+            if not query:
+                raise ValueError("Query string is required for 'query' operation")
+            max_rows = max_rows or self.query_max_rows
+            # one row past the page tells fetch_page whether to return a token
+            statement, statement_parameters = self._guardrail.check(
+                pooled, query, parameters,
+                offset + max_rows + 1 if self.query_auto_top else None, self.query_max_cost,
+            )
+            # later pages start on the server instead of reading and dropping earlier rows
+            window = add_window(statement, statement_parameters, offset) if offset else None
+            if window is not None:
+                statement, statement_parameters = window
+            cursor = pooled.execute(statement, statement_parameters)
+            try:
+                rows, more = fetch_page(
+                    cursor,
+                    query,
+                    max_rows,
+                    page_size or self.query_page_size,
+                    max_bytes or self.query_max_bytes,
+                    offset,
+                    parameters,
+                    skip=window is None,
+                )
+            finally:
+                pooled.statements.release(cursor)
+            if more is None:
+                return rows
+            return {"rows": rows, **more}
+
+        elif operation == "install_path":
+            return pooled.iris.classMethodString('%SYSTEM.Util', 'InstallDirectory')
+
+        elif operation == "describe":
+            if not class_name:
+                raise ValueError("Class name is required for 'describe' operation")
+            index = self.class_index(pooled)
+            info = index.describe(class_name)
+            if info is None:
+                suggestions = index.search(class_name, 5)
+                hint = f"; similar classes: {', '.join(suggestions)}" if suggestions else ""
+                raise ValueError(f"Class not found: {class_name}{hint}")
+            return {**info, "subclasses": index.subclasses(info["name"])}
+
+        elif operation == "search_classes":
+            if not class_name:
+                raise ValueError("Class name is required for 'search_classes' operation")
+            index = self.class_index(pooled)
+            return [
+                {"name": name, "sql_table": index.classes.get(name, {}).get("sql_table")}
+                for name in index.search(class_name, max_rows or 10)
+            ]
+
+        raise ValueError(f"Unsupported operation: {operation}")
+
+    async def _arun(
+        self,
+        operation: Optional[str] = None,
+        global_name: Optional[str] = None,
+        global_value: Optional[Any] = None,
         query: Optional[str] = None,
         filename: Optional[str] = None,
         class_name: Optional[str] = None,
         namespace: Optional[str] = "%SYS",
         record_data: Optional[Dict[str, Any]] = None,
         record_id: Optional[str] = None,
-        run_manager: Optional[CallbackManagerForToolRun] = None,
+        timeout: Optional[float] = None,
+        max_rows: Optional[int] = None,
+        page_size: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        continuation_token: Optional[str] = None,
+        parameters: Optional[List[Any]] = None,
+        subscripts: Optional[List[Any]] = None,
+        start_subscript: Optional[Any] = None,
+        end_subscript: Optional[Any] = None,
+        max_nodes: Optional[int] = None,
+        output_path: Optional[str] = None,
+        source_path: Optional[str] = None,
+        table_name: Optional[str] = None,
+        key_fields: Optional[List[str]] = None,
+        value_field: Optional[str] = None,
+        batch_size: Optional[int] = None,
+        metric_name: Optional[str] = None,
+        aggregation: Optional[str] = None,
+        window: Optional[float] = None,
+        quantile: Optional[float] = None,
+        top_n: Optional[int] = None,
+        output_format: Optional[str] = None,
+        operations: Optional[List[Dict[str, Any]]] = None,
+        namespaces: Optional[List[str]] = None,
+        nodes: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForToolRun] = None,
     ) -> Union[str, Dict[str, Any], List[Dict[str, Any]]]:
-        """Async implementation of Intersystems IRIS operations."""
-        # Intersystems IRIS doesn't have native async support,
-        # so we just call the sync version
-        return self._run(
-            operation, global_name, global_value, query, filename, class_name, namespace, record_data, record_id, run_manager
+        """Async implementation of Intersystems IRIS operations.
+
+        REST operations use the non-blocking HTTP client; native and SQL
+        operations run on the connection pool's bounded executor, so
+        concurrent ``ainvoke`` calls do not block the event loop or each
+        other. ``timeout`` (or ``operation_timeout``) bounds the whole call.
+        """
+        timeout = timeout or self.operation_timeout
+        with trace_operation("batch" if operations is not None else str(operation), self.trace_sample_rate) as trace:
+            try:
+                if operations is not None:
+                    result = await self._arun_batch(operations, timeout)
+                else:
+                    async def aexecute(target: "InterSystemsIRISTool", target_namespace: Optional[str]) -> Any:
+                        return await target._aexecute(
+                            operation, global_name, global_value, query, filename, class_name, target_namespace,
+                            record_data, record_id, timeout, max_rows, page_size, max_bytes,
+                            continuation_token, parameters, subscripts, start_subscript, end_subscript,
+                            max_nodes, output_path, source_path, table_name, key_fields, value_field,
+                            batch_size, metric_name, aggregation, window, quantile, top_n, output_format,
+                        )
+
+                    if namespaces or nodes:
+                        result = await self._arun_fanout(aexecute, operation, namespace, namespaces, nodes, timeout)
+                    else:
+                        result = await aexecute(self, namespace)
+            except asyncio.TimeoutError as e:
+                trace.fail(e)
+                result = f"Error performing Intersystems IRIS operation: TimeoutError: timed out after {timeout}s"
+            except Exception as e:
+                trace.fail(e)
+                result = _error_message(e)
+            trace.finish(result)
+        await self._areport(trace, run_manager)
+        return result
+
+    async def _aexecute(
+        self,
+        operation: Optional[str] = None,
+        global_name: Optional[str] = None,
+        global_value: Optional[Any] = None,
+        query: Optional[str] = None,
+        filename: Optional[str] = None,
+        class_name: Optional[str] = None,
+        namespace: Optional[str] = "%SYS",
+        record_data: Optional[Dict[str, Any]] = None,
+        record_id: Optional[str] = None,
+        timeout: Optional[float] = None,
+        max_rows: Optional[int] = None,
+        page_size: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        continuation_token: Optional[str] = None,
+        parameters: Optional[List[Any]] = None,
+        subscripts: Optional[List[Any]] = None,
+        start_subscript: Optional[Any] = None,
+        end_subscript: Optional[Any] = None,
+        max_nodes: Optional[int] = None,
+        output_path: Optional[str] = None,
+        source_path: Optional[str] = None,
+        table_name: Optional[str] = None,
+        key_fields: Optional[List[str]] = None,
+        value_field: Optional[str] = None,
+        batch_size: Optional[int] = None,
+        metric_name: Optional[str] = None,
+        aggregation: Optional[str] = None,
+        window: Optional[float] = None,
+        quantile: Optional[float] = None,
+        top_n: Optional[int] = None,
+        output_format: Optional[str] = None,
+    ) -> Any:
+        """Async counterpart of :meth:`_execute`, raising on failure or timeout."""
+        timeout = timeout or self.operation_timeout
+        if operation and operation not in NATIVE_OPERATIONS:
+            path = self._rest_path(operation, global_name, filename, namespace)
+            if path is not None:
+                if output_format and output_format not in OUTPUT_FORMATS:
+                    raise ValueError(f"Unsupported output format: {output_format}")
+                payload = self._cache.get(operation, namespace, (self._rest.baseurl, path))
+                if payload is MISSING:
+                    with phase("http"):
+                        payload = await asyncio.wait_for(self._rest.aget(path), timeout)
+                    self._cache.set(operation, namespace, (self._rest.baseurl, path), payload)
+                return self._format(payload, output_format, "yaml")
+        return await asyncio.wait_for(
+            self._pool.run(
+                self._execute, operation, global_name, global_value, query, filename,
+                class_name, namespace, record_data, record_id, timeout,
+                max_rows, page_size, max_bytes, continuation_token, parameters,
+                subscripts, start_subscript, end_subscript, max_nodes, output_path,
+                source_path, table_name, key_fields, value_field, batch_size,
+                metric_name, aggregation, window, quantile, top_n, output_format,
+            ),
+            timeout,
+        )
+
+    async def _arun_batch(
+        self, operations: List[Dict[str, Any]], timeout: Optional[float] = None
+    ) -> List[Dict[str, Any]]:
+        """Async counterpart of :meth:`_run_batch`; REST calls share the async client."""
+        results: List[Any] = [None] * len(operations)
+        groups = self._batch_groups(operations, results)
+
+        async def run_item(index: int, item: Dict[str, Any]) -> None:
+            try:
+                result = await self._aexecute(**{"timeout": timeout, **item})
+                results[index] = {"operation": item["operation"], "result": result}
+            except asyncio.TimeoutError:
+                results[index] = {"operation": item["operation"], "error": f"Error performing Intersystems IRIS operation: TimeoutError: timed out after {item.get('timeout', timeout)}s"}
+            except Exception as e:
+                results[index] = {"operation": item["operation"], "error": _error_message(e)}
+
+        tasks = [run_item(index, item) for index, item in groups["query"] + groups["rest"]]
+        if groups["native"]:
+            tasks.append(self._pool.run(self._run_native_group, groups["native"], results))
+        await asyncio.gather(*tasks)
+        return results
+
+    def _report(self, trace: OperationTrace, run_manager: Optional[CallbackManagerForToolRun] = None) -> None:
+        """Send a finished trace to the metrics sink and, if sampled, the callback handlers."""
+        if self.metrics_sink is not None:
+            record_trace(self.metrics_sink, trace)
+        if run_manager is not None and trace.sampled:
+            run_manager.get_child().on_custom_event(TRACE_EVENT, trace.as_dict(), run_id=run_manager.run_id)
+
+    async def _areport(self, trace: OperationTrace, run_manager: Optional[AsyncCallbackManagerForToolRun] = None) -> None:
+        if self.metrics_sink is not None:
+            record_trace(self.metrics_sink, trace)
+        if run_manager is not None and trace.sampled:
+            await run_manager.get_child().on_custom_event(TRACE_EVENT, trace.as_dict(), run_id=run_manager.run_id)
+
+    def _callback_manager(self, manager_class: Any, config: RunnableConfig) -> Any:
+        return manager_class.configure(
+            config.get("callbacks"), self.callbacks, self.verbose,
+            config.get("tags"), self.tags, config.get("metadata"), self.metadata,
+        )
+
+    def _bulk_load(
+        self,
+        pooled: PooledConnection,
+        source: Union[str, Iterable[Dict[str, Any]]],
+        table_name: Optional[str] = None,
+        global_name: Optional[str] = None,
+        key_fields: Optional[List[str]] = None,
+        value_field: Optional[str] = None,
+        subscripts: Optional[List[Any]] = None,
+        batch_size: Optional[int] = None,
+        progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ) -> Dict[str, Any]:
+        rows = read_rows(source)
+        batch_size = batch_size or self.bulk_batch_size
+        if table_name:
+            return load_table(pooled.conn, table_name, rows, batch_size=batch_size, progress=progress)
+        if global_name:
+            return load_global(
+                pooled.iris, global_name, rows, key_fields or [], value_field,
+                subscripts or [], batch_size, progress,
+            )
+        raise ValueError("Either a table name or a global name is required for 'bulk_load' operation")
+
+    def bulk_load(
+        self,
+        source: Union[str, Iterable[Dict[str, Any]]],
+        table_name: Optional[str] = None,
+        global_name: Optional[str] = None,
+        key_fields: Optional[List[str]] = None,
+        value_field: Optional[str] = None,
+        subscripts: Optional[List[Any]] = None,
+        batch_size: Optional[int] = None,
+        progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ) -> Dict[str, Any]:
+        """Load rows from a CSV/NDJSON path or an iterable of dicts.
+
+        Rows are streamed and written ``batch_size`` at a time, into
+        ``table_name`` with ``executemany`` or into ``global_name`` with
+        native sets inside a transaction per batch. ``progress`` is called
+        after every batch with the running row count and throughput, which
+        are also returned at the end. Unlike the 'bulk_load' operation,
+        ``source`` may be any path the process can read.
+        """
+        with self._pool.connection() as pooled:
+            stats = self._bulk_load(
+                pooled, source, table_name, global_name, key_fields, value_field,
+                subscripts, batch_size, progress,
+            )
+        self._cache.invalidate(namespace=self._namespace)
+        return stats
+
+    def class_index(self, pooled: Optional[PooledConnection] = None) -> ClassIndex:
+        """The class index of this tool's namespace, refreshed if ``class_index_interval`` has passed.
+
+        The index is shared by tools on the same pool key; the first call
+        loads every class, later calls only read classes changed since.
+        """
+        index = get_class_index(self._pool.key, min_interval=self.class_index_interval)
+        if pooled is not None:
+            index.refresh(pooled)
+        else:
+            with self._pool.connection(self.operation_timeout) as borrowed:
+                index.refresh(borrowed)
+        return index
+
+    def metrics_sampler(self) -> MetricsSampler:
+        """The metrics sampler shared by tools on the same web server."""
+        return get_sampler(
+            self._rest.baseurl,
+            lambda: self._rest.get('/api/monitor/metrics'),
+            interval=self.metrics_interval or 15.0,
         )
 
+    def start_metrics_sampler(self) -> MetricsSampler:
+        """Sample /api/monitor/metrics in the background every ``metrics_interval`` seconds."""
+        sampler = self.metrics_sampler()
+        sampler.start()
+        return sampler
+
+    def _query_metrics(
+        self,
+        metric_name: Optional[str] = None,
+        aggregation: Optional[str] = None,
+        window: Optional[float] = None,
+        quantile: Optional[float] = None,
+        top_n: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        sampler = self.metrics_sampler()
+        if not sampler.running and (sampler.empty or not self.metrics_interval):
+            # the first query needs data now; without a background sampler
+            # every query records a fresh point
+            with phase("http"):
+                sampler.sample()
+        if self.metrics_interval and not sampler.running:
+            sampler.start()
+        return sampler.query(
+            metric_name, aggregation or "latest", window,
+            95.0 if quantile is None else quantile, top_n,
+        )
+
+    def stream_query(
+        self,
+        query: str,
+        parameters: Optional[List[Any]] = None,
+        page_size: Optional[int] = None,
+    ) -> Iterator[Any]:
+        """Iterate over all rows of ``query`` without loading them into memory.
+
+        A pooled connection is borrowed for the lifetime of the iterator, so
+        consume or close it promptly.
+        """
+        with self._pool.connection() as pooled:
+            cursor = pooled.execute(query, parameters)
+            try:
+                yield from iter_rows(cursor, page_size or self.query_page_size)
+            finally:
+                pooled.statements.release(cursor)
+
+    def stream_global(
+        self,
+        global_name: str,
+        subscripts: Optional[List[Any]] = None,
+        start_subscript: Optional[Any] = None,
+        end_subscript: Optional[Any] = None,
+    ) -> Iterator[Tuple[List[Any], Any]]:
+        """Iterate over ``(subscripts, value)`` for every node of a global subtree.
+
+        Nodes are read lazily in collation order over a borrowed pooled
+        connection, which is held until the iterator is exhausted or closed.
+        """
+        with self._pool.connection() as pooled:
+            yield from walk_global(
+                pooled.iris, global_name, subscripts or [], start_subscript, end_subscript
+            )
+
+    def cache_stats(self) -> Dict[str, Any]:
+        """Metadata cache size, hits, misses and hit rate, overall and per operation."""
+        return self._cache.stats()
+
+    def invalidate_cache(self, operation: Optional[str] = None, namespace: Optional[str] = None) -> int:
+        """Drop cached metadata, e.g. after compiling classes or changing CSP apps."""
+        return self._cache.invalidate(operation, namespace)
+
+    def statement_cache_stats(self) -> Dict[str, Any]:
+        """Prepared statement cache hits, misses and hit rate for this tool's pool."""
+        return self._pool.statement_stats.as_dict()
+
     def invoke(
         self,
         input: Union[str, Dict[str, Any], ToolCall],
@@ -314,10 +1348,24 @@ class InterSystemsIRISTool(BaseTool):
         if not isinstance(input_dict, dict):
             raise ValueError(f"Unsupported input type: {type(input)}")
 
-        if "operation" not in input_dict:
-            raise ValueError("Input must be a dictionary with an 'operation' key")
+        if "operation" not in input_dict and "operations" not in input_dict:
+            raise ValueError("Input must be a dictionary with an 'operation' or 'operations' key")
 
-        return self._run(**input_dict)
+        config = ensure_config(config)
+        run_manager = self._callback_manager(CallbackManager, config).on_tool_start(
+            {"name": self.name, "description": self.description},
+            str(input_dict),
+            run_id=config.get("run_id"),
+            inputs=input_dict,
+            name=config.get("run_name") or self.name,
+        )
+        try:
+            result = self._run(**input_dict, run_manager=run_manager)
+        except BaseException as e:
+            run_manager.on_tool_error(e)
+            raise
+        run_manager.on_tool_end(result)
+        return result
 
     async def ainvoke(
         self,
@@ -340,20 +1388,26 @@ class InterSystemsIRISTool(BaseTool):
         if not isinstance(input_dict, dict):
             raise ValueError(f"Unsupported input type: {type(input)}")
 
-        if "operation" not in input_dict:
-            raise ValueError("Input must be a dictionary with an 'operation' key")
+        if "operation" not in input_dict and "operations" not in input_dict:
+            raise ValueError("Input must be a dictionary with an 'operation' or 'operations' key")
 
-        return await self._arun(**input_dict)
+        config = ensure_config(config)
+        run_manager = await self._callback_manager(AsyncCallbackManager, config).on_tool_start(
+            {"name": self.name, "description": self.description},
+            str(input_dict),
+            run_id=config.get("run_id"),
+            inputs=input_dict,
+            name=config.get("run_name") or self.name,
+        )
+        try:
+            result = await self._arun(**input_dict, run_manager=run_manager)
+        except BaseException as e:
+            await run_manager.on_tool_error(e)
+            raise
+        await run_manager.on_tool_end(result)
+        return result
     
     @staticmethod
     def getStudioApiResponse(baseurl, path, username, password):
-        credentials = (username, password)
-        response = requests.get(baseurl + path, auth=credentials)
-        status = response.status_code
-        if status == 200:
-            if "monitor/metrics" not in path: 
-                return yaml.dump(response.json()) 
-            else:
-                return response.text
-        else:
-            return None
\ No newline at end of file
+        payload = get_client(baseurl, username, password).get(path)
+        return format_result(payload, "yaml")
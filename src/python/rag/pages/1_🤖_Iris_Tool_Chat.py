@@ -1,7 +1,7 @@
-from langchain_iris_tool.tools import InterSystemsIRISTool
-from langchain_ollama import ChatOllama
 import streamlit as st
 
+from agent import run_tool_calls
+
 st.set_page_config(page_title="InterSystems IRIS Tool Demo", page_icon="🤖")
 
 #
@@ -16,6 +16,29 @@ webport = 52773
 namespace = "USER"
 
 
+@st.cache_resource
+def get_tool(username, password, hostname, port, webport, namespace):
+    # heavy imports happen once per process, on the first question
+    from langchain_iris_tool.tools import InterSystemsIRISTool
+
+    return InterSystemsIRISTool(
+            username=username, password=password, hostname=hostname,
+            port=port, webport=webport, namespace=namespace)
+
+
+@st.cache_resource
+def get_llm(username, password, hostname, port, webport, namespace):
+    # keyed on the settings so the model is bound to the matching tool
+    from langchain_ollama import ChatOllama
+
+    tool = get_tool(username, password, hostname, port, webport, namespace)
+    return ChatOllama(
+        base_url="http://ollama:11434",
+        model="mistral",
+        temperature=0,
+    ).bind_tools([tool])
+
+
 #
 #   STREAMLIT APP
 #
@@ -29,26 +52,33 @@ with st.popover("Settings"):
     port = int(st.text_input("Port:", port))
     webport = int(st.text_input("Web port:", webport))
     namespace = st.text_input("Namespace:", namespace)
-    
+
 
 # User query input
 query = st.text_input(label="Enter your query")
 
 # Submit button
 if st.button(label="Ask IRIS", type="primary"):
-    
-    tool = InterSystemsIRISTool(
-            username=username, password=password, hostname=hostname, 
-            port=port, webport=webport, namespace=namespace)
 
-    llm = ChatOllama(
-        base_url="http://ollama:11434", 
-        model="mistral", 
-        temperature=0,
-    ).bind_tools([tool])
+    settings = (username, password, hostname, port, webport, namespace)
+    tool = get_tool(*settings)
+    llm = get_llm(*settings)
 
     with st.container(border=True):
         with st.spinner(text="Generating response"):
             # Get response from llm
             response = llm.invoke(query)
-            st.code(tool.invoke(response.tool_calls[0]["args"]), language="yaml")
\ No newline at end of file
+
+        if not response.tool_calls:
+            st.write(response.content)
+        else:
+            # one slot per call, filled as soon as that call finishes
+            slots = [st.empty() for _ in response.tool_calls]
+            for slot, tool_call in zip(slots, response.tool_calls):
+                slot.caption(f"Running {tool_call['args'].get('operation', tool_call['name'])}...")
+
+            def show(index, tool_call, result):
+                slots[index].code(str(result), language="yaml")
+
+            with st.spinner(text="Running %d tool call(s)" % len(response.tool_calls)):
+                run_tool_calls([tool], response.tool_calls, on_result=show)
@@ -1,6 +1,5 @@
-import pandas as pd
 import streamlit as st
-from sqlalchemy import create_engine
+from class_sync import get_class_sync
 import langchain_helper as lch
 
 username = "_system"
@@ -16,11 +15,8 @@ st.title("Langchain IRIS Classes Chat")
 
 with st.popover("Settings"):
     with st.spinner(text="Connecting to the IRIS classes"):
-        engine = create_engine("iris://" + username + ":" + password + "@" + hostname + ":" + str(port) + "/" + namespace)
-        connection  = engine.connect()
-        query = 'select * from %Dictionary.ClassDefinition where substring(ID,1,1) <> \'%\' and  Copyright is null'
-        df = pd.read_sql(query, con=connection)
-        df.to_csv("classes.csv")
+        # only classes changed since the last sync are read
+        get_class_sync("iris://" + username + ":" + password + "@" + hostname + ":" + str(port) + "/" + namespace).sync()
     
     username = st.text_input("Username:", username)
     password = st.text_input("Password:", password)
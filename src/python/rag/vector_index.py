@@ -0,0 +1,107 @@
+"""Incrementally maintained IRIS vector collections for the RAG pages."""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from typing import Any, Dict, List
+
+from langchain_iris import IRISVector
+
+
+def document_id(document: Any) -> str:
+    """Content hash used as the vector id of a document."""
+    return hashlib.sha256(document.page_content.encode("utf-8")).hexdigest()
+
+
+class IncrementalIndex:
+    """An IRIS vector collection kept in sync with a changing set of documents.
+
+    Each document is stored under the hash of its content. A local manifest
+    remembers which hashes are in the collection, so a sync only embeds and
+    adds new or changed documents and deletes the ones that disappeared;
+    an unchanged corpus costs no embedding calls at all. Syncs hold a lock
+    from the diff to the manifest write, so concurrent sessions never add
+    the same ids twice.
+    """
+
+    def __init__(self, embeddings: Any, connection_string: str, collection_name: str, manifest_dir: str = ".") -> None:
+        self.collection_name = collection_name
+        self.manifest_path = os.path.join(manifest_dir, f".{collection_name}.index.json")
+        self._manifest = self._load_manifest()
+        self._lock = threading.RLock()
+        # without a manifest the collection may hold rows with unknown ids
+        self.store = IRISVector(
+            embedding_function=embeddings,
+            collection_name=collection_name,
+            connection_string=connection_string,
+            pre_delete_collection=not self._manifest["ids"],
+        )
+
+    def _load_manifest(self) -> Dict[str, Any]:
+        try:
+            with open(self.manifest_path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {"ids": [], "source_mtime": None}
+
+    def _save_manifest(self) -> None:
+        directory, name = os.path.split(self.manifest_path)
+        # a temp file of our own, so another writer cannot rename it from under us
+        with tempfile.NamedTemporaryFile("w", encoding="utf-8", dir=directory or ".", prefix=name, suffix=".tmp", delete=False) as f:
+            json.dump(self._manifest, f)
+        os.replace(f.name, self.manifest_path)
+
+    @property
+    def version(self) -> str:
+        """Hash of the indexed content; changes whenever documents are added or removed."""
+        digest = hashlib.sha256()
+        for doc_id in sorted(self._manifest["ids"]):
+            digest.update(doc_id.encode("ascii"))
+        return digest.hexdigest()
+
+    def sync(self, documents: List[Any]) -> Dict[str, int]:
+        """Upsert new or changed documents and delete stale ones."""
+        current = {}
+        for document in documents:
+            current.setdefault(document_id(document), document)
+        with self._lock:
+            indexed = set(self._manifest["ids"])
+            added = [doc_id for doc_id in current if doc_id not in indexed]
+            removed = [doc_id for doc_id in indexed if doc_id not in current]
+            if added:
+                self.store.add_documents([current[doc_id] for doc_id in added], ids=added)
+            if removed:
+                self.store.delete(ids=removed)
+            if added or removed:
+                self._manifest["ids"] = list(current)
+                self._save_manifest()
+            return {"added": len(added), "removed": len(removed), "unchanged": len(current) - len(added)}
+
+    def sync_csv(self, csv_file: str) -> Dict[str, int]:
+        """Sync from a CSV file, skipping the load entirely if it has not been modified."""
+        from langchain.document_loaders import CSVLoader
+
+        mtime = os.path.getmtime(csv_file)
+        with self._lock:
+            if mtime == self._manifest.get("source_mtime") and self._manifest["ids"]:
+                return {"added": 0, "removed": 0, "unchanged": len(self._manifest["ids"])}
+            stats = self.sync(CSVLoader(csv_file).load())
+            self._manifest["source_mtime"] = mtime
+            self._save_manifest()
+            return stats
+
+
+_indexes: Dict[Any, IncrementalIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_index(embeddings: Any, connection_string: str, collection_name: str) -> IncrementalIndex:
+    """Return the process-wide index for a connection and collection."""
+    key = (connection_string, collection_name)
+    # Streamlit sessions ask from their own threads; only one may create (and pre-delete) the collection
+    with _indexes_lock:
+        if key not in _indexes:
+            _indexes[key] = IncrementalIndex(embeddings, connection_string, collection_name)
+        return _indexes[key]
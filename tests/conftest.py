@@ -0,0 +1,33 @@
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+sys.path.insert(0, os.path.join(ROOT, "src", "python", "rag"))
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+import fake_iris  # noqa: E402
+
+# the package imports the driver lazily, so installing the fake here is enough
+sys.modules.setdefault("iris", fake_iris)
+
+
+@pytest.fixture
+def iris():
+    """The fake driver with no simulated latency and empty globals."""
+    fake_iris.configure(latency=0, rows=100, connect_latency=0)
+    fake_iris.reset()
+    yield fake_iris
+    fake_iris.reset()
+
+
+@pytest.fixture
+def native(iris):
+    """A native API handle on a fresh fake connection."""
+    return iris.createIRIS(iris.connect("localhost:1972/USER"))
+
+
+@pytest.fixture
+def cursor(iris):
+    return iris.connect("localhost:1972/USER").cursor()
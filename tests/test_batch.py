@@ -0,0 +1,96 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("langchain_core")
+pytest.importorskip("requests")
+pytest.importorskip("httpx")
+
+from stub_server import start_stub_server  # noqa: E402
+
+from langchain_iris_tool.tools import InterSystemsIRISTool  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def stub():
+    server, _ = start_stub_server()
+    yield server.server_address[1]
+    server.shutdown()
+
+
+@pytest.fixture(scope="module")
+def slow_stub():
+    server, _ = start_stub_server(delay=1.0)
+    yield server.server_address[1]
+    server.shutdown()
+
+
+@pytest.fixture
+def tool(iris, stub):
+    return InterSystemsIRISTool(
+        hostname="127.0.0.1", port=1972, namespace="USER", username="_SYSTEM", password="SYS",
+        webport=stub, http_options={"retries": 0, "timeout": 5},
+    )
+
+
+OPERATIONS = [
+    {"operation": "set_global", "global_name": "Batch", "global_value": "one"},
+    {"operation": "get_global", "global_name": "Batch"},
+    {"operation": "query", "query": "SELECT ID, Name FROM Sample.Person", "max_rows": 2},
+    {"operation": "server_info", "output_format": "json"},
+    {"operation": "no_such_operation"},
+    "get_global",
+    {"operation": "get_global", "operations": [{"operation": "install_path"}]},
+    {"operation": "install_path", "namespaces": ["USER", "%SYS"]},
+    {"operation": "install_path"},
+]
+
+
+def check_batch(results):
+    assert [result["operation"] for result in results] == [
+        "set_global", "get_global", "query", "server_info", "no_such_operation",
+        None, "get_global", "install_path", "install_path",
+    ]
+    # native items run in order on one connection, so the get sees the set
+    assert results[1] == {"operation": "get_global", "result": "one"}
+    assert [row[0] for row in results[2]["result"]["rows"]] == [0, 1]
+    assert '"IRIS 2024.1"' in results[3]["result"]
+    assert "Unsupported operation" in results[4]["error"]
+    assert "dictionary with an 'operation' key" in results[5]["error"]
+    assert results[6]["error"] == "Batches cannot be nested"
+    assert "cannot fan out" in results[7]["error"]
+    assert results[8] == {"operation": "install_path", "result": "/usr/irissys/"}
+
+
+def test_batch_keeps_input_order_and_reports_errors_per_item(tool):
+    check_batch(tool.invoke({"operations": OPERATIONS}))
+
+
+def test_async_batch_keeps_input_order_and_reports_errors_per_item(tool):
+    check_batch(asyncio.run(tool.ainvoke({"operations": OPERATIONS})))
+
+
+def test_fanout_labels_native_targets_by_node_and_pool_namespace(tool):
+    result = tool.invoke({"operation": "install_path", "nodes": ["iris-a", "iris-b:1973"], "namespaces": ["USER", "APP"]})
+    assert sorted(result["targets"]) == ["iris-a/APP", "iris-a/USER", "iris-b:1973/APP", "iris-b:1973/USER"]
+    assert all(outcome == {"result": "/usr/irissys/"} for outcome in result["targets"].values())
+    assert (result["succeeded"], result["failed"]) == (4, 0)
+
+
+def test_fanout_labels_rest_targets_by_namespace_argument(tool):
+    result = asyncio.run(tool.ainvoke({"operation": "get_namespace", "namespaces": ["USER", "APP"], "output_format": "json"}))
+    assert sorted(result["targets"]) == ["127.0.0.1/APP", "127.0.0.1/USER"]
+    for namespace in ("APP", "USER"):
+        assert f'"name":"{namespace}"' in result["targets"][f"127.0.0.1/{namespace}"]["result"].replace(" ", "")
+
+
+@pytest.mark.parametrize("run", ["sync", "async"])
+def test_fanout_times_out_and_fails_per_target(tool, stub, slow_stub, run):
+    nodes = [f"127.0.0.1::{stub}", f"127.0.0.1::{slow_stub}", "127.0.0.1::1"]
+    request = {"operation": "server_info", "nodes": nodes, "timeout": 0.3, "output_format": "json"}
+    result = tool.invoke(request) if run == "sync" else asyncio.run(tool.ainvoke(request))
+    outcomes = result["targets"]
+    assert '"IRIS 2024.1"' in outcomes[nodes[0] + "/%SYS"]["result"]
+    assert "timed out after 0.3s" in outcomes[nodes[1] + "/%SYS"]["error"]
+    assert "error" in outcomes[nodes[2] + "/%SYS"]
+    assert (result["succeeded"], result["failed"]) == (1, 2)
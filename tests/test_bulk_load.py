@@ -0,0 +1,64 @@
+import json
+
+import pytest
+
+from langchain_iris_tool.bulk_load import batched, load_global, load_table, read_rows
+
+
+def people(count, fail_at=None):
+    for i in range(count):
+        yield {"Name": "__fail__" if i == fail_at else f"name{i}", "Age": i}
+
+
+@pytest.fixture
+def conn(iris):
+    return iris.connect("localhost:1972/USER")
+
+
+def test_read_rows_from_csv_and_ndjson(tmp_path):
+    (tmp_path / "p.csv").write_text("Name,Age\nAda,36\n")
+    (tmp_path / "p.ndjson").write_text('{"Name": "Ada", "Age": 36}\n\n')
+    assert list(read_rows(str(tmp_path / "p.csv"))) == [{"Name": "Ada", "Age": "36"}]
+    assert list(read_rows(str(tmp_path / "p.ndjson"))) == [{"Name": "Ada", "Age": 36}]
+    with pytest.raises(ValueError):
+        list(read_rows(str(tmp_path / "p.txt")))
+
+
+def test_batched_sizes():
+    assert [len(b) for b in batched(range(7), 3)] == [3, 3, 1]
+
+
+def test_load_table_commits_every_batch(conn):
+    updates = []
+    stats = load_table(conn, "Sample.Person", people(25), batch_size=10, progress=updates.append)
+    assert stats["rows"] == 25 and stats["batches"] == 3
+    assert [u["rows"] for u in updates] == [10, 20, 25]
+    assert len(conn.committed) == 25
+
+
+def test_failed_batch_is_rolled_back_and_autocommit_restored(conn):
+    with pytest.raises(RuntimeError):
+        load_table(conn, "Sample.Person", people(25, fail_at=15), batch_size=10)
+    # the first batch is committed; the rows of the failing batch written before the error are not
+    assert [row[0] for row in conn.committed] == [f"name{i}" for i in range(10)]
+    assert conn.isAutoCommit()
+
+
+def test_load_table_rejects_bad_identifiers(conn):
+    with pytest.raises(ValueError):
+        load_table(conn, "Sample.Person; DROP TABLE x", people(1))
+    with pytest.raises(ValueError):
+        load_table(conn, "Sample.Person", [{"Name) VALUES (1); --": 1}])
+
+
+def test_load_global_sets_one_node_per_row(native):
+    stats = load_global(native, "^People", people(3), ["Age"], subscripts=["ByAge"], batch_size=2)
+    assert stats["rows"] == 3
+    assert json.loads(native.get("People", "ByAge", 2)) == {"Name": "name2"}
+    load_global(native, "People", people(1), ["Age"], value_field="Name")
+    assert native.get("People", 0) == "name0"
+
+
+def test_load_global_needs_key_fields(native):
+    with pytest.raises(ValueError):
+        load_global(native, "People", people(1), [])
@@ -0,0 +1,91 @@
+import threading
+
+from langchain_iris_tool.class_index import ClassIndex
+
+CLASSES = [
+    ("dc.gendata.Company", "%Persistent", 0, "persistent", None, "A company", 1.0),
+    ("dc.gendata.Employee", "Company,%JSON.Adaptor", 0, "persistent", None, "", 2.0),
+    ("dc.gendata.Manager", "dc.gendata.Employee", 0, "persistent", "Boss", "", 3.0),
+]
+
+
+class FakeCursor:
+    def __init__(self, rows):
+        self._rows = list(rows)
+
+    def fetchmany(self, size):
+        rows, self._rows = self._rows[:size], self._rows[size:]
+        return rows
+
+
+class FakeStatements:
+    def release(self, cursor):
+        pass
+
+
+class FakePooled:
+    statements = FakeStatements()
+
+    def __init__(self, classes):
+        self.classes = classes
+
+    def execute(self, sql, parameters=None):
+        if sql.startswith("SELECT COUNT(*)"):
+            return FakeCursor([(len(self.classes),)])
+        if sql.startswith("SELECT ID FROM"):
+            return FakeCursor([(row[0],) for row in self.classes])
+        if "%Dictionary.ClassDefinition" in sql:
+            return FakeCursor(self.classes)
+        return FakeCursor([])
+
+
+def test_superclass_names_are_qualified():
+    index = ClassIndex()
+    index.refresh(FakePooled(CLASSES))
+    assert index.describe("dc.gendata.Company")["super"] == ["%Library.Persistent"]
+    assert index.superclasses("Manager") == [
+        "dc.gendata.Employee", "dc.gendata.Company", "%JSON.Adaptor", "%Library.Persistent",
+    ]
+    assert index.subclasses("dc.gendata.Company") == ["dc.gendata.Employee", "dc.gendata.Manager"]
+    assert index.describe("dc_gendata.boss")["name"] == "dc.gendata.Manager"
+
+
+def test_deleted_classes_are_dropped():
+    pooled = FakePooled(CLASSES)
+    index = ClassIndex()
+    index.refresh(pooled)
+    pooled.classes = CLASSES[:2]
+    assert index.refresh(pooled, force=True)["deleted"] == 1
+    assert index.resolve("Manager") is None
+    assert index.subclasses("dc.gendata.Employee") == []
+
+
+def test_lookups_during_refresh():
+    classes = [(f"dc.big.C{i}", "%RegisteredObject", 0, "", None, "", float(i)) for i in range(2000)]
+    pooled = FakePooled(classes)
+    index = ClassIndex()
+    index.refresh(pooled)
+    errors = []
+
+    def read():
+        try:
+            for _ in range(50):
+                index.search("c1")
+                index.subclasses("%Library.RegisteredObject")
+        except Exception as e:
+            errors.append(e)
+
+    reader = threading.Thread(target=read)
+    reader.start()
+    for i in range(20):
+        pooled.classes = classes[: 2000 - i * 50]
+        index.refresh(pooled, force=True)
+    reader.join()
+    assert errors == []
+
+
+def test_user_package_is_in_the_sqluser_schema():
+    index = ClassIndex()
+    index.refresh(FakePooled(CLASSES + [("User.Person", "%Persistent", 0, "persistent", None, "", 4.0)]))
+    assert index.describe("SQLUser.Person")["name"] == "User.Person"
+    assert index.describe("dc_gendata.Company")["sql_table"] == "dc_gendata.Company"
@@ -0,0 +1,48 @@
+import os
+
+import pytest
+
+pytest.importorskip("numpy")
+pytest.importorskip("langchain_core")
+
+from embedding_cache import EmbeddingStore  # noqa: E402
+
+
+def test_puts_append_to_the_log_instead_of_rewriting_the_index(tmp_path):
+    store = EmbeddingStore(str(tmp_path))
+    store.put_many(["a"], [[1.0, 2.0]])
+    index = (tmp_path / "index.json").read_text()
+    for i in range(50):
+        store.put_many([f"k{i}"], [[float(i), 0.0]])
+    assert (tmp_path / "index.json").read_text() == index
+    assert len((tmp_path / "index.log").read_text().splitlines()) == 51
+
+    reopened = EmbeddingStore(str(tmp_path))
+    assert len(reopened) == 51
+    assert reopened.get_many(["a", "k49", "missing"]) == [[1.0, 2.0], [49.0, 0.0], None]
+
+
+def test_log_is_folded_into_the_index_once_it_outgrows_it(tmp_path, monkeypatch):
+    monkeypatch.setattr("embedding_cache.COMPACT_MIN", 4)
+    store = EmbeddingStore(str(tmp_path))
+    for i in range(20):
+        store.put_many([f"k{i % 5}"], [[float(i)]])
+    assert len((tmp_path / "index.log").read_text().splitlines()) <= 5
+    assert EmbeddingStore(str(tmp_path)).get_many([f"k{i}" for i in range(5)]) == [[float(i)] for i in range(15, 20)]
+
+
+def test_replay_drops_keys_whose_slot_was_reused(tmp_path):
+    store = EmbeddingStore(str(tmp_path), max_entries=2)
+    store.put_many(["a", "b"], [[1.0], [2.0]])
+    store.get_many(["a"])
+    store.put_many(["c"], [[3.0]])
+    reopened = EmbeddingStore(str(tmp_path), max_entries=2)
+    assert reopened.get_many(["a", "b", "c"]) == [[1.0], None, [3.0]]
+
+
+def test_truncated_log_line_is_ignored(tmp_path):
+    store = EmbeddingStore(str(tmp_path))
+    store.put_many(["a"], [[1.0]])
+    with open(os.path.join(tmp_path, "index.log"), "a", encoding="utf-8") as f:
+        f.write('["b", 1')
+    assert EmbeddingStore(str(tmp_path)).get_many(["a", "b"]) == [[1.0], None]
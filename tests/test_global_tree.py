@@ -0,0 +1,108 @@
+import json
+
+import pytest
+
+from langchain_iris_tool.global_tree import (
+    collates_after,
+    decode_cursor,
+    export_global,
+    normalize_name,
+    traverse_page,
+    walk_global,
+)
+
+
+@pytest.fixture
+def data(native):
+    """^Data with a root value, numeric and string subscripts and a nested level."""
+    native.set("root", "Data")
+    for i in range(1, 6):
+        native.set(f"n{i}", "Data", i)
+    native.set("acme", "Data", "Customer", 1)
+    native.set("globex", "Data", "Customer", 2)
+    native.set("cust", "Data", "Customer")
+    native.set("x", "Data", "Zeta")
+    return native
+
+
+def paths(nodes):
+    return [path for path, _ in nodes]
+
+
+def test_normalize_name_strips_caret():
+    assert normalize_name("^Data") == "Data"
+    assert normalize_name("Data") == "Data"
+
+
+def test_numbers_collate_before_strings():
+    assert collates_after("A", 99)
+    assert not collates_after(99, "A")
+    assert collates_after(10, 9)
+    assert collates_after("b", "a")
+
+
+def test_walk_is_pre_order_in_collation_order(data):
+    assert paths(walk_global(data, "^Data")) == [
+        [], [1], [2], [3], [4], [5], ["Customer"], ["Customer", 1], ["Customer", 2], ["Zeta"],
+    ]
+
+
+def test_walk_below_subscripts(data):
+    assert list(walk_global(data, "Data", ["Customer"])) == [
+        (["Customer"], "cust"), (["Customer", 1], "acme"), (["Customer", 2], "globex"),
+    ]
+
+
+def test_start_and_end_are_inclusive(data):
+    assert paths(walk_global(data, "Data", start=2, end=4)) == [[2], [3], [4]]
+
+
+def test_start_between_subscripts(data):
+    assert paths(walk_global(data, "Data", start=5, end="Customer"))[:2] == [[5], ["Customer"]]
+
+
+def test_max_depth_limits_levels(data):
+    assert ["Customer", 1] not in paths(walk_global(data, "Data", max_depth=1))
+    assert ["Customer"] in paths(walk_global(data, "Data", max_depth=1))
+
+
+def test_resume_after_nested_node_finishes_its_subtree(data):
+    assert paths(walk_global(data, "Data", after=["Customer", 1])) == [["Customer", 2], ["Zeta"]]
+
+
+def test_resume_outside_subtree_is_rejected(data):
+    with pytest.raises(ValueError):
+        list(walk_global(data, "Data", ["Customer"], after=[3]))
+
+
+def test_pages_cover_the_global_once(data):
+    expected = paths(walk_global(data, "Data"))
+    seen, token = [], None
+    while True:
+        page = traverse_page(data, "Data", max_nodes=3, continuation_token=token)
+        seen.extend(node["subscripts"] for node in page["nodes"])
+        token = page["continuation_token"]
+        if token is None:
+            break
+    assert seen == expected
+
+
+def test_pages_keep_start_and_end(data):
+    page = traverse_page(data, "Data", start=2, end=5, max_nodes=2)
+    assert decode_cursor(page["continuation_token"])[3:] == (2, 5)
+    rest = traverse_page(data, None, max_nodes=10, continuation_token=page["continuation_token"])
+    assert [node["subscripts"] for node in rest["nodes"]] == [[4], [5]]
+
+
+def test_token_for_another_global_is_rejected(data):
+    page = traverse_page(data, "Data", max_nodes=1)
+    with pytest.raises(ValueError):
+        traverse_page(data, "Other", continuation_token=page["continuation_token"])
+
+
+def test_export_writes_ndjson(data, tmp_path):
+    target = tmp_path / "data.ndjson"
+    result = export_global(data, "Data", str(target), ["Customer"], max_nodes=2)
+    lines = [json.loads(line) for line in target.read_text().splitlines()]
+    assert result["nodes"] == 2
+    assert lines == [{"subscripts": ["Customer"], "value": "cust"}, {"subscripts": ["Customer", 1], "value": "acme"}]
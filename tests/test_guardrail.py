@@ -0,0 +1,124 @@
+import pytest
+
+from langchain_iris_tool.guardrail import QueryRejectedError, SqlGuardrail, add_top, add_window, normalize, parse_plan
+
+PLAN = """<plan>
+<sql>SELECT * FROM Sample.Person</sql>
+<cost value="1200000"/>
+Read master map Sample.Person.IDKEY, looping on ID.
+</plan>"""
+
+
+class PlanCursor:
+    def __init__(self, plan, executed):
+        self._rows = [(plan,)]
+        self._executed = executed
+
+    def execute(self, sql, parameters=None):
+        self._executed.append((sql, parameters))
+
+    def fetchmany(self, size):
+        rows, self._rows = self._rows, []
+        return rows
+
+    def close(self):
+        pass
+
+
+class FakePooled:
+    """Answers EXPLAIN on plain cursors; the prepared statement cache must not be used."""
+
+    def __init__(self, plan=PLAN):
+        self.plan = plan
+        self.explained = []
+
+    def cursor(self):
+        return PlanCursor(self.plan, self.explained)
+
+    def execute(self, sql, parameters=None):
+        raise AssertionError("EXPLAIN went through the statement cache")
+
+
+def test_normalize_ignores_literals_comments_and_case():
+    assert normalize("select  *\nFROM t -- note\nWHERE a = 'x''y' AND b = 42") == \
+        normalize("SELECT * FROM t WHERE a = 'z' /* other */ AND b = 7") == \
+        "select * from t where a = ? and b = ?"
+
+
+def test_parse_plan_reads_cost_and_full_scans():
+    plan = parse_plan(PLAN + "\nRelative cost = 15\nRead master map Sample.Person.IDKEY, looping on ID.")
+    assert plan.cost == 1200000.0
+    assert plan.full_scans == ["Sample.Person.IDKEY"]
+    assert parse_plan("no plan here") == (None, [])
+
+
+def test_add_top_binds_the_limit():
+    assert add_top("SELECT Name FROM t") == "SELECT TOP ? Name FROM t"
+    assert add_top("select distinct Name from t") == "select distinct TOP ? Name from t"
+    assert add_top("WITH x AS (SELECT 1) SELECT * FROM x") is None
+
+
+def test_add_top_leaves_unions_alone():
+    assert add_top("SELECT a FROM t UNION SELECT b FROM u") is None
+    assert add_top("SELECT a FROM t WHERE a = 'union'") == "SELECT TOP ? a FROM t WHERE a = 'union'"
+
+
+def test_check_prepends_the_limit_and_keeps_the_statement_text():
+    guardrail = SqlGuardrail()
+    first = guardrail.check(FakePooled(), "SELECT Name FROM t WHERE Age > ?", [30], 11)
+    second = guardrail.check(FakePooled(), "SELECT Name FROM t WHERE Age > ?", [30], 21)
+    assert first == ("SELECT TOP ? Name FROM t WHERE Age > ?", [11, 30])
+    assert second == ("SELECT TOP ? Name FROM t WHERE Age > ?", [21, 30])
+    assert guardrail.stats["rewritten"] == 2
+
+
+def test_check_passes_limited_and_other_statements_through():
+    guardrail = SqlGuardrail()
+    assert guardrail.check(FakePooled(), "SELECT TOP 5 Name FROM t", None, 11) == ("SELECT TOP 5 Name FROM t", None)
+    assert guardrail.check(FakePooled(), "UPDATE t SET a = 1", [1], 11) == ("UPDATE t SET a = 1", [1])
+    assert guardrail.stats["rewritten"] == 0
+
+
+def test_check_rejects_costly_blocking_queries_and_caches_the_plan():
+    guardrail = SqlGuardrail()
+    pooled = FakePooled()
+    for _ in range(2):
+        with pytest.raises(QueryRejectedError, match="Sample.Person.IDKEY"):
+            guardrail.check(pooled, "SELECT * FROM Sample.Person ORDER BY Name", None, 11, 1000)
+    assert pooled.explained == [("EXPLAIN SELECT * FROM Sample.Person ORDER BY Name", None)]
+    assert guardrail.stats == {"hits": 1, "misses": 1, "rewritten": 0, "rejected": 2}
+
+
+def test_check_lets_top_bound_a_costly_streaming_query():
+    guardrail = SqlGuardrail()
+    statement, parameters = guardrail.check(FakePooled(), "SELECT * FROM Sample.Person", None, 11, 1000)
+    assert (statement, parameters) == ("SELECT TOP ? * FROM Sample.Person", [11])
+    with pytest.raises(QueryRejectedError):
+        guardrail.check(FakePooled(), "SELECT a FROM t UNION SELECT b FROM u", None, 11, 1000)
+
+
+def test_add_window_starts_the_result_after_the_offset():
+    assert add_window("SELECT TOP ? Name FROM t WHERE Age > ?", [21, 30], 10) == (
+        "SELECT * FROM (SELECT TOP ? Name FROM t WHERE Age > ?) WHERE %VID > ?", [21, 30, 10]
+    )
+    assert add_window("SELECT TOP ? Name FROM t ORDER BY Name", [21], 10) is not None
+    assert add_window("SELECT Name FROM t ORDER BY Name", None, 10) is None
+    assert add_window("UPDATE t SET a = 1", None, 10) is None
+
+
+@pytest.mark.parametrize("sql, expected", [
+    ("SELECT %NOLOCK Name FROM t", "SELECT %NOLOCK TOP ? Name FROM t"),
+    ("select %NOFPLAN %PROFILE Name from t", "select %NOFPLAN %PROFILE TOP ? Name from t"),
+    ("SELECT DISTINCT BY (Name) Name, Age FROM t", "SELECT DISTINCT BY (Name) TOP ? Name, Age FROM t"),
+    ("SELECT DISTINCT BY (UPPER(Name), Age) Name FROM t", "SELECT DISTINCT BY (UPPER(Name), Age) TOP ? Name FROM t"),
+    ("SELECT %NOLOCK DISTINCT Name FROM t", "SELECT %NOLOCK DISTINCT TOP ? Name FROM t"),
+    ("SELECT %ID, Name FROM t", "SELECT TOP ? %ID, Name FROM t"),
+    ("SELECT %UNKNOWNHINT Name FROM t", None),
+])
+def test_add_top_places_top_after_hints_and_distinct_by(sql, expected):
+    assert add_top(sql) == expected
+
+
+@pytest.mark.parametrize("sql", ["SELECT TOP(5) Name FROM t", "SELECT %NOLOCK TOP 5 Name FROM t", "SELECT DISTINCT BY (Name) TOP 5 Name FROM t"])
+def test_statements_with_top_are_not_rewritten(sql):
+    assert SqlGuardrail().check(FakePooled(), sql, None, 11) == (sql, None)
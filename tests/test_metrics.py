@@ -0,0 +1,39 @@
+import time
+
+from langchain_iris_tool.metrics import MetricsSampler, parse_prometheus
+
+TEXT = 'iris_glo_ref_per_sec {}\niris_db_free_space{{id="USER"}} 12.5\n'
+
+
+def counter_fetch():
+    values = iter(range(100, 10000, 100))
+    return lambda: TEXT.format(next(values))
+
+
+def test_parse_prometheus_labels():
+    samples = parse_prometheus(TEXT.format(1))
+    assert [(s.name, s.value) for s in samples] == [("iris_glo_ref_per_sec", 1.0), ("iris_db_free_space", 12.5)]
+
+
+def test_delta_needs_two_samples_and_says_so():
+    sampler = MetricsSampler(counter_fetch())
+    assert sampler.empty
+    sampler.sample()
+    result = sampler.query("glo_ref", "delta")
+    assert result["series"] == {}
+    assert "two samples" in result["note"]
+    sampler.sample()
+    result = sampler.query("glo_ref", "delta")
+    assert result["series"] == {"iris_glo_ref_per_sec": 100.0}
+    assert "note" not in result
+
+
+def test_background_loop_does_not_resample_right_after_a_sample():
+    sampler = MetricsSampler(counter_fetch(), interval=60)
+    sampler.sample()
+    sampler.start()
+    try:
+        time.sleep(0.05)
+        assert sampler.query("glo_ref")["samples"] == 1
+    finally:
+        sampler.stop()
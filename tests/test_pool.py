@@ -0,0 +1,107 @@
+import threading
+import time
+
+import pytest
+
+from langchain_iris_tool.pool import IRISConnectionPool, PoolTimeoutError
+
+
+def make_pool(**options):
+    return IRISConnectionPool("localhost", 1972, "USER", "_SYSTEM", "SYS", **options)
+
+
+def test_released_connection_is_reused(iris):
+    pool = make_pool()
+    first = pool.acquire()
+    pool.release(first)
+    assert pool.acquire() is first
+    assert iris.stats["connects"] == 1
+    assert pool.size == 1
+
+
+def test_acquire_times_out_when_full(iris):
+    pool = make_pool(max_size=1)
+    pool.acquire()
+    started = time.monotonic()
+    with pytest.raises(PoolTimeoutError):
+        pool.acquire(timeout=0.05)
+    assert time.monotonic() - started >= 0.05
+    assert pool.size == 1
+
+
+def test_waiter_gets_the_released_connection(iris):
+    pool = make_pool(max_size=1)
+    held = pool.acquire()
+    borrowed = []
+    waiter = threading.Thread(target=lambda: borrowed.append(pool.acquire(timeout=5)))
+    waiter.start()
+    time.sleep(0.05)
+    assert not borrowed
+    pool.release(held)
+    waiter.join(5)
+    assert borrowed == [held]
+
+
+def test_idle_connections_expire_down_to_min_size(iris):
+    pool = make_pool(min_size=1, max_size=3, max_idle=60)
+    connections = [pool.acquire() for _ in range(3)]
+    for pooled in connections:
+        pool.release(pooled)
+    for pooled in connections:
+        pooled.last_used -= 120
+    kept = pool.acquire()
+    assert pool.size == 1
+    assert kept is connections[-1]
+    assert [pooled.conn.closed for pooled in connections] == [True, True, False]
+
+
+def test_suspect_connection_is_replaced_when_its_check_fails(iris):
+    pool = make_pool(health_check=lambda pooled: False)
+    broken = pool.acquire()
+    pool.release(broken, broken=True)
+    replacement = pool.acquire()
+    assert replacement is not broken
+    assert broken.conn.closed
+    assert pool.size == 1
+    assert iris.stats["connects"] == 2
+
+
+def test_suspect_connection_is_kept_when_its_check_passes(iris):
+    pool = make_pool()
+    pooled = pool.acquire()
+    pool.release(pooled, broken=True)
+    assert pool.acquire() is pooled
+    assert not pooled.suspect
+
+
+def test_close_with_borrowed_connections(iris):
+    pool = make_pool(max_size=2)
+    borrowed, idle = pool.acquire(), pool.acquire()
+    pool.release(idle)
+    pool.close()
+    assert idle.conn.closed and not borrowed.conn.closed
+    assert pool.size == 1
+    pool.release(borrowed)
+    assert borrowed.conn.closed
+    assert pool.size == 0
+    with pytest.raises(RuntimeError):
+        pool.acquire()
+
+
+def test_close_wakes_waiters(iris):
+    pool = make_pool(max_size=1)
+    pool.acquire()
+    errors = []
+
+    def wait():
+        try:
+            pool.acquire(timeout=5)
+        except Exception as e:
+            errors.append(e)
+
+    waiter = threading.Thread(target=wait)
+    waiter.start()
+    time.sleep(0.05)
+    pool.close()
+    waiter.join(5)
+    assert len(errors) == 1 and isinstance(errors[0], RuntimeError)
@@ -0,0 +1,93 @@
+from langchain_iris_tool.query import decode_token, encode_token, fetch_page, iter_rows, row_size
+
+
+QUERY = "SELECT ID, Name, Email FROM Sample.Person"
+
+
+def run(cursor, **kwargs):
+    cursor.execute(QUERY)
+    return fetch_page(cursor, QUERY, **kwargs)
+
+
+def test_iter_rows_reads_every_row(cursor, iris):
+    iris.configure(rows=7)
+    cursor.execute(QUERY)
+    assert [row[0] for row in iter_rows(cursor, 3)] == list(range(7))
+
+
+def test_token_round_trip_keeps_parameters():
+    token = encode_token(QUERY + " WHERE Age > ?", 40, [30])
+    assert decode_token(token) == (QUERY + " WHERE Age > ?", 40, [30])
+
+
+def test_decode_token_rejects_garbage():
+    try:
+        decode_token("not-a-token")
+    except ValueError as e:
+        assert "continuation token" in str(e)
+    else:
+        raise AssertionError("expected ValueError")
+
+
+def test_short_result_has_no_token(cursor, iris):
+    iris.configure(rows=5)
+    rows, more = run(cursor, max_rows=10)
+    assert len(rows) == 5
+    assert more is None
+
+
+def test_exactly_max_rows_has_no_token(cursor, iris):
+    iris.configure(rows=10)
+    rows, more = run(cursor, max_rows=10)
+    assert len(rows) == 10
+    assert more is None
+
+
+def test_max_rows_returns_token_for_next_page(cursor):
+    rows, more = run(cursor, max_rows=30, page_size=7)
+    assert [row[0] for row in rows] == list(range(30))
+    assert more["truncated_by"] == "max_rows"
+    assert decode_token(more["continuation_token"]) == (QUERY, 30, None)
+
+
+def test_continuation_pages_cover_the_result_once(cursor):
+    seen, offset = [], 0
+    while True:
+        rows, more = run(cursor, max_rows=30, page_size=8, offset=offset)
+        seen.extend(row[0] for row in rows)
+        if more is None:
+            break
+        _, offset, _ = decode_token(more["continuation_token"])
+    assert seen == list(range(100))
+
+
+def test_offset_one_skips_only_the_first_row(cursor):
+    rows, _ = run(cursor, max_rows=3, offset=1)
+    assert [row[0] for row in rows] == [1, 2, 3]
+
+
+def test_server_side_offset_is_not_skipped_again(cursor):
+    cursor.execute("SELECT * FROM (" + QUERY + ") WHERE %VID > ?", [40])
+    rows, more = fetch_page(cursor, QUERY, 5, offset=40, skip=False)
+    assert [row[0] for row in rows] == [40, 41, 42, 43, 44]
+    assert decode_token(more["continuation_token"])[1] == 45
+
+
+def test_offset_past_end_is_empty(cursor):
+    rows, more = run(cursor, max_rows=10, offset=500)
+    assert rows == []
+    assert more is None
+
+
+def test_max_bytes_cuts_on_whole_rows(cursor):
+    budget = row_size((0, "name0", "user0@example.com")) * 3 + 1
+    rows, more = run(cursor, max_rows=50, max_bytes=budget)
+    assert len(rows) == 3
+    assert more["truncated_by"] == "max_bytes"
+    assert decode_token(more["continuation_token"])[1] == 3
+
+
+def test_max_bytes_always_returns_one_row(cursor):
+    rows, more = run(cursor, max_rows=50, max_bytes=1)
+    assert len(rows) == 1
+    assert more["truncated_by"] == "max_bytes"
@@ -0,0 +1,73 @@
+import os
+
+import pytest
+
+pytest.importorskip("langchain_core")
+
+from langchain_iris_tool.tools import _confined_path  # noqa: E402
+
+
+def test_relative_path_stays_inside(tmp_path):
+    assert _confined_path(str(tmp_path), "out/data.ndjson", "export_dir") == os.path.join(
+        os.path.realpath(tmp_path), "out", "data.ndjson"
+    )
+
+
+@pytest.mark.parametrize("path", ["/etc/passwd", "../x.ndjson", "a/../../x.ndjson"])
+def test_escaping_paths_are_rejected(tmp_path, path):
+    with pytest.raises(ValueError):
+        _confined_path(str(tmp_path), path, "export_dir")
+
+
+def test_symlink_out_of_directory_is_rejected(tmp_path):
+    (tmp_path / "base").mkdir()
+    os.symlink(tmp_path, tmp_path / "base" / "link")
+    with pytest.raises(ValueError):
+        _confined_path(str(tmp_path / "base"), "link/x.ndjson", "export_dir")
+
+
+def test_unconfigured_directory_rejects_paths():
+    with pytest.raises(ValueError):
+        _confined_path(None, "x.ndjson", "export_dir")
+
+
+@pytest.fixture
+def tool(iris):
+    from langchain_iris_tool.tools import InterSystemsIRISTool
+
+    return InterSystemsIRISTool(
+        hostname="localhost", port=1972, namespace="USER", username="_SYSTEM", password="SYS", webport=52773,
+    )
+
+
+def test_query_pages_start_on_the_server(tool, iris):
+    first = tool.invoke({"operation": "query", "query": "SELECT ID, Name FROM Sample.Person", "max_rows": 10})
+    trips = iris.stats["round_trips"]
+    second = tool.invoke({"operation": "query", "continuation_token": first["continuation_token"], "max_rows": 10})
+    assert [row[0] for row in first["rows"]] == list(range(10))
+    assert [row[0] for row in second["rows"]] == list(range(10, 20))
+    # execute plus the fetches of one page, not of the ten rows before it as well
+    assert iris.stats["round_trips"] - trips == 2
+
+
+def test_shared_metadata_cache_is_keyed_by_server(iris):
+    from langchain_iris_tool.cache import MetadataCache
+    from langchain_iris_tool.tools import InterSystemsIRISTool
+
+    cache = MetadataCache()
+    tools = [
+        InterSystemsIRISTool(
+            hostname=host, port=1972, namespace="USER", username="_SYSTEM", password="SYS", webport=52773, cache=cache,
+        )
+        for host in ("iris-a", "iris-b")
+    ]
+    for tool in tools + tools:
+        tool.invoke({"operation": "install_path"})
+    assert cache.stats()["operations"]["install_path"] == {"hits": 2, "misses": 2, "evictions": 0, "hit_rate": 0.5}
+
+
+def test_cached_native_result_is_formatted(tool):
+    tool.summary_max_chars = 5
+    first = tool.invoke({"operation": "install_path", "output_format": "summary"})
+    assert first.startswith("/usr/\n... truncated")
+    assert tool.invoke({"operation": "install_path", "output_format": "summary"}) == first